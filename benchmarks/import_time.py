@@ -0,0 +1,97 @@
+"""CLI 冷启动导入耗时基准与回归检查。
+
+以 `python -X importtime` 在新进程中导入 `lazy.cli`，输出累计耗时最高的模块；
+`--check` 时作为回归检查运行：
+
+- 启动时不得导入 `HEAVY_MODULES` 中的重量级依赖（由各命令组按需导入）；
+- 给出 `--budget-ms` 时，多次测量的中位数不得超过该预算。
+
+任一项不满足时以非零状态退出，CI 据此失败。
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --check --budget-ms 400
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# `import lazy.cli` 不应加载的模块，命中任何一个都说明有命令组或重量级依赖被提前导入
+HEAVY_MODULES = (
+    "httpx",
+    "lxml",
+    "keyring",
+    "cryptography",
+    "rich.progress",
+    "lazy.core.zjuAPI.zju_api",
+    "lazy.core.login.login",
+    "lazy.CLI.command.course",
+    "lazy.CLI.command.assignment",
+    "lazy.CLI.command.resource",
+    "lazy.CLI.command.rollcall",
+)
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """在新进程中导入 module，返回 模块名 -> 累计导入耗时（微秒）"""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [str(SRC_DIR), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True
+    )
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CLI 冷启动导入耗时基准")
+    parser.add_argument("--module", default="lazy.cli", help="测量的入口模块 (默认: lazy.cli)")
+    parser.add_argument("--runs", type=int, default=5, help="测量次数，取中位数 (默认: 5)")
+    parser.add_argument("--top", type=int, default=15, help="列出累计耗时最高的模块数 (默认: 15)")
+    parser.add_argument("--check", action="store_true", help="作为回归检查运行，不满足条件时以非零状态退出")
+    parser.add_argument("--budget-ms", type=float, default=None, help="配合 --check，入口模块累计导入耗时的上限（毫秒）")
+    args = parser.parse_args()
+
+    profiles = [import_profile(args.module) for _ in range(args.runs)]
+    totals = [profile.get(args.module, 0) / 1000 for profile in profiles]
+    median = statistics.median(totals)
+
+    print(f"{args.module} 累计导入耗时: 中位数 {median:.1f}ms，最短 {min(totals):.1f}ms（{args.runs} 次）")
+    last = profiles[-1]
+    for name, micros in sorted(last.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+        print(f"{micros / 1000:>10.1f}ms  {name}")
+
+    if not args.check:
+        return
+
+    failures = []
+    loaded = sorted(name for name in HEAVY_MODULES if name in last)
+    if loaded:
+        failures.append(f"启动时导入了重量级模块: {', '.join(loaded)}")
+    if args.budget_ms is not None and median > args.budget_ms:
+        failures.append(f"导入耗时 {median:.1f}ms 超过预算 {args.budget_ms:.1f}ms")
+
+    for failure in failures:
+        print(f"FAIL: {failure}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""JSON 编解码基准。
+
+构造与 `course list --all` 课程列表形状相近的载荷，分别测量各个可用后端的
+loads / dumps / dumps(indent=True) 耗时，以及 `loads_async` 在解码大载荷时对事件循环的阻塞时长。
+
+    python benchmarks/json_codec.py --courses 2000 --repeat 20
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from lazy.core.codec import json_codec  # noqa: E402
+
+
+def make_payload(courses: int) -> dict:
+    return {
+        "courses": [
+            {
+                "id": 100000 + i,
+                "name": f"课程名称 {i}",
+                "course_code": f"(2025-2026-1)-CS{i:05d}",
+                "academic_year": {"id": 20, "name": "2025-2026"},
+                "semester": {"id": 41, "name": "秋冬", "real_name": "秋冬学期"},
+                "instructors": [{"id": j, "name": f"教师{j}", "email": f"t{j}@zju.edu.cn"} for j in range(3)],
+                "department": {"id": 7, "name": "计算机科学与技术学院"},
+                "start_date": "2025-09-15",
+                "end_date": "2026-01-18",
+                "is_mute": False,
+                "cover": None,
+                "display_name": f"课程名称 {i}",
+                "score": 92.5,
+            }
+            for i in range(courses)
+        ],
+        "pages": 1,
+        "total": courses,
+    }
+
+
+def measure(func, repeat: int) -> float:
+    """返回 repeat 次中的最短耗时（毫秒）"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+async def max_loop_stall(coro_factory, interval: float = 0.001) -> float:
+    """解码期间事件循环最长一次未能按时醒来的延迟（毫秒）"""
+    loop = asyncio.get_running_loop()
+    stall = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal stall
+        while not done.is_set():
+            expected = loop.time() + interval
+            await asyncio.sleep(interval)
+            stall = max(stall, loop.time() - expected)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(interval)
+    await coro_factory()
+    done.set()
+    await task
+    return stall * 1000
+
+
+def available_backends() -> list[str]:
+    backends = []
+    for name in ("orjson", "msgspec", "json"):
+        try:
+            json_codec.set_backend(name)
+        except ImportError:
+            continue
+        backends.append(name)
+    return backends
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON 编解码基准")
+    parser.add_argument("--courses", type=int, default=2000, help="载荷中的课程数 (默认: 2000)")
+    parser.add_argument("--repeat", type=int, default=20, help="每项重复次数，取最短耗时 (默认: 20)")
+    args = parser.parse_args()
+
+    payload = make_payload(args.courses)
+    raw = json_codec.dumps(payload)
+    print(f"载荷 {len(raw) / 1024:.0f} KiB，卸载阈值 {json_codec.OFFLOAD_THRESHOLD / 1024:.0f} KiB")
+    print(f"{'backend':<10}{'loads':>10}{'dumps':>10}{'indent':>10}{'stall':>12}{'stall(async)':>14}")
+
+    for name in available_backends():
+        json_codec.set_backend(name)
+        loads = measure(lambda: json_codec.loads(raw), args.repeat)
+        dumps = measure(lambda: json_codec.dumps(payload), args.repeat)
+        indent = measure(lambda: json_codec.dumps(payload, indent=True), args.repeat)
+
+        async def blocking():
+            json_codec.loads(raw)
+
+        stall = asyncio.run(max_loop_stall(blocking))
+        stall_async = asyncio.run(max_loop_stall(lambda: json_codec.loads_async(raw)))
+        print(f"{name:<10}{loads:>8.2f}ms{dumps:>8.2f}ms{indent:>8.2f}ms{stall:>10.2f}ms{stall_async:>12.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
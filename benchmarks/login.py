@@ -0,0 +1,109 @@
+"""批量重新登录基准。
+
+模拟 lazy-server 重启后为所有用户重新登录的场景：CAS 与学在浙大由 `httpx.MockTransport`
+模拟，每个请求附带固定的网络延迟，不访问真实服务。分别测量：
+
+- cold：每次登录都请求 getPubKey；
+- cached：公钥进程内缓存命中，登录省去 getPubKey；
+- wrong password：密码错误时每个用户提交到 CAS 的次数（应为 1，不因缓存公钥而重试）；
+- rotated：缓存的公钥已被服务端更换，每个用户刷新公钥后重试一次。
+
+    python benchmarks/login.py --users 50 --latency-ms 20
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import httpx
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from lazy.core.login.login import ZjuAsyncClient, pubkey_cache  # noqa: E402
+
+PASSWORD = "correct-horse"
+EXPONENT = "10001"
+LOGIN_PAGE = '<html><form><input name="execution" value="e1s1"/></form></html>'
+
+
+def new_modulus() -> str:
+    return format(rsa.generate_private_key(public_exponent=0x10001, key_size=1024).public_key().public_numbers().n, "x")
+
+
+class FakeCAS:
+    """按路径计数请求；登录 POST 以当前公钥加密的正确密码比对密文"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.modulus = new_modulus()
+        self.requests = Counter()
+
+    async def handler(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        self.requests[request.method, request.url.path] += 1
+
+        if request.url.path == "/cas/v2/getPubKey":
+            return httpx.Response(200, json={"exponent": EXPONENT, "modulus": self.modulus})
+        if request.method == "POST":
+            expected = ZjuAsyncClient()._encrypt_password(PASSWORD, EXPONENT, self.modulus)
+            password = dict(httpx.QueryParams(request.content.decode()))["password"]
+            return httpx.Response(200, text="学在浙大" if password == expected else "用户名或密码错误")
+        return httpx.Response(200, text=LOGIN_PAGE)
+
+    def count(self, method: str) -> int:
+        return sum(n for (request_method, _), n in self.requests.items() if request_method == method)
+
+    def pubkeys(self) -> int:
+        return self.requests["GET", "/cas/v2/getPubKey"]
+
+
+async def login_all(cas: FakeCAS, users: int, password: str) -> tuple[float, int]:
+    """并发登录 users 个用户，返回 (耗时毫秒, 成功数)"""
+    async def login_one(i: int) -> bool:
+        client = ZjuAsyncClient()
+        client.session = httpx.AsyncClient(transport=httpx.MockTransport(cas.handler))
+        async with client.session:
+            return await client.login(f"3200{i:06d}", password)
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login_one(i) for i in range(users)))
+    return (time.perf_counter() - started) * 1000, sum(results)
+
+
+async def run_case(name: str, users: int, latency: float, password: str, warm: bool, rotate: bool):
+    cas = FakeCAS(latency)
+    pubkey_cache.invalidate()
+    if warm:
+        pubkey_cache.put(EXPONENT, cas.modulus)
+    if rotate:
+        cas.modulus = new_modulus()
+
+    elapsed, succeeded = await login_all(cas, users, password)
+    print(
+        f"{name:<16}{elapsed:>10.1f}ms{succeeded:>8}/{users:<6}"
+        f"{cas.pubkeys():>8}{cas.count('POST'):>8}{cas.count('POST') / users:>10.2f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量重新登录基准")
+    parser.add_argument("--users", type=int, default=50, help="并发登录的用户数 (默认: 50)")
+    parser.add_argument("--latency-ms", type=float, default=20, help="每个请求的模拟网络延迟（毫秒） (默认: 20)")
+    args = parser.parse_args()
+
+    # 登录流程的逐条日志会淹没输出
+    logging.disable(logging.CRITICAL)
+    latency = args.latency_ms / 1000
+
+    print(f"{'case':<16}{'elapsed':>12}{'ok':>8}{'':<7}{'pubkey':>8}{'posts':>8}{'post/user':>10}")
+    asyncio.run(run_case("cold", args.users, latency, PASSWORD, warm=False, rotate=False))
+    asyncio.run(run_case("cached", args.users, latency, PASSWORD, warm=True, rotate=False))
+    asyncio.run(run_case("wrong password", args.users, latency, "wrong", warm=True, rotate=False))
+    asyncio.run(run_case("rotated", args.users, latency, PASSWORD, warm=True, rotate=True))
+
+
+if __name__ == "__main__":
+    main()
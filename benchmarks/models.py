@@ -0,0 +1,160 @@
+"""紧凑模型的内存与吞吐基准。
+
+内存：以 tracemalloc 测量单个用户缓存一份待办 / 点名响应时各种形式的占用——
+解码后的原始 dict 树、模型列表，以及服务端实际缓存的原始响应字节。
+吞吐：比较直接遍历原始 dict（`.get()` 链）与先转换为模型再遍历的渲染循环耗时，
+以及从响应字节解码并转换为模型列表的耗时。
+
+    python benchmarks/models.py --items 200 --repeat 20
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from lazy.core.codec import json_codec  # noqa: E402
+from lazy.core.models.models import Activity, Rollcall, Todo, parse_list  # noqa: E402
+
+# 学在浙大的条目带有大量渲染用不到的字段，这里按实际响应的量级补齐
+_PADDING = {
+    "created_at": "2025-09-15T08:00:00Z",
+    "updated_at": "2025-09-20T08:00:00Z",
+    "prerequisites": [],
+    "data": {"description": "<p>" + "说明文字" * 40 + "</p>", "score_percentage": "10.0"},
+    "completion_criterion": "完成度",
+    "submit_times": 3,
+    "teaching_model": "online",
+    "using_phase": "learning",
+}
+
+
+def make_todos(count: int) -> dict:
+    return {"todo_list": [
+        {
+            "id": 500000 + i,
+            "title": f"第 {i} 次作业",
+            "type": "homework",
+            "course_id": 90000 + i % 12,
+            "course_name": f"课程名称 {i % 12}",
+            "course_code": f"(2025-2026-1)-CS{i % 12:05d}",
+            "end_time": "2025-12-31T15:59:00Z",
+            "is_locked": False,
+            "is_student": True,
+            "prerequisites": [],
+            **_PADDING,
+        }
+        for i in range(count)
+    ]}
+
+
+def make_rollcalls(count: int) -> dict:
+    return {"rollcalls": [
+        {
+            "rollcall_id": 700000 + i,
+            "course_id": 90000 + i % 12,
+            "course_title": f"课程名称 {i % 12}",
+            "created_by_name": "教师",
+            "department_name": "计算机科学与技术学院",
+            "source": "number",
+            "is_radar": False,
+            "is_number": True,
+            "is_expired": False,
+            "status": "absent",
+            "rollcall_status": "in_progress",
+            "rollcall_time": "2025-10-01T08:00:00Z",
+            "scored": True,
+            "title": f"点名 {i}",
+            "type": "another",
+        }
+        for i in range(count)
+    ]}
+
+
+def make_activities(count: int) -> dict:
+    return {"activities": [
+        {
+            "id": 300000 + i,
+            "title": f"活动 {i}",
+            "type": "material",
+            "module_id": i % 16,
+            "completion_criterion_key": "view",
+            "start_time": "2025-09-15T08:00:00Z",
+            "end_time": None,
+            "is_started": True,
+            "is_closed": False,
+            "uploads": [{"id": i * 10 + j, "name": f"讲义{j}.pdf", "size": 1 << 20, "updated_at": None} for j in range(2)],
+            **_PADDING,
+        }
+        for i in range(count)
+    ]}
+
+
+def allocated(factory) -> tuple[int, object]:
+    """返回 factory() 结果在存活期间占用的字节数"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = factory()
+    size = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return size, result
+
+
+def measure(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def render_raw(raw: dict, key: str, fields: tuple[str, ...]) -> list[tuple]:
+    return [tuple(item.get(field) for field in fields) for item in raw.get(key) or []]
+
+
+def render_models(items: list, fields: tuple[str, ...]) -> list[tuple]:
+    return [tuple(getattr(item, field) for field in fields) for item in items]
+
+
+def run_case(name: str, key: str, model: type, payload: dict, fields: tuple[str, ...], repeat: int):
+    raw = json_codec.dumps(payload)
+    # 经 bytearray 复制一份，确保测到的是新分配的字节串
+    bytes_size, _ = allocated(lambda: bytes(bytearray(raw)))
+    dict_size, _ = allocated(lambda: json_codec.loads(raw))
+    decoded = json_codec.loads(raw)
+    model_size, items = allocated(lambda: parse_list(decoded, key, model))
+
+    decode = measure(lambda: json_codec.loads(raw), repeat)
+    decode_models = measure(lambda: parse_list(json_codec.loads(raw), key, model), repeat)
+    render_dict = measure(lambda: render_raw(decoded, key, fields), repeat)
+    render_model = measure(lambda: render_models(items, fields), repeat)
+
+    print(
+        f"{name:<10}{bytes_size / 1024:>8.1f}Ki{dict_size / 1024:>8.1f}Ki{model_size / 1024:>8.1f}Ki"
+        f"{decode:>8.2f}ms{decode_models:>12.2f}ms{render_dict:>11.3f}ms{render_model:>12.3f}ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="紧凑模型的内存与吞吐基准")
+    parser.add_argument("--items", type=int, default=200, help="每份响应的条目数 (默认: 200)")
+    parser.add_argument("--repeat", type=int, default=20, help="吞吐测试的重复次数，取最短耗时 (默认: 20)")
+    args = parser.parse_args()
+
+    # 渲染循环读取的字段与 CLI 表格一致
+    cases = [
+        ("todo", "todo_list", Todo, make_todos(args.items), ("id", "title", "type", "course_name", "end_time")),
+        ("rollcall", "rollcalls", Rollcall, make_rollcalls(args.items), ("rollcall_id", "course_title", "status", "rollcall_time")),
+        ("activity", "activities", Activity, make_activities(args.items), ("id", "title", "type", "start_time", "end_time")),
+    ]
+
+    print(f"JSON 后端 {json_codec.BACKEND}，每份响应 {args.items} 条")
+    print(f"{'entity':<10}{'bytes':>10}{'dict':>10}{'models':>10}{'decode':>10}{'decode→model':>14}{'render dict':>13}{'render model':>14}")
+    for case in cases:
+        run_case(*case, repeat=args.repeat)
+
+if __name__ == "__main__":
+    main()
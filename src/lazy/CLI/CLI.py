@@ -3,15 +3,12 @@ import sys
 from functools import partial
 from typing import Annotated
 
-import keyring
 import typer
 from asyncer import syncify
-from lxml import etree
 from rich import print as rprint
-from rich.progress import Progress, SpinnerColumn, TextColumn
 
-from ..core.login.login import CredentialManager, ZjuAsyncClient
-from .command import assignment, config, course, log, resource, rollcall
+from ..core.printlog.print_log import save_studentid_hash
+from .lazy_group import LazySubcommand, LazyTyperGroup, resolve_leaf_params
 from .state import state
 
 KEYRING_SERVICE_NAME = "lazy"
@@ -21,8 +18,41 @@ KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
 
 logger = logging.getLogger(__name__)
 
+# --- 注册命令组 ---
+# 命令组模块在解析到对应子命令时才导入，避免每次启动都加载全部依赖
+class LazyCommandGroup(LazyTyperGroup):
+    lazy_subcommands = {
+        # 本地检索
+        "search": LazySubcommand("lazy.CLI.command.search:app", "在本地镜像中检索课程内容"),
+        # 课程命令组
+        "course": LazySubcommand("lazy.CLI.command.course:app", "管理学在浙大课程信息与章节"),
+        # 资源命令组
+        "resource": LazySubcommand("lazy.CLI.command.resource:app", "管理学在浙大云盘资源"),
+        # 任务命令组
+        "assignment": LazySubcommand("lazy.CLI.command.assignment:app", "管理学在浙大活动任务"),
+        # 签到命令组
+        "rollcall": LazySubcommand("lazy.CLI.command.rollcall:app", "处理学在浙大签到任务"),
+        # 镜像命令组
+        "mirror": LazySubcommand("lazy.CLI.command.mirror:app", "管理本地数据镜像"),
+        # 配置命令组
+        "config": LazySubcommand("lazy.CLI.command.config:app", "配置相关命令组"),
+        # 日志命令组
+        "log": LazySubcommand("lazy.CLI.command.log:app", "日志相关命令组"),
+        # 会话代理命令组
+        "agent": LazySubcommand("lazy.CLI.command.agent:app", "管理本地会话代理"),
+        # 后台预取命令组，由 --prefetch 选项调用
+        "prefetch": LazySubcommand("lazy.CLI.command.prefetch:app", "在后台预取任务与课程内容", hidden=True),
+    }
+
+    def resolve_command(self, ctx, args):
+        cmd_name, command, rest = super().resolve_command(ctx, args)
+        # 根命令的回调先于子命令解析参数执行，这里按子命令的参数定义预先解析出 --offline
+        if command is not None:
+            state.offline = bool(resolve_leaf_params(ctx, cmd_name, command, rest).get("offline"))
+        return cmd_name, command, rest
+
 # 初始化主app对象
-app = typer.Typer(help="LAZY CLI - 学在浙大第三方客户端的命令行工具", no_args_is_help=True)
+app = typer.Typer(help="LAZY CLI - 学在浙大第三方客户端的命令行工具", no_args_is_help=True, cls=LazyCommandGroup)
 
 # --- 全局回调，检验登录状态 ---
 @app.callback()
@@ -41,7 +71,22 @@ async def main_callback(
     if "--help" in sys.argv or "-h" in sys.argv:
         return 
     
-    if ctx.invoked_subcommand in ["login", "whoami", "config"]:
+    if ctx.invoked_subcommand in ["login", "whoami", "config", "search", "agent", "log"]:
+        return
+
+    # 离线查询只读取本地镜像，无需登录
+    if state.offline:
+        return
+
+    import keyring
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from ..core.login.login import CredentialManager, ZjuAsyncClient
+
+    # 会话存在且未按记录的过期时间失效时直接执行命令，不预先联网验证；
+    # 命令中的请求遇到会话失效时由 open_client 自动重新登录
+    credential_manager = CredentialManager()
+    if credential_manager.load_cookies() and not credential_manager.session_expired():
         return
 
     with Progress(
@@ -51,17 +96,8 @@ async def main_callback(
         disable= "--json" in sys.argv or "-J" in sys.argv
     ) as progress:
         task = progress.add_task(description="检查登录状态中...", total=2)
-        
-        # 如果会话存在且有效，则无需登录
-        cookies = CredentialManager().load_cookies()
-        async with ZjuAsyncClient(
-            cookies=cookies,
-            trust_env=state.trust_env
-        ) as client:
-            if cookies and await client.is_valid_session():
-                progress.update(task, description="登录有效", completed=2)
-                return 
 
+        async with ZjuAsyncClient(trust_env=state.trust_env) as client:
             logger.info("会话已失效，尝试使用凭据登录...")
             progress.advance(task)
 
@@ -77,7 +113,8 @@ async def main_callback(
                 raise typer.Exit(code=1)
             
             if await client.login(studentid, password):
-                if CredentialManager().save_cookies(dict(client.session.cookies)):
+                save_studentid_hash(studentid)
+                if CredentialManager().save_cookies(client.session.cookies):
                     progress.advance(task)
                 else:
                     rprint("Cookies保存失败！")
@@ -97,6 +134,8 @@ async def check(
     """
     开发者网址测试检查工具，检验网页返回。
     """
+    from ..core.login.login import CredentialManager, ZjuAsyncClient
+
     cookies = CredentialManager().load_cookies()
 
     async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
@@ -115,6 +154,12 @@ async def check(
 async def login():
     """引导手动登录并自动更新登录凭据和本地会话。
     """    
+    import keyring
+    from lxml import etree
+    from rich.progress import Progress, SpinnerColumn, TextColumn
+
+    from ..core.login.login import CredentialManager, ZjuAsyncClient
+
     studentid = typer.prompt("请输入学号")
     password = typer.prompt("请输入密码", hide_input=True)
 
@@ -131,9 +176,10 @@ async def login():
             task = progress.add_task(description="登录中...", total=1)
 
             if await client.login(studentid, password):
-                if CredentialManager().save_cookies(dict(client.session.cookies)):
+                if CredentialManager().save_cookies(client.session.cookies):
                     keyring.set_password(KEYRING_SERVICE_NAME, KEYRING_STUDENTID_NAME, studentid)
                     keyring.set_password(KEYRING_SERVICE_NAME, KEYRING_PASSWORD_NAME, password)
+                    save_studentid_hash(studentid)
                     logger.info("已更新凭据与本地会话")
                     progress.advance(task)
                     rprint("[green]登录成功！[/green]")
@@ -163,6 +209,8 @@ def whoami():
     """
     Who am I ?
     """
+    import keyring
+
     authorization_password = typer.prompt("请输入密码", hide_input=True)
     
     if authorization_password == keyring.get_password("lazy", "password"):
@@ -183,22 +231,3 @@ def easter_egg(ctx: typer.Context):
 
     if ctx.command.name == "hachimi":
         print("哈基米哦南北绿豆~")
-
-# --- 注册命令组 ---
-# 课程命令组
-app.add_typer(course.app, name="course", help="管理学在浙大课程信息与章节")
-
-# 资源命令组
-app.add_typer(resource.app, name="resource", help="管理学在浙大云盘资源")
-
-# 任务命令组
-app.add_typer(assignment.app, name="assignment", help="管理学在浙大活动任务")
-
-# 签到命令组
-app.add_typer(rollcall.app, name="rollcall", help="处理学在浙大签到任务")
-
-# 配置命令组
-app.add_typer(config.app, name="config", help="配置相关命令组")
-
-# 日志命令组
-app.add_typer(log.app, name="log", help="日志相关命令组")
\ No newline at end of file
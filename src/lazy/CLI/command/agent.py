@@ -0,0 +1,148 @@
+import asyncio
+import logging
+import subprocess
+import time
+from textwrap import dedent
+from typing import Annotated
+
+import typer
+from rich import print as rprint
+
+from ...core.login import agent
+from ...core.login.login import CredentialManager, session_signature
+from ..utils.utils import lazy_command, print_with_json
+
+logger = logging.getLogger(__name__)
+
+# 等待后台代理就绪的上限（秒）
+AGENT_START_TIMEOUT = 5.0
+
+# agent 命令组
+app = typer.Typer(help="""
+                  管理本地会话代理，代理在内存中保存解密后的 Cookies，连续调用 lazy 时无需反复访问 keyring。
+                  """,
+                  no_args_is_help=True)
+
+def check_supported(json: bool):
+    if agent.AGENT_SUPPORTED:
+        return
+
+    if json:
+        print_with_json(False, "Agent Unsupported")
+    else:
+        rprint("[red]当前平台不支持会话代理！[/red]")
+    raise typer.Exit(code=1)
+
+@app.command(
+    "start",
+    help="在后台启动会话代理",
+    epilog=dedent("""
+        EXAMPLES:
+
+          $ lazy agent start
+            (启动会话代理，15分钟内没有重新登录则自动退出)
+
+          $ lazy agent start -t 120
+            (启动会话代理，120分钟后自动退出)
+    """))
+def start_agent(
+    ttl: Annotated[float, typer.Option("--ttl", "-t", help="代理存活时间（分钟），每次重新登录后重新计时")] = agent.AGENT_DEFAULT_TTL / 60,
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    check_supported(json)
+
+    status = agent.request({"op": "status"})
+    if status != None:
+        if json:
+            print_with_json(True, "Agent Running", {"pid": status["pid"], "socket": str(agent.agent_socket_path())})
+        else:
+            rprint(f"会话代理已在运行 (pid {status['pid']})。")
+        return
+
+    subprocess.Popen(
+        lazy_command("agent", "serve", "--ttl", str(ttl)),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+    deadline = time.monotonic() + AGENT_START_TIMEOUT
+    while status == None and time.monotonic() < deadline:
+        time.sleep(0.05)
+        status = agent.request({"op": "status"})
+
+    if status == None:
+        if json:
+            print_with_json(False, "Agent Start Failed")
+        else:
+            rprint("[red]会话代理启动失败！[/red]请查看日志。")
+        logger.error("会话代理启动失败！")
+        raise typer.Exit(code=1)
+
+    if json:
+        print_with_json(True, "Agent Started", {"pid": status["pid"], "socket": str(agent.agent_socket_path())})
+        return
+
+    rprint(f"[green]会话代理已启动！[/green]pid {status['pid']}，套接字 {agent.agent_socket_path()}")
+    if not status["has_cookies"]:
+        rprint("[yellow]本地会话不存在，代理将在下次登录后保存 Cookies。[/yellow]")
+
+@app.command("serve", hidden=True)
+def serve_agent(
+    ttl: Annotated[float, typer.Option("--ttl", "-t")] = agent.AGENT_DEFAULT_TTL / 60
+):
+    """
+    在前台运行会话代理，由 'lazy agent start' 在后台调用。
+    """
+    check_supported(False)
+
+    # 代理启动时解密一次会话文件，之后的调用均从内存读取
+    cookies = CredentialManager().load_cookies()
+    session_agent = agent.SessionAgent(cookies, session_signature() if cookies else None, ttl * 60)
+    asyncio.run(session_agent.serve(agent.agent_socket_path()))
+
+@app.command("stop", help="停止会话代理")
+def stop_agent(
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    check_supported(json)
+
+    if agent.request({"op": "stop"}) == None:
+        if json:
+            print_with_json(False, "Agent Not Running")
+        else:
+            rprint("会话代理未运行。")
+        return
+
+    if json:
+        print_with_json(True, "Agent Stopped")
+    else:
+        rprint("[green]会话代理已停止。[/green]")
+
+@app.command("status", help="查看会话代理状态")
+def agent_status(
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    check_supported(json)
+
+    status = agent.request({"op": "status"})
+    if status == None:
+        if json:
+            print_with_json(False, "Agent Not Running")
+        else:
+            rprint("会话代理未运行。")
+        return
+
+    result = {
+        "pid": status["pid"],
+        "socket": str(agent.agent_socket_path()),
+        "has_cookies": status["has_cookies"],
+        "expires_in": status["expires_in"]
+    }
+    if json:
+        print_with_json(True, "Agent Status", result)
+        return
+
+    rprint(f"会话代理运行中: pid {result['pid']}，套接字 {result['socket']}")
+    rprint(f"已保存 Cookies: {'是' if result['has_cookies'] else '否'}，{result['expires_in'] / 60:.1f} 分钟后退出")
@@ -1,11 +1,12 @@
 import asyncio
 import logging
 from collections.abc import Callable
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from enum import Enum, unique
 from functools import partial
 from textwrap import dedent
-from typing import Annotated
+from typing import Annotated, Any
 
 import keyring
 import typer
@@ -24,15 +25,29 @@ from rich.table import Table
 from rich.text import Text
 
 from ...core.login.login import CredentialManager, ZjuAsyncClient
+from ...core.mirror.prefetch import ResponseCache, session_key
+from ...core.mirror.store import MirrorStore
+from ...core.models.assignment_index import (
+    KIND_ACTIVITY,
+    KIND_AMBIGUOUS,
+    KIND_CLASSROOM,
+    KIND_EXAM,
+    KIND_FORUM,
+    AssignmentTypeIndex,
+)
+from ...core.models.models import Todo, parse_list
 from ...core.zjuAPI import zju_api
+from ...core.zjuAPI.batch import BatchExecutor, BatchResults
 from ..config.config import type_map
-from ..state import state
+from ..session import open_client
 from ..utils.utils import (
+    JSONRecordWriter,
     get_status_text,
     make_jump_url,
     print_with_json,
     transform_time,
 )
+from .prefetch import spawn_prefetch
 
 KEYRING_SERVICE_NAME = "lazy"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
@@ -55,6 +70,37 @@ class AssignmentType(Enum):
     FORMUN = 2
     EXAM = 3
     CLASSROOM = 4
+
+ASSIGNMENT_KIND_MAP: dict[str, AssignmentType] = {
+    KIND_ACTIVITY: AssignmentType.ACTIVITY,
+    KIND_FORUM: AssignmentType.FORMUN,
+    KIND_EXAM: AssignmentType.EXAM,
+    KIND_CLASSROOM: AssignmentType.CLASSROOM
+}
+
+# 待办事项的类型可以直接确定任务类型，其余类型（如问卷）仍需探测
+TODO_TYPE_MAP: dict[str, AssignmentType] = {
+    "homework": AssignmentType.ACTIVITY,
+    "forum": AssignmentType.FORMUN,
+    "exam": AssignmentType.EXAM,
+    "classroom": AssignmentType.CLASSROOM
+}
+
+# 批量浏览任务时的最大并发数
+VIEW_CONCURRENCY = 4
+
+@dataclass(slots=True)
+class AssignmentView:
+    """单个任务的浏览结果，JSON 模式下 result 为 dict，否则为待打印的 Rich 对象。"""
+    description: str
+    result: Any
+
+class AssignmentViewError(Exception):
+    """单个任务浏览失败，message 用于终端提示，json_message 用于 JSON 输出。"""
+    def __init__(self, message: str, json_message: str):
+        super().__init__(message)
+        self.message = message
+        self.json_message = json_message
     
 def is_todo_show_amount_valid(amount: int):
     if amount <= 0:
@@ -230,93 +276,121 @@ def parse_files_id(files_id: str)->list[int]:
     
     return list(set(files_id_list))
 
-async def guess_assignment_type(assignment_id: int, json: bool)->AssignmentType:
+def first_result(raw_results)->dict:
+    """取出 `asyncio.gather(..., return_exceptions=True)` 中单接口请求的响应，失败时返回空 dict。"""
+    if isinstance(raw_results, list) and raw_results and raw_results[0]:
+        return raw_results[0]
+    return {}
+
+def fetch_main_entity(client: ZjuAsyncClient, kind: str, assignment_id: int):
+    """返回请求指定类型任务主体的协程，作业与讨论共用同一接口"""
+    if kind in (KIND_ACTIVITY, KIND_FORUM):
+        return zju_api.assignmentViewAPIFits(client.session, assignment_id).get_api_data()
+    if kind == KIND_EXAM:
+        return zju_api.assignmentExamViewAPIFits(client.session, assignment_id, apis_name=["exam"]).get_api_data()
+    return zju_api.assignmentClassroomViewAPIFits(client.session, assignment_id, apis_name=["classroom"]).get_api_data()
+
+async def guess_assignment_type(client: ZjuAsyncClient, assignment_id: int, json: bool)->tuple[AssignmentType, dict]:
+    """确定任务类型，返回任务类型与探测时取得的任务主体数据。
+
+    优先查询本地索引，命中时只请求该类型的主体数据；主体为空说明索引已过期，删去该记录后
+    并发探测三种接口，结果写回索引，命中接口的响应交给后续的 view 直接复用。
+    """
+    type_index = AssignmentTypeIndex()
+    kind = type_index.lookup(assignment_id)
+    if kind:
+        raw_assignment = first_result((await asyncio.gather(fetch_main_entity(client, kind, assignment_id), return_exceptions=True))[0])
+        if raw_assignment:
+            logger.info(f"索引命中 {assignment_id} 为 {kind}")
+            if kind in (KIND_ACTIVITY, KIND_FORUM):
+                kind = KIND_FORUM if raw_assignment.get("type") == "forum" else KIND_ACTIVITY
+            return ASSIGNMENT_KIND_MAP[kind], raw_assignment
+
+        logger.info(f"索引中 {assignment_id} 为 {kind}，但请求结果为空，重新探测")
+        type_index.forget(assignment_id)
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
         disable=json
     ) as progress:
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-                logger.error("Cookies不存在！")
-                raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-        
         task = progress.add_task(description="正在猜测任务类型...",total=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            raw_activity, raw_exam, raw_classroom = await asyncio.gather(*[
-                zju_api.assignmentViewAPIFits(client.session, assignment_id).get_api_data(),
-                zju_api.assignmentExamViewAPIFits(client.session, assignment_id, apis_name=["exam"]).get_api_data(),
-                zju_api.assignmentClassroomViewAPIFits(client.session, assignment_id, apis_name=["classroom"]).get_api_data()
-            ], return_exceptions=True)
-
-        if raw_activity[0]:
-            if raw_activity[0].get("type") == "forum":
-                progress.update(task, description="猜测是作业!", completed=1)
-                logger.info(f"猜测 {assignment_id} 为 Activity")    
-                return AssignmentType.FORMUN
-            
+        raw_activity, raw_exam, raw_classroom = map(first_result, await asyncio.gather(*[
+            fetch_main_entity(client, probe_kind, assignment_id) for probe_kind in (KIND_ACTIVITY, KIND_EXAM, KIND_CLASSROOM)
+        ], return_exceptions=True))
+
+        if raw_activity:
+            kind = KIND_FORUM if raw_activity.get("type") == "forum" else KIND_ACTIVITY
+            raw_assignment = raw_activity
             progress.update(task, description="猜测是作业!", completed=1)
-            logger.info(f"猜测 {assignment_id} 为 Activity")
-            return AssignmentType.ACTIVITY
-        
-        
-        if isinstance(raw_exam, list) and raw_exam and raw_exam[0]:
+        elif raw_exam:
+            kind = KIND_EXAM
+            raw_assignment = raw_exam
             progress.update(task, description="猜测是测试!", completed=1)
-            logger.info(f"猜测 {assignment_id} 为 Exam")
-            return AssignmentType.EXAM
-        
-        
-        if isinstance(raw_classroom, list) and raw_classroom and raw_classroom[0]:
+        elif raw_classroom:
+            kind = KIND_CLASSROOM
+            raw_assignment = raw_classroom
             progress.update(task, description="猜测是课堂任务!", completed=1)
-            logger.info(f"猜测 {assignment_id} 为 Classroom")
-            return AssignmentType.CLASSROOM
-    
-    return AssignmentType.UNKOWN
+        else:
+            return AssignmentType.UNKOWN, {}
 
-async def view_exam(exam_id: int, type_map: dict, preview: bool, json: bool):
+    logger.info(f"猜测 {assignment_id} 为 {kind}")
+
+    # 同一 id 在多个接口下都存在时记为歧义，之后总是重新探测
+    hits = sum(1 for raw in (raw_activity, raw_exam, raw_classroom) if raw)
+    type_index.remember({assignment_id: kind if hits == 1 else KIND_AMBIGUOUS})
+
+    return ASSIGNMENT_KIND_MAP[kind], raw_assignment
+
+async def view_exam(
+        client: ZjuAsyncClient,
+        exam_id: int,
+        type_map: dict,
+        preview: bool,
+        json: bool,
+        raw_exam: dict|None = None,
+        show_progress: bool = True
+    )->AssignmentView:
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
-        disable=json
+        disable=json or not show_progress
     ) as progress:
         task = progress.add_task(description="请求数据中...", total=2)
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-                logger.error("Cookies不存在！")
-                raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-        
+
         # --- 请求阶段 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            raw_exam, raw_exam_submission_list, raw_exam_distribute = await zju_api.assignmentExamViewAPIFits(client.session, exam_id).get_api_data()
-        
-            if not raw_exam:
-                if json:
-                    print_with_json(False, f"Exam whose ID {exam_id} does not exist.")
-                    raise typer.Exit(code=1)
-                
-                rprint(f"[red]请求测试 [green]{exam_id}[/green] 不存在！[/red]")
-                raise typer.Exit(code=1)
+        # 类型探测时已取得测试主体的，只请求剩余接口；题目无法通过 distribute 预览时，取最近一次提交的题目
+        def head_submission(results: BatchResults)->dict|None:
+            if results.data("exam_distribute"):
+                return None
+            submissions = results.data("exam_submission_list").get("submissions") or []
+            return {"submission_id": submissions[0].get("id")} if submissions else None
+
+        batch = BatchExecutor(client.session)
+        if not raw_exam:
+            batch.add("exam", "assignment.exam", {"exam_id": exam_id})
+        batch.add("exam_submission_list", "assignment.exam_submission_list", {"exam_id": exam_id})
+        batch.add("exam_distribute", "assignment.exam_distribute", {"exam_id": exam_id})
+        batch.add(
+            "exam_submission",
+            "assignment.exam_submission",
+            {"exam_id": exam_id},
+            depends_on=["exam_submission_list", "exam_distribute"],
+            prepare=head_submission,
+            skip_on_failure=False
+        )
+        results = await batch.run()
 
-            if not raw_exam_distribute and raw_exam_submission_list:
-                head_submission_id = raw_exam_submission_list.get("submissions")[0].get("id")
-                raw_exam_submission_subjects = (await zju_api.assignmentExanSubmissionViewAPIFits(client.session, exam_id, head_submission_id).get_api_data())[0]
-            else:
-                raw_exam_submission_subjects = {}
+        raw_exam = raw_exam or results.data("exam")
+        raw_exam_submission_list = results.data("exam_submission_list")
+        raw_exam_distribute = results.data("exam_distribute")
+        raw_exam_submission_subjects = results.data("exam_submission")
+    
+        if not raw_exam:
+            raise AssignmentViewError(f"[red]请求测试 [green]{exam_id}[/green] 不存在！[/red]", f"Exam whose ID {exam_id} does not exist.")
 
         progress.advance(task, 1)
         progress.update(task, description="渲染数据中...")
@@ -341,6 +415,7 @@ async def view_exam(exam_id: int, type_map: dict, preview: bool, json: bool):
 
         # --- JSON FORMAT HEAD ---
         if json:
+            preview_content = None
             if preview:            
                 if not raw_exam_distribute and not raw_exam_submission_subjects.get("subjects_data"):
                     preview_content = "Preview Failed."
@@ -359,7 +434,7 @@ async def view_exam(exam_id: int, type_map: dict, preview: bool, json: bool):
                         "analysis": "推断"
                     }
 
-                    preview_content = extract_subjects_json(exam_subjects, subject_type_map, json)
+                    preview_content = extract_subjects_json(exam_subjects, subject_type_map)
 
             if raw_exam_submission_list:
                 # 测试最终成绩
@@ -403,8 +478,7 @@ async def view_exam(exam_id: int, type_map: dict, preview: bool, json: bool):
                 "preview": preview_content
             }
 
-            print_with_json(True, "Exam View", result)
-            return 
+            return AssignmentView("Exam View", result)
         # --- JSON FORMAT END ---
 
         # --- 解析预览内容 ---
@@ -582,51 +656,47 @@ async def view_exam(exam_id: int, type_map: dict, preview: bool, json: bool):
         progress.update(task, description="渲染完成...")
         progress.advance(task, 1)
 
-        rprint(exam_panel)
+        return AssignmentView("Exam View", exam_panel)
 
 async def view_classroom(
+        client: ZjuAsyncClient,
         classroom_id: int, 
         type_map: dict, 
         preview: bool,
-        json: bool
-    ):
+        json: bool,
+        classroom_message: dict|None = None,
+        show_progress: bool = True
+    )->AssignmentView:
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
-        disable=json
+        disable=json or not show_progress
     ) as progress:
         task = progress.add_task(description="请求数据中...", total=2)
-        cookies = CredentialManager().load_cookies()
-        
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-                logger.error("Cookies不存在！")
-                raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-        
-        # --- 请求阶段 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            # 请求classroom与classroom submission数据
-            classroom_message, raw_classroom_submissions_list, raw_classroom_subjects_result, raw_classroom_subjects = await zju_api.assignmentClassroomViewAPIFits(client.session, classroom_id).get_api_data()
 
-            if not classroom_message:
-                if json:
-                    print_with_json(False, f"Classroom Test whose ID {classroom_id} does not exist.")
-                    raise typer.Exit(code=1)
-                
-                rprint(f"[red]请求课堂测试 [green]{classroom_id}[/green] 不存在！[/red]")
-                raise typer.Exit(code=1)
-            
-            if classroom_message.get("subjects_count") > 0:
-                classroom_submissions_list: list[dict] = raw_classroom_submissions_list.get("submissions", [])
-            else: 
-                classroom_submissions_list = []
+        # --- 请求阶段 ---
+        # 请求classroom与classroom submission数据，类型探测时已取得classroom主体的，只请求剩余接口
+        batch = BatchExecutor(client.session)
+        if not classroom_message:
+            batch.add("classroom", "assignment.classroom", {"classroom_id": classroom_id})
+        for api_name in ("classroom_submissions", "classroom_subject_result", "classroom_subject"):
+            batch.add(api_name, f"assignment.{api_name}", {"classroom_id": classroom_id})
+        results = await batch.run()
+
+        classroom_message = classroom_message or results.data("classroom")
+        raw_classroom_submissions_list = results.data("classroom_submissions")
+        raw_classroom_subjects_result = results.data("classroom_subject_result")
+        raw_classroom_subjects = results.data("classroom_subject")
+
+        if not classroom_message:
+            raise AssignmentViewError(f"[red]请求课堂测试 [green]{classroom_id}[/green] 不存在！[/red]", f"Classroom Test whose ID {classroom_id} does not exist.")
+        
+        if (classroom_message.get("subjects_count") or 0) > 0:
+            classroom_submissions_list: list[dict] = raw_classroom_submissions_list.get("submissions", [])
+        else: 
+            classroom_submissions_list = []
         
         progress.advance(task, 1)
         progress.update(task, description="渲染数据中...")
@@ -656,6 +726,7 @@ async def view_classroom(
                 submissions_list = None
 
             # --- 解析预览内容 ---
+            preview_content = None
             if preview:
                 if not raw_classroom_subjects_result and not raw_classroom_subjects:
                     preview_content = "Preview Failed."
@@ -686,8 +757,7 @@ async def view_classroom(
 
             }
 
-            print_with_json(True, "Classroom Test View", result)
-            return 
+            return AssignmentView("Classroom Test View", result)
         # --- JSON FORMAT END ---
 
         classroom_start_time_text = Text.assemble(
@@ -794,63 +864,50 @@ async def view_classroom(
         progress.advance(task, 1)
         progress.update(task, description="渲染完成")
 
-        rprint(classroom_panel)
+        return AssignmentView("Classroom Test View", classroom_panel)
 
 async def view_activity(
+        client: ZjuAsyncClient,
         activity_id: int, 
         type_map: dict,
-        json: bool
-    ):
+        json: bool,
+        raw_activity: dict|None = None,
+        show_progress: bool = True
+    )->AssignmentView:
 
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
-        disable=json
+        disable=json or not show_progress
     ) as progress:
         
         task = progress.add_task(description="请求数据中...", total=2)
 
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-                logger.error("Cookies不存在！")
-                raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            # --- 请求阶段 ---
-            # 请求预览数据
-            # raw_activity_read: dict = (await zju_api.assignmentPreviewAPIFits(client.session, activity_id).post_api_data())[0]
-            
-            student_id = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME)
-            
-            if not student_id:
-                logger.error(f"{activity_id} 缺少'laz_studentid'参数，请将此问题上报给开发者！")
-                if json:
-                    print_with_json(False, "STUDENT_ID does not exist. Report it to developer,")
-                    raise typer.Exit(code=1)
-                
-                print("STUDENT_ID 缺失，请尝试重新登录！")
-                raise typer.Exit(code=1)
+        # --- 请求阶段 ---
+        # 请求预览数据
+        # raw_activity_read: dict = (await zju_api.assignmentPreviewAPIFits(client.session, activity_id).post_api_data())[0]
+        
+        student_id = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME)
+        
+        if not student_id:
+            logger.error(f"{activity_id} 缺少'laz_studentid'参数，请将此问题上报给开发者！")
+            raise AssignmentViewError("STUDENT_ID 缺失，请尝试重新登录！", "STUDENT_ID does not exist. Report it to developer,")
 
-            # 请求主体数据
+        # 请求主体数据，类型探测时已取得的直接复用
+        if not raw_activity:
             raw_activity = (await zju_api.assignmentViewAPIFits(client.session, activity_id).get_api_data())[0]
+    
+        activity_completion_criterion_key: str = raw_activity.get("completion_criterion_key", "none")
         
-            activity_completion_criterion_key: str = raw_activity.get("completion_criterion_key", "none")
-            
-            # 判断是否获取提交列表（必须是提交完成的任务且有提交记录）
-            if activity_completion_criterion_key == "submitted":
-                if raw_activity.get("user_submit_count") and raw_activity.get("user_submit_count") > 0:
-                    raw_submission_list = (await zju_api.assignmentSubmissionListAPIFits(client.session, activity_id, student_id).get_api_data())[0]
-                else:
-                    raw_submission_list = {}
+        # 判断是否获取提交列表（必须是提交完成的任务且有提交记录）
+        if activity_completion_criterion_key == "submitted":
+            if raw_activity.get("user_submit_count") and raw_activity.get("user_submit_count") > 0:
+                raw_submission_list = (await zju_api.assignmentSubmissionListAPIFits(client.session, activity_id, student_id).get_api_data())[0]
             else:
                 raw_submission_list = {}
+        else:
+            raw_submission_list = {}
             
         progress.advance(task, advance=1)
 
@@ -915,8 +972,7 @@ async def view_activity(
                 "submissions": submissions
             }
 
-            print_with_json(True, "Activity View", result)
-            return 
+            return AssignmentView("Activity View", result)
 
         start_time_text = Text.assemble(
             ("开放时间: ", "cyan"),
@@ -1050,49 +1106,36 @@ async def view_activity(
         
         progress.advance(task, advance=1)
 
-    rprint(activity_panel)
+    return AssignmentView("Activity View", activity_panel)
 
 async def view_forum(
+    client: ZjuAsyncClient,
     activity_id: int,
     type_map: dict,
-    json: bool
-):
+    json: bool,
+    raw_activity: dict|None = None,
+    show_progress: bool = True
+)->AssignmentView:
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
-        disable=json
+        disable=json or not show_progress
     ) as progress:
         
         task = progress.add_task(description="请求数据中...", total=2)
 
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-                logger.error("Cookies不存在！")
-                raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            # --- 请求阶段 ---
-            # 请求任务数据            
+        # --- 请求阶段 ---
+        # 请求任务数据，类型探测时已取得的直接复用
+        if not raw_activity:
             raw_activity = (await zju_api.assignmentViewAPIFits(client.session, activity_id).get_api_data())[0]
-            category_id = raw_activity.get("topic_category_id", None)
-
-            if not category_id:
-                if json:
-                    print_with_json(False, "CATEGORY_ID does not exist!")
-                    raise typer.Exit(code=1)
+        category_id = raw_activity.get("topic_category_id", None)
 
-                rprint(f"{activity_id} 返回存在问题，请将此问题上报给开发者！")
-                raise typer.Exit(code=1)
+        if not category_id:
+            raise AssignmentViewError(f"{activity_id} 返回存在问题，请将此问题上报给开发者！", "CATEGORY_ID does not exist!")
 
-            # 请求讨论数据
-            raw_forum = (await zju_api.assignmentViewForumAPIFits(client.session, category_id).get_api_data())[0]
+        # 请求讨论数据
+        raw_forum = (await zju_api.assignmentViewForumAPIFits(client.session, category_id).get_api_data())[0]
         
         progress.update(task, advance=1, description="渲染数据中...")
 
@@ -1219,7 +1262,102 @@ async def view_forum(
 
         progress.advance(task, advance=1)
 
-    rprint(activity_panel)
+    return AssignmentView("Forum View", activity_panel)
+
+async def resolve_and_view(
+        client: ZjuAsyncClient,
+        assignment_id: int,
+        assignment_type: AssignmentType,
+        preview: bool,
+        json: bool,
+        show_progress: bool
+    )->AssignmentView:
+    """确定任务类型（未指定时探测）后拉取并渲染任务，失败时抛出 AssignmentViewError。"""
+    # 统一一下接口方便调用
+    async def view_activity_wrapper(client: ZjuAsyncClient, activity_id: int, type_map: dict, _: bool, json: bool, raw_activity: dict|None = None, show_progress: bool = True):
+        return await view_activity(client, activity_id, type_map, json, raw_activity, show_progress)
+    
+    async def view_forum_wrapper(client: ZjuAsyncClient, activity_id: int, type_map: dict, _: bool, json: bool, raw_activity: dict|None = None, show_progress: bool = True):
+        return await view_forum(client, activity_id, type_map, json, raw_activity, show_progress)
+
+    view_callable_map: dict[AssignmentType, Callable] = {
+        AssignmentType.ACTIVITY: view_activity_wrapper,
+        AssignmentType.FORMUN: view_forum_wrapper,
+        AssignmentType.EXAM: view_exam,
+        AssignmentType.CLASSROOM: view_classroom
+    }
+
+    # 猜测任务类型，探测得到的任务主体数据交给对应的 view 复用
+    raw_assignment = {}
+    if assignment_type == AssignmentType.UNKOWN:
+        assignment_type, raw_assignment = await guess_assignment_type(client, assignment_id, json or not show_progress)
+
+    if assignment_type == AssignmentType.UNKOWN:
+        raise AssignmentViewError(f"任务 {assignment_id} 不存在！", f"Assignment {assignment_id} doesn't exist.")
+
+    if assignment_type in (AssignmentType.ACTIVITY, AssignmentType.FORMUN) and preview:
+        raise AssignmentViewError("[red]'activity' 类型不可预览！[/red]", "Assignment whose type is 'Activity' cannot be previewed.")
+
+    return await view_callable_map[assignment_type](client, assignment_id, type_map, preview, json, raw_assignment, show_progress=show_progress)
+
+async def view_assignments_batch(client: ZjuAsyncClient, targets: list[tuple[int, AssignmentType]], preview: bool, json: bool)->int:
+    """在同一个 client 上并发浏览多个任务，按给定顺序输出，返回失败的任务数量。
+
+    各任务的进度提示关闭，改为一个总进度；一个任务出错不影响其他任务。
+    """
+    semaphore = asyncio.Semaphore(VIEW_CONCURRENCY)
+
+    async def view_one(assignment_id: int, assignment_type: AssignmentType)->AssignmentView|AssignmentViewError:
+        async with semaphore:
+            try:
+                return await resolve_and_view(client, assignment_id, assignment_type, preview, json, show_progress=False)
+            except AssignmentViewError as e:
+                return e
+            except Exception as e:
+                logger.error(f"任务 {assignment_id} 浏览失败: {repr(e)}")
+                return AssignmentViewError(f"[red]任务 {assignment_id} 请求失败！[/red]", f"Assignment {assignment_id} request failed.")
+
+    tasks = [asyncio.create_task(view_one(assignment_id, assignment_type)) for assignment_id, assignment_type in targets]
+    results = []
+    failed = 0
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed}/{task.total}"),
+        transient=True,
+        disable=json
+    ) as progress:
+        task = progress.add_task(description="浏览任务中...", total=len(tasks))
+
+        # 按顺序等待，前面的任务完成后立即输出，后面的任务仍在并发请求
+        for (assignment_id, _), view_task in zip(targets, tasks, strict=True):
+            view = await view_task
+            progress.advance(task)
+
+            if isinstance(view, AssignmentViewError):
+                failed += 1
+                if json:
+                    results.append({"id": assignment_id, "status": False, "description": view.json_message, "result": None})
+                else:
+                    progress.console.print(view.message)
+                continue
+
+            if json:
+                # 讨论类任务没有 JSON 格式
+                if isinstance(view.result, dict):
+                    results.append({"id": assignment_id, "status": True, "description": view.description, "result": view.result})
+                else:
+                    failed += 1
+                    results.append({"id": assignment_id, "status": False, "description": f"{view.description} has no JSON format.", "result": None})
+                continue
+
+            progress.console.print(view.result)
+
+    if json:
+        print_with_json(True, "Assignments View", results)
+
+    return failed
 
 @app.command(
     "vw",
@@ -1233,6 +1371,12 @@ async def view_forum(
             
           $ lazy assignment view 114514 -e -P
             (查看ID为'114514'的测试内容，并预览其测试题目)
+
+          $ lazy assignment view 114514 1919810
+            (同时查看两个任务)
+
+          $ lazy assignment view -T
+            (查看待办清单中的所有任务)
     """),
     no_args_is_help=True)
 @app.command(
@@ -1246,16 +1390,23 @@ async def view_forum(
             
           $ lazy assignment view 114514 -e -P
             (查看ID为'114514'的测试内容，并预览其测试题目)
+
+          $ lazy assignment view 114514 1919810
+            (同时查看两个任务)
+
+          $ lazy assignment view -T
+            (查看待办清单中的所有任务)
     """),
     no_args_is_help=True)
 @partial(syncify, raise_sync_error=False)
 async def view_assignment(
-    assignment_id: Annotated[int, typer.Argument(help="任务id")],
+    assignment_ids: Annotated[list[int] | None, typer.Argument(help="任务id，可以同时指定多个")] = None,
     exam: Annotated[bool | None, typer.Option("--exam", "-e", help="启用此选项，将查询对应的考试")] = False,
     classroom: Annotated[bool | None, typer.Option("--classroom", "-c", help="启用此选项，将查询对应课堂任务")] = False,
     activity: Annotated[bool | None, typer.Option("--activity", "-H", help="启用此选项，将查询对应作业")] = False,
     forum: Annotated[bool | None, typer.Option("--forum", "-F", help="启用此选项，将查询对应讨论")] = False,
     preview: Annotated[bool | None, typer.Option("--preview", "-P", help="启用此选项，预览测试或课堂任务题目")] = False,
+    from_todo: Annotated[bool | None, typer.Option("--from-todo", "-T", help="启用此选项，浏览待办清单中的所有任务")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
     """
@@ -1264,47 +1415,70 @@ async def view_assignment(
     通过指定 -c, -e, -H 来指定三种不同类型的任务，更推荐不指定此选项，lazy会自行判断任务类型。
 
     对于测试与课堂互动型的任务，使用 -P 可以预览其测试题目。
-    """
-    assignment_type = AssignmentType.UNKOWN
 
-    # 猜测任务类型
-    match (activity, forum, exam, classroom): 
-        case (True, _, _, _): assignment_type = AssignmentType.ACTIVITY
-        case (_, True, _, _): assignment_type = AssignmentType.FORMUN
-        case (_, _, True, _): assignment_type = AssignmentType.EXAM
-        case (_, _, _, True): assignment_type = AssignmentType.CLASSROOM
-        case _: assignment_type =  await guess_assignment_type(assignment_id, json)
-
-    if assignment_type == AssignmentType.UNKOWN:
-        if json:
-            print_with_json(True, f"Assignment {assignment_id} doesn't exist.")
-        
-        rprint(f"任务 {assignment_id} 不存在！")
+    可以同时指定多个任务id，或使用 -T 浏览待办清单中的所有任务，多个任务会并发请求并按顺序输出。
 
-    if assignment_type in (AssignmentType.ACTIVITY, AssignmentType.FORMUN) and preview:
+    由 'lazy assignment todo --prefetch' 在后台预取过的任务直接使用预取的内容。
+    """
+    cookies = CredentialManager().load_cookies()
+    if not cookies:
         if json:
-            print_with_json(False, "Assignment whose type is 'Activity' cannot be previewed.")
+            print_with_json(False, "Cookies is unacceptable.")
+            logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
         
-        rprint("[red]'activity' 类型不可预览！[/red]")
+        rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
-    
-    # 统一一下接口方便调用
-    async def view_activity_wrapper(activity_id: int, type_map: dict, _: bool, json: bool):
-        return await view_activity(activity_id, type_map, json)
-    
-    async def view_forum_wrapper(activity_id: int, type_map: dict, _: bool, json: bool):
-        return await view_forum(activity_id, type_map, json)
 
-    view_callable_map: dict[AssignmentType, Callable] = {
-        AssignmentType.ACTIVITY: view_activity_wrapper,
-        AssignmentType.FORMUN: view_forum_wrapper,
-        AssignmentType.EXAM: view_exam,
-        AssignmentType.CLASSROOM: view_classroom
-    }
+    match (activity, forum, exam, classroom): 
+        case (True, _, _, _): forced_type = AssignmentType.ACTIVITY
+        case (_, True, _, _): forced_type = AssignmentType.FORMUN
+        case (_, _, True, _): forced_type = AssignmentType.EXAM
+        case (_, _, _, True): forced_type = AssignmentType.CLASSROOM
+        case _: forced_type = AssignmentType.UNKOWN
+
+    async with open_client(cookies, ResponseCache.load(session_key(cookies))) as client:
+        targets: list[tuple[int, AssignmentType]] = [(assignment_id, forced_type) for assignment_id in assignment_ids or []]
+
+        if from_todo:
+            raw_todo_list = (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
+            no_deadline = datetime(3000, 1, 1, tzinfo=timezone.utc)
+            todo_list = sorted(parse_list(raw_todo_list, "todo_list", Todo), key=lambda todo: todo.deadline or no_deadline)
+            targets.extend(
+                (todo.id, forced_type if forced_type != AssignmentType.UNKOWN else TODO_TYPE_MAP.get(todo.type, AssignmentType.UNKOWN))
+                for todo in todo_list
+            )
+
+        if not targets:
+            if json:
+                print_with_json(False, "No assignment to view.")
+            else:
+                rprint("没有需要浏览的任务！")
+            raise typer.Exit(code=1)
+
+        # 单个任务保持原有的输出格式与进度提示
+        if len(targets) == 1 and not from_todo:
+            assignment_id, assignment_type = targets[0]
+            try:
+                view = await resolve_and_view(client, assignment_id, assignment_type, preview, json, show_progress=True)
+            except AssignmentViewError as e:
+                if json:
+                    print_with_json(False, e.json_message)
+                else:
+                    rprint(e.message)
+                raise typer.Exit(code=1) from e
+
+            if json and isinstance(view.result, dict):
+                print_with_json(True, view.description, view.result)
+            else:
+                rprint(view.result)
+            return
+
+        failed = await view_assignments_batch(client, targets, preview, json)
 
-    await view_callable_map[assignment_type](assignment_id, type_map, preview, json)
-    return
+    if failed:
+        raise typer.Exit(code=1)
 
 @app.command(
     "td",
@@ -1333,6 +1507,9 @@ async def view_assignment(
         
           $ lazy assignment todo -r       
             (反转排序顺序查看待办事项清单)
+
+          $ lazy assignment todo --prefetch 3
+            (在后台预取前 3 个任务的内容)
     """))
 @partial(syncify, raise_sync_error=False)
 async def todo_assignment(
@@ -1340,6 +1517,9 @@ async def todo_assignment(
     page_index: Annotated[int | None, typer.Option("--page", "-p", help="待办任务页面索引")] = 1,
     reverse: Annotated[bool | None, typer.Option("--reverse", "-r", help="以任务截止时间降序排列")] = False,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此选项，输出所有待办事项")] = False,
+    offline: Annotated[bool | None, typer.Option("--offline", "-O", help="启用此选项，从本地镜像读取，不访问网络")] = False,
+    prefetch: Annotated[int, typer.Option("--prefetch", help="在后台预取本页前 N 个任务，随后的 'lazy assignment view' 可直接使用", min=0)] = 0,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
     """
@@ -1349,7 +1529,13 @@ async def todo_assignment(
     使用 -A 来显示所有待办清单，这将忽略 -p 与 -a。
 
     默认以任务截止时间作为排序依据，越早截止，排序越靠前，使用 -r 来反转任务清单排序结果。
+
+    使用 -O 从本地镜像读取（需先运行 'lazy mirror refresh'）。
+
+    使用 --prefetch N 在后台以低优先级预取本页前 N 个任务（最多 10 个），之后查看这些任务时无需再等待请求。
     """
+    output = JSONRecordWriter("Todo List", ndjson, ("title", "course_name", "course_id", "todo_id", "end_time", "todo_type"))
+    json = json or ndjson
     todo_panel_list = []
 
     with Progress(
@@ -1361,26 +1547,38 @@ async def todo_assignment(
         
         task = progress.add_task(description="获取待办事项信息中...", total=1)
         
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
+        if offline:
+            with MirrorStore() as store:
+                raw_todo_list = store.todo_list()
+
+            if raw_todo_list == None:
+                if json:
+                    print_with_json(False, "Not Mirrored")
+                    raise typer.Exit(code=1)
+
+                rprint("本地镜像中没有待办清单，请先运行 'lazy mirror refresh'。")
+                raise typer.Exit(code=1)
+        else:
+            cookies = CredentialManager().load_cookies()
+            if not cookies:
+                if json:
+                    print_with_json(False, "Cookies is unacceptable.")
+                    logger.error("Cookies不存在！")
+                    raise typer.Exit(code=1)
+                
+                rprint("Cookies不存在！")
                 logger.error("Cookies不存在！")
                 raise typer.Exit(code=1)
-            
-            rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            raw_todo_list: dict = (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
+            async with open_client(cookies) as client:
+                raw_todo_list: dict = (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
         progress.advance(task, advance=1)
 
         task = progress.add_task(description="加载内容中...", total=1)
 
-        todo_list: list[dict] = raw_todo_list.get("todo_list", [])
+        raw_todos = raw_todo_list.get("todo_list", [])
         
-        if type(todo_list) != list:
+        if type(raw_todos) != list:
             if json:
                 print_with_json(False, "todo list resolving occur error.")
                 raise typer.Exit(code=1)
@@ -1389,12 +1587,14 @@ async def todo_assignment(
             print("待办事项清单解析存在异常！")
             raise typer.Exit(code=1)
         
+        todo_list = parse_list(raw_todo_list, "todo_list", Todo)
+
         # 总任务数量
         total = len(todo_list)
         
         if total == 0:
             if json:
-                print_with_json(True, "There are currently no todos.")
+                output.close("There are currently no todos.")
                 return
             
             print("当前没有待办任务哦~")
@@ -1415,36 +1615,38 @@ async def todo_assignment(
             total_pages = 1
 
         # 依照截止时间排序
-        todo_list = sorted(todo_list, key=lambda todo: datetime.fromisoformat(todo.get("end_time").replace('Z', '+00:00') if todo.get("end_time") else "3000-01-01T00:00:00+00:00"), reverse=reverse)
+        no_deadline = datetime(3000, 1, 1, tzinfo=timezone.utc)
+        todo_list = sorted(todo_list, key=lambda todo: todo.deadline or no_deadline, reverse=reverse)
 
         start = amount * (page_index - 1)
         todo_list = todo_list[start:]
 
-        json_result = []
+        if prefetch and not offline:
+            spawn_prefetch("assignments", [f"{todo.id}:{todo.type}" for todo in todo_list[:min(prefetch, amount)]])
 
         for index, todo in enumerate(todo_list):
             if index > amount - 1:
                 amount = index
                 break
 
-            title = todo.get("title", "null")
-            course_name = todo.get("course_name", "null")
-            course_id = todo.get("course_id", "null")
-            todo_id = todo.get("id", "null")
-            end_time = datetime.fromisoformat(todo.get("end_time").replace('Z', '+00:00')) if todo.get("end_time") else None
-            todo_type = type_map.get(todo.get("type", "null"), todo.get("type", "null"))
+            title = todo.title
+            course_name = todo.course_name
+            course_id = todo.course_id
+            todo_id = todo.id
+            end_time = todo.deadline
+            todo_type = type_map.get(todo.type, todo.type)
 
             if json:
-                json_todo = {
+                output.write({
                     "title": title,
                     "course_name": course_name,
                     "course_id": course_id,
                     "todo_id": todo_id,
                     "end_time": end_time,
                     "todo_type": todo_type
-                }
+                })
 
-                json_result.append(json_todo)
+                continue
 
             # 创建标题内容
             title_text = Text.assemble(
@@ -1491,7 +1693,7 @@ async def todo_assignment(
                 )
 
             # 构建跳转链接文本
-            url_jump = make_jump_url(course_id, todo_id, todo.get("type", "null"))
+            url_jump = make_jump_url(course_id, todo_id, todo.type)
             url_jump_text = Text.assemble(
                 ("跳转链接: ", "cyan"),
                 (url_jump, "bright_white")
@@ -1522,7 +1724,7 @@ async def todo_assignment(
         progress.advance(task, advance=1)
     
     if json:
-        print_with_json(True, "Todo List", json_result)
+        output.close()
         return 
     
     rprint(*todo_panel_list)
@@ -1588,7 +1790,7 @@ async def submit_assignment(
         logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with open_client(cookies) as client:
         status = await zju_api.assignmentSubmitAPIFits(client.session, activity_id, text, files_id).submit()
         
         if json:
@@ -1657,7 +1859,7 @@ async def open_topic(
         logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
     
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with open_client(cookies) as client:
         status = await zju_api.assignmentOpenForumTopicAPIFits(client.session, category_id, title, text, files_id).submit()
         
         if json:
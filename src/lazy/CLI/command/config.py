@@ -4,7 +4,12 @@ from typing import Annotated
 import typer
 from rich import print as rprint
 
-from ...core.load_config.backup import BackupManager, LoadManager
+from ...core.load_config.backup import (
+    COMPRESSION_METHODS,
+    DEFAULT_COMPRESSION,
+    BackupManager,
+    LoadManager,
+)
 
 app = typer.Typer(help="管理 LAZY CLI 配置文件")
 
@@ -17,7 +22,9 @@ def backup(
     user: Annotated[bool | None, typer.Option("--user", "-u", help="启用此选项，备份用户配置")] = False,
     lazy: Annotated[bool | None, typer.Option("--lazy", "-l", help="启用此选项，备份程序配置")] = False,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此选项，导出所有配置")] = False,
-    ouyput_dir: Annotated[str | None, typer.Option("--dest", "-d", help="备份目标文件夹")] = Path.home()
+    ouyput_dir: Annotated[str | None, typer.Option("--dest", "-d", help="备份目标文件夹")] = Path.home(),
+    compression: Annotated[str, typer.Option("--compression", "-c", help="压缩方式: deflate, zstd (需 Python 3.14+) 或 store")] = DEFAULT_COMPRESSION,
+    incremental: Annotated[bool | None, typer.Option("--incremental", "-i", help="启用此选项，只导出自上次导出后变化的文件")] = False
 ):
     if not (user or lazy or all):
         rprint("[red]应至少制定一种备份模式！[/red]")
@@ -28,7 +35,11 @@ def backup(
         rprint("[red]目标文件夹不存在！[/red]")
         raise typer.Exit(code=1)
 
-    manager = BackupManager(destination)
+    if compression not in COMPRESSION_METHODS:
+        rprint(f"[red]不支持的压缩方式 {compression}！[/red]可选: {', '.join(COMPRESSION_METHODS)}")
+        raise typer.Exit(code=1)
+
+    manager = BackupManager(destination, compression, incremental)
     
     if user or all:
         if manager.run_for_user():
@@ -1,5 +1,7 @@
+import asyncio
 import logging
 import math
+from contextlib import nullcontext
 from functools import partial
 from textwrap import dedent
 from typing import Annotated
@@ -17,15 +19,27 @@ from rich.text import Text
 from rich.tree import Tree
 
 from ...core.login.login import CredentialManager, ZjuAsyncClient
+from ...core.mirror.prefetch import ResponseCache, session_key
+from ...core.mirror.store import (
+    COURSE_PREVIEW_APIS,
+    COURSE_VIEW_APIS,
+    MirrorStore,
+    ingest,
+)
+from ...core.models.assignment_index import AssignmentTypeIndex
+from ...core.models.course_tree import CourseTree, ModuleNode
+from ...core.models.models import Course, Module, Rollcall, Upload, parse_list
 from ...core.zjuAPI import zju_api
 from ..config.config import type_map
-from ..state import state
+from ..session import open_client
 from ..utils.utils import (
+    JSONRecordWriter,
     get_status_text,
     make_jump_url,
     print_with_json,
     transform_time,
 )
+from .prefetch import spawn_prefetch
 
 KEYRING_SERVICE_NAME = "lazy"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
@@ -120,23 +134,652 @@ def parse_indices(indices: str|None)->list[int]:
     # 去重，排序
     return sorted(list(set(result)))
 
-def extract_modules(modules: list[dict], indices: list[int], modules_id: list[int], last: bool)->list[tuple[int, dict]]:
+def extract_modules(modules: list[Module], indices: list[int], modules_id: list[int], last: bool)->list[Module]:
     result = []
     
     safe_indices = indices if indices is not None else []
     safe_modules_id = modules_id if modules_id is not None else []
 
     for index, module in enumerate(modules):
-        if index in safe_indices or module.get("id") in safe_modules_id:
-            result.append((module.get("id"), module))
+        if index in safe_indices or module.id in safe_modules_id:
+            result.append(module)
 
     if last:
         last_module = modules[-1]
-        if all(module_item.get("id") != last_module.get("id") for _, module_item in result):
-            result.append((last_module.get("id"), last_module))
+        if all(module_item.id != last_module.id for module_item in result):
+            result.append(last_module)
 
     return result
 
+SYLLABUS_FIELDS = ("course_id", "course_name", "index", "id", "name")
+SYLLABUS_EXPANDED_FIELDS = ("course_id", "course_name", "name", "activities", "exams", "classroom_tests")
+
+def filter_module_node(node: ModuleNode, only_activity: bool, only_classroom: bool, only_exam: bool, only_homework: bool)->ModuleNode:
+    activities = []
+    if not (only_classroom or only_exam):
+        activities = [activity for activity in node.activities if not only_homework or activity.type == "homework"]
+
+    exams = [] if (only_classroom or only_activity or only_homework) else node.exams
+    classrooms = [] if (only_exam or only_activity or only_homework) else node.classrooms
+
+    return ModuleNode(node.module, activities, exams, classrooms)
+
+def module_node_json(course_index: CourseTree, node: ModuleNode)->dict:
+    activities = []
+    for activity in node.activities:
+        completion_status = course_index.is_activity_completed(activity.id)
+
+        # 附件
+        uploads = []
+        for upload in activity.uploads:
+            uploads.append({
+                "filename": upload.name,
+                "id": upload.id,
+                "size": filesize.decimal(upload.size)
+            })
+
+        activities.append({
+            "title": activity.title,
+            "type": type_map.get(activity.type, activity.type),
+            "id": activity.id,
+            "completion": get_completion_json(completion_status, activity.completion_criterion_key),
+            "start_time": transform_time(activity.start_time),
+            "is_started": activity.is_started,
+            "end_time": transform_time(activity.end_time),
+            "is_closed": activity.is_closed,
+            "uploads": uploads
+        })
+    
+    exams = []
+    for exam in node.exams:
+        completion_status = course_index.is_exam_completed(exam.id)
+        exams.append({
+            "title": exam.title,
+            "type": type_map.get(exam.type, exam.type),
+            "id": exam.id,
+            "completion": get_completion_json(completion_status, exam.completion_criterion_key),
+            "start_time": transform_time(exam.start_time),
+            "is_started": exam.is_started,
+            "end_time": transform_time(exam.end_time),
+            "is_closed": exam.is_closed
+        })
+
+    classrooms = []
+    for classroom in node.classrooms:
+        classroom_completeness_status = "full" if course_index.is_classroom_completed(classroom.id) else ""
+        classrooms.append({
+            "title": classroom.title,
+            "type": type_map.get(classroom.type, classroom.type),
+            "id": classroom.id,
+            "start_time": transform_time(classroom.start_at),
+            "status": get_classroom_status_json(classroom.status),
+            "completion": get_classroom_completion_json(classroom_completeness_status)
+        })
+
+    return {
+        "name": node.module.name,
+        "activities": activities,
+        "exams": exams,
+        "classroom_tests": classrooms
+    }
+
+def add_module_node_tree(course_tree: Tree, course_index: CourseTree, node: ModuleNode):
+    course_id = course_index.course_id
+    module_tree = course_tree.add(f"[green]{node.module.name}[/green][dim] 章节ID: {node.module.id}[/dim]")
+
+    # --- 加载活动内容 ---
+    for activity in node.activities:
+        # 标题、类型与ID
+        activity_type = type_map.get(activity.type, activity.type)
+        completion_status = course_index.is_activity_completed(activity.id)
+        # 活动的start_time和end_time都可能是null值，必须多做一次判断
+        # is_started 和 is_closed 来判断活动是否开始或者截止
+
+        # 创建状态描述文本和截止时间富文本
+        status_text = get_status_text(activity.is_started, activity.is_closed)
+        start_time_text = Text.assemble(
+            ("开放时间: ", "cyan"),
+            (transform_time(activity.start_time), "bright_white")
+        )
+        end_time_text = Text.assemble(
+            ("截止时间: ", "cyan"),
+            (transform_time(activity.end_time), "bright_white")
+        )
+        # 跳转链接
+        url_jump = make_jump_url(course_id, activity.id, activity.type)
+        url_jump_text = Text.assemble(
+            ("跳转链接: ", "cyan"),
+            (url_jump, "bright_white")
+        )
+
+        # 任务完成状态
+        if activity_type != "讨论":
+            completion_text = get_completion_text(completion_status, activity.completion_criterion_key)
+        else:
+            completion_text = Text()
+
+        # --- 准备Panel内容 ---
+        content_renderables = []
+        title_line = Text.assemble(
+            (f"{activity.title}", "bold bright_magenta"),
+            (" [ID: ", "bright_white"),
+            (f"{activity.id}", "green"),
+            ("]", "bright_white"),
+            "\n",
+            completion_text,
+            status_text
+        )
+        content_renderables.append(title_line)
+        content_renderables.append(start_time_text)
+        content_renderables.append(end_time_text)
+        if url_jump:
+            content_renderables.append(url_jump_text)
+
+        # 附件
+        if activity.uploads:
+            content_renderables.append("[cyan]附件: [/cyan]")
+
+        for upload in activity.uploads:
+            upload_table = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
+            upload_table.add_column("Name", no_wrap=True)
+            upload_table.add_column("Info", justify="right")
+
+            upload_table.add_row(
+                f"{upload.name}",
+                f"大小: {filesize.decimal(upload.size)} | 文件ID: {upload.id}"
+            )
+            
+            content_renderables.append(upload_table)
+
+        if activity_type == "作业":
+            panel_title = f"[cyan][{activity_type}][/cyan]"
+
+        else:
+            panel_title = f"[white][{activity_type}][/white]"
+
+        activity_panel = Panel(
+            Group(*content_renderables),
+            title=panel_title,
+            border_style="bright_cyan" if activity_type == "作业" else "bright_black",
+            expand=True,
+            padding=(1, 2)
+        )
+
+        module_tree.add(activity_panel)
+
+    # --- 加载测试内容 ---
+    for exam in node.exams:
+        exam_type = type_map.get(exam.type, exam.type)
+        completion_status = course_index.is_exam_completed(exam.id)
+
+        # 创建状态描述文本和截止时间富文本
+        status_text = get_status_text(exam.is_started, exam.is_closed)
+        start_time_text = Text.assemble(
+            ("开放时间: ", "cyan"),
+            (transform_time(exam.start_time), "bright_white")
+        )
+        end_time_text = Text.assemble(
+            ("截止时间: ", "cyan"),
+            (transform_time(exam.end_time), "bright_white")
+        )
+        url_jump = make_jump_url(course_id, exam.id, exam.type)
+        url_jump_text = Text.assemble(
+            ("跳转链接: ", "cyan"),
+            (url_jump, "bright_white")
+        )
+
+        completion_text = get_completion_text(completion_status, exam.completion_criterion_key)
+
+        # --- 准备Panel内容 ---
+        content_renderables = []
+        title_line = Text.assemble(
+            (f"{exam.title}", "bold bright_magenta"),
+            (" [ID: ", "bright_white"),
+            (f"{exam.id}", "green"),
+            ("]", "bright_white"),
+            "\n",
+            completion_text,
+            status_text
+        )
+        content_renderables.append(title_line)
+        content_renderables.append(start_time_text)
+        content_renderables.append(end_time_text)
+        content_renderables.append(url_jump_text)
+
+        panel_title = f"[yellow][{exam_type}][/yellow]"
+
+        exam_panel = Panel(
+            Group(*content_renderables),
+            title=panel_title,
+            border_style="bright_yellow",
+            expand=True,
+            padding=(1, 2)
+        )
+
+        module_tree.add(exam_panel)
+
+    # --- 加载课堂任务内容 ---
+    for classroom in node.classrooms:
+        classroom_type = type_map.get(classroom.type, classroom.type)
+        classroom_completeness_status = "full" if course_index.is_classroom_completed(classroom.id) else ""
+
+        classroom_status_text = get_classroom_status_text(classroom.status)
+        classroom_completeness_status_text = get_classroom_completion_text(classroom_completeness_status)
+        start_time_text = Text.assemble(
+            ("开放时间: ", "cyan"),
+            (transform_time(classroom.start_at), "bright_white")
+        )
+
+        prompt_text = Text("请在移动端上完成！", "red")
+        
+        # --- 准备Panel内容 ---
+        content_renderables = []
+        title_line = Text.assemble(
+            (f"{classroom.title}", "bold bright_magenta"),
+            (" [ID: ", "bright_white"),
+            (f"{classroom.id}", "green"),
+            ("]", "bright_white"),
+            "\n",
+            classroom_completeness_status_text,
+            classroom_status_text
+        )
+        content_renderables.append(title_line)
+        content_renderables.append(start_time_text)
+        content_renderables.append("")
+        content_renderables.append(prompt_text)
+
+        panel_title = f"[yellow][{classroom_type}][/yellow]"
+
+        classroom_panel = Panel(
+            Group(*content_renderables),
+            title=panel_title,
+            border_style="bright_green",
+            expand=True,
+            padding=(1, 2)
+        )
+
+        module_tree.add(classroom_panel)
+
+COURSES_PAGE_SIZE = 50
+COURSES_PAGE_CONCURRENCY = 4
+
+COURSE_FIELDS = ("name", "id", "time", "teachers", "department_name", "academic_year")
+COURSE_SHORT_FIELDS = ("name", "id")
+
+def course_json(course: Course, short: bool)->dict:
+    if short:
+        return {
+            "name": course.name,
+            "id": str(course.id)
+        }
+
+    return {
+        "name": course.name,
+        "id": str(course.id),
+        "time": ", ".join(course.teaching_class_name.split(";")),
+        "teachers": ', '.join(course.instructors) or "N/A",
+        "department_name": course.department_name,
+        "academic_year": course.academic_year_name
+    }
+
+def make_courses_table(title: str|None, caption: str|None, short: bool)->Table:
+    courses_list_table = Table(
+        title=title,
+        caption=caption,
+        border_style="bright_black",
+        show_header=True,
+        header_style="bold magenta",
+        expand=True
+    )
+
+    # short模式仅显示课程ID与课程名称
+    if short:
+        courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=8)
+        courses_list_table.add_column("课程名称", style="bright_yellow", ratio=1)
+    else:
+        courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=6)
+        courses_list_table.add_column("课程名称", style="bright_yellow", ratio=6)
+        courses_list_table.add_column("授课教师", ratio=3)
+        courses_list_table.add_column("上课时间", ratio=3)
+        courses_list_table.add_column("开课院系", ratio=4)
+        courses_list_table.add_column("开课学年", style="white", width=9)
+
+    return courses_list_table
+
+def add_course_row(courses_list_table: Table, course: Course, short: bool):
+    course_id = str(course.id)
+    course_name = course.name
+
+    # short 模式仅按表单格式打印课程名与课程id
+    if short:
+        courses_list_table.add_row(course_id, course_name)
+        return
+
+    course_time = ", ".join(course.teaching_class_name.split(";"))
+
+    teachers_name = ', '.join(course.instructors) or "N/A"
+
+    course_department_name = course.department_name
+
+    if len(course_department_name) > 10:
+        if "与" in course_department_name:
+            course_department_name = course_department_name.split("与")[0] + "与\n" + course_department_name.split("与")[1]
+        else:
+            course_department_name = course_department_name[:11] + "\n" + course_department_name[11:]
+
+    courses_list_table.add_row(
+        course_id,
+        course_name,
+        teachers_name,
+        course_time,
+        course_department_name,
+        course.academic_year_name
+    )
+
+def failed_pages_text(pages: zju_api.ApiPages)->str:
+    return ", ".join(map(str, sorted(pages.failed_pages)))
+
+async def list_all_courses(client: ZjuAsyncClient, keyword: str|None, short: bool, quiet: bool, output: JSONRecordWriter, json: bool):
+    """分页并发拉取全部课程，每到一页就输出一页，不再一次性请求 `page_size=total` 的大页面。"""
+    pages = zju_api.iter_api_pages(
+        lambda page, page_size: zju_api.coursesListAPIFits(client.session, keyword, page, page_size),
+        COURSES_PAGE_SIZE,
+        COURSES_PAGE_CONCURRENCY
+    )
+
+    # --json 只能汇总后一次性打印，--ndjson 则随到随输出
+    if json:
+        found = False
+        async for page in pages:
+            for course in parse_list(page, "courses", Course):
+                output.write(str(course.id) if quiet else course_json(course, short))
+                found = True
+
+        if pages.failed_pages:
+            output.fail(f"Failed to fetch pages: {failed_pages_text(pages)}")
+            raise typer.Exit(code=1)
+
+        output.close(None if found else "Not Found")
+        return
+
+    if quiet:
+        printed = 0
+        async for page in pages:
+            course_ids = [str(course.id) for course in parse_list(page, "courses", Course)]
+            if course_ids:
+                print(("" if printed == 0 else " ") + " ".join(course_ids), end="", flush=True)
+                printed += len(course_ids)
+        
+        if printed:
+            print()
+        if pages.failed_pages:
+            rprint(f"[red]第 {failed_pages_text(pages)} 页拉取失败，结果不完整！[/red]")
+            raise typer.Exit(code=1)
+        return
+
+    total_results_amount = None
+    shown = 0
+
+    # 每到一页就打印这一页的表格，只有表头随第一页打印；列宽按比例分配，各页的表格可以上下对齐。
+    # 不用 Live 重绘整张表，课程较多、表格高于终端时也不会每次刷新都重新输出全部内容
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        transient=True
+    ) as progress:
+        task = progress.add_task(description="拉取课程信息中...", total=None)
+
+        async for page in pages:
+            if not page:
+                continue
+            if total_results_amount == None:
+                total_results_amount = page.get("total", 0)
+                if total_results_amount == 0:
+                    break
+
+            courses_list_table = make_courses_table(
+                title="课程列表 (全部)" if shown == 0 else None,
+                caption=None,
+                short=short
+            )
+            courses_list_table.show_header = shown == 0
+            for index, course in enumerate(parse_list(page, "courses", Course)):
+                if index > 0:
+                    courses_list_table.add_row()
+                add_course_row(courses_list_table, course, short)
+                shown += 1
+
+            if courses_list_table.row_count:
+                progress.console.print(courses_list_table)
+            progress.update(task, description=f"拉取课程信息中... 已显示 {shown}/{total_results_amount} 个")
+
+    if pages.failed_pages:
+        rprint(f"[red]第 {failed_pages_text(pages)} 页拉取失败，结果不完整！[/red]")
+
+    if total_results_amount == 0:
+        rprint("啊呀！没有找到课程呢。")
+    elif total_results_amount != None:
+        rprint(f"[bright_black]共找到 {total_results_amount} 个结果，已显示 {shown} 个。[/bright_black]")
+
+    if pages.failed_pages:
+        raise typer.Exit(code=1)
+
+DEEP_CONCURRENCY = 6
+DEEP_FIELDS = ("course_id", "course_name", "kind", "type", "id", "title", "start_time", "end_time", "completion", "is_closed")
+
+def deep_course_items(course: Course, course_index: CourseTree, pending: bool)->list[dict]:
+    """把一门课程的作业、测试与课堂任务展开为扁平记录，pending 时只保留未完成且未截止的。"""
+    items = []
+    for activity in course_index.activities:
+        items.append({
+            "course_id": course.id,
+            "course_name": course.name,
+            "kind": "activity",
+            "type": type_map.get(activity.type, activity.type),
+            "id": activity.id,
+            "title": activity.title,
+            "start_time": transform_time(activity.start_time),
+            "end_time": transform_time(activity.end_time),
+            "completion": get_completion_json(course_index.is_activity_completed(activity.id), activity.completion_criterion_key),
+            "is_closed": activity.is_closed
+        })
+
+    for exam in course_index.exams:
+        items.append({
+            "course_id": course.id,
+            "course_name": course.name,
+            "kind": "exam",
+            "type": type_map.get(exam.type, exam.type),
+            "id": exam.id,
+            "title": exam.title,
+            "start_time": transform_time(exam.start_time),
+            "end_time": transform_time(exam.end_time),
+            "completion": get_completion_json(course_index.is_exam_completed(exam.id), exam.completion_criterion_key),
+            "is_closed": exam.is_closed
+        })
+
+    for classroom in course_index.classrooms:
+        items.append({
+            "course_id": course.id,
+            "course_name": course.name,
+            "kind": "classroom",
+            "type": type_map.get(classroom.type, classroom.type),
+            "id": classroom.id,
+            "title": classroom.title,
+            "start_time": transform_time(classroom.start_at),
+            "end_time": "null",
+            "completion": "Completed" if course_index.is_classroom_completed(classroom.id) else "Incomplete",
+            "is_closed": classroom.status == "finish"
+        })
+
+    if pending:
+        items = [item for item in items if item["completion"] == "Incomplete" and not item["is_closed"]]
+
+    return items
+
+def deep_item_sort_key(item: dict)->tuple:
+    # 截止时间早的在前，没有截止时间的排在最后
+    return (item["end_time"] == "null", item["end_time"], item["course_name"], item["id"] or 0)
+
+async def fetch_course_views(client: ZjuAsyncClient, course: Course, semaphore: asyncio.Semaphore)->list[dict]:
+    """在并发上限内拉取一门课程的全部任务。"""
+    async with semaphore:
+        return await zju_api.courseViewAPIFits(client.session, course.id).get_api_data()
+
+def course_index_from_views(course: Course, raw_course_views: list[dict])->tuple[CourseTree, list[str]]:
+    """返回任务索引与请求失败的接口名。"""
+    # 请求失败的接口返回空 dict，正常响应至少带有列表字段
+    failed_apis = [api_name for api_name, raw in zip(COURSE_VIEW_APIS, raw_course_views, strict=True) if not raw]
+    return CourseTree.from_responses(course.id, {}, *raw_course_views), failed_apis
+
+async def list_courses_deep(client: ZjuAsyncClient, keyword: str|None, pending: bool, ndjson: bool, json: bool):
+    """拉取全部课程后在同一个 client 上并发请求各课程的任务，汇总为一张按截止时间排序的表。"""
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed}/{task.total}"),
+        transient=True,
+        disable=json
+    ) as progress:
+        task = progress.add_task(description="拉取课程列表中...", total=None)
+
+        courses_list: list[Course] = []
+        raw_pages: list[dict] = []
+        pages = zju_api.iter_api_pages(
+            lambda page, page_size: zju_api.coursesListAPIFits(client.session, keyword, page, page_size),
+            COURSES_PAGE_SIZE,
+            COURSES_PAGE_CONCURRENCY
+        )
+        async for page in pages:
+            raw_pages.append(page)
+            courses_list.extend(parse_list(page, "courses", Course))
+
+        # 课程列表不完整时汇总结果同样不完整，不再拉取各课程任务，也不写入镜像
+        if pages.failed_pages:
+            progress.stop()
+            if json:
+                JSONRecordWriter("Courses Deep View", ndjson, DEEP_FIELDS).fail(f"Failed to fetch pages: {failed_pages_text(pages)}")
+            else:
+                rprint(f"[red]第 {failed_pages_text(pages)} 页拉取失败，结果不完整！[/red]")
+            raise typer.Exit(code=1)
+
+        progress.update(task, description="拉取课程任务中...", total=len(courses_list), completed=0)
+        semaphore = asyncio.Semaphore(DEEP_CONCURRENCY)
+
+        async def fetch(course: Course):
+            try:
+                return await fetch_course_views(client, course, semaphore)
+            finally:
+                progress.advance(task)
+
+        raw_results = await asyncio.gather(*[fetch(course) for course in courses_list], return_exceptions=True)
+
+    def ingest_views(store: MirrorStore):
+        store.upsert_courses([course_raw for page_raw in raw_pages for course_raw in page_raw.get("courses") or []], prune=False)
+        for course, raw_course_views in zip(courses_list, raw_results, strict=True):
+            if not isinstance(raw_course_views, BaseException):
+                store.ingest_course_payloads(course.id, dict(zip(COURSE_VIEW_APIS, raw_course_views, strict=True)))
+
+    ingest(ingest_views)
+    results = [
+        raw_course_views if isinstance(raw_course_views, BaseException) else course_index_from_views(course, raw_course_views)
+        for course, raw_course_views in zip(courses_list, raw_results, strict=True)
+    ]
+    render_courses_deep(courses_list, results, pending, ndjson, json)
+
+def load_courses_deep_offline(store: MirrorStore, keyword: str|None)->tuple[list[Course], list[tuple[CourseTree, list[str]]|Exception]]:
+    """从本地镜像读取 --deep 所需的课程与任务索引，未镜像内容的课程按失败处理。"""
+    courses_list = parse_list(store.courses_page(keyword), "courses", Course)
+    results = []
+    for course in courses_list:
+        raw_course_views = store.course_payloads(course.id, COURSE_VIEW_APIS)
+        if raw_course_views == None:
+            results.append(LookupError("课程内容未镜像"))
+            continue
+
+        results.append(course_index_from_views(course, raw_course_views))
+
+    return courses_list, results
+
+def render_courses_deep(courses_list: list[Course], results: list, pending: bool, ndjson: bool, json: bool):
+    if not courses_list:
+        if json:
+            JSONRecordWriter("Courses Deep View", ndjson, DEEP_FIELDS).close("Not Found")
+        else:
+            rprint("啊呀！没有找到课程呢。")
+        return
+
+    items: list[dict] = []
+    failures: list[dict] = []
+    assignment_kinds: dict[int, str] = {}
+    for course, result in zip(courses_list, results, strict=True):
+        if isinstance(result, BaseException):
+            logger.error(f"课程 {course.id} 任务拉取失败: {repr(result)}")
+            failures.append({"course_id": course.id, "course_name": course.name, "apis": ["all"]})
+            continue
+
+        course_index, failed_apis = result
+        if failed_apis:
+            logger.warning(f"课程 {course.id} 部分接口请求失败: {', '.join(failed_apis)}")
+            failures.append({"course_id": course.id, "course_name": course.name, "apis": failed_apis})
+
+        items.extend(deep_course_items(course, course_index, pending))
+        assignment_kinds.update(course_index.assignment_kinds)
+
+    AssignmentTypeIndex().remember(assignment_kinds)
+    items.sort(key=deep_item_sort_key)
+
+    if ndjson:
+        output = JSONRecordWriter("Courses Deep View", ndjson, DEEP_FIELDS)
+        for item in items:
+            output.write(item)
+        output.close()
+
+        for failure in failures:
+            print_with_json(False, f"Course {failure['course_id']} partially failed.", failure)
+        return
+
+    if json:
+        print_with_json(True, "Courses Deep View", {"items": items, "failures": failures})
+        return
+
+    deep_table = Table(
+        title=f"课程任务汇总 ({len(courses_list)} 门课程)",
+        caption=f"共 {len(items)} 个任务，{len(failures)} 门课程拉取失败。" if failures else f"共 {len(items)} 个任务。",
+        border_style="bright_black",
+        show_header=True,
+        header_style="bold magenta",
+        expand=True
+    )
+    deep_table.add_column("截止时间", style="bright_white", no_wrap=True)
+    deep_table.add_column("课程名称", style="bright_yellow", ratio=3)
+    deep_table.add_column("类型", no_wrap=True)
+    deep_table.add_column("任务名称", ratio=4)
+    deep_table.add_column("任务ID", style="cyan", no_wrap=True)
+    deep_table.add_column("完成情况", no_wrap=True)
+
+    completion_text_map = {
+        "Completed": Text("🟢 已完成", style="green"),
+        "Incomplete": Text("🔴 未完成", style="red"),
+        "No need to complete": Text("无完成指标", style="dim")
+    }
+
+    for item in items:
+        end_time = item["end_time"] if item["end_time"] != "null" else Text("无截止时间", style="dim")
+        deep_table.add_row(
+            end_time,
+            item["course_name"],
+            item["type"],
+            item["title"],
+            str(item["id"]),
+            completion_text_map.get(item["completion"], item["completion"])
+        )
+
+    rprint(deep_table)
+
+    for failure in failures:
+        rprint(f"[red]课程 {failure['course_name']} (ID: {failure['course_id']}) 请求失败: {', '.join(failure['apis'])}[/red]")
+
 # 注册课程列举命令
 @app.command(
         "ls",
@@ -153,6 +796,9 @@ def extract_modules(modules: list[dict], indices: list[int], modules_id: list[in
             
               $ lazy course list -p 2 -a 5  
                 (查看第 2 页，每页显示 5 个结果)
+
+              $ lazy course list --deep --pending
+                (汇总所有课程中未完成的任务)
         """))
 @app.command(
         "list",
@@ -168,6 +814,9 @@ def extract_modules(modules: list[dict], indices: list[int], modules_id: list[in
             
               $ lazy course list -p 2 -a 5  
                 (查看第 2 页，每页显示 5 个结果)
+
+              $ lazy course list --deep --pending
+                (汇总所有课程中未完成的任务)
         """))
 @partial(syncify, raise_sync_error=False)
 async def list_courses(
@@ -177,40 +826,70 @@ async def list_courses(
     short: Annotated[bool | None, typer.Option("--short", "-s", help="简化输出内容，仅显示课程名与课程id")] = False,
     quiet: Annotated[bool | None, typer.Option("--quiet", "-q", help="仅输出课程id")] = False,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此参数，一次性输出所有结果")] = False,
+    deep: Annotated[bool | None, typer.Option("--deep", "-D", help="启用此选项，汇总所有课程的作业、测试与课堂任务")] = False,
+    pending: Annotated[bool | None, typer.Option("--pending", help="配合 --deep，只显示未完成且未截止的任务")] = False,
+    offline: Annotated[bool | None, typer.Option("--offline", "-O", help="启用此选项，从本地镜像读取，不访问网络")] = False,
+    prefetch: Annotated[int, typer.Option("--prefetch", help="在后台预取本页前 N 门课程的目录，随后的 'lazy course view syllabus' 可直接使用", min=0)] = 0,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头，配合 -A 边拉取边输出")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
     ):
     """
     列举学在浙大内的课程信息，并按条件筛选。
 
     默认按分页显示（每页10条）。你可以使用 -n 进行关键词搜索，
-    或者使用 -A 来获取所有结果（这将忽略 -p 和 -a）。
+    或者使用 -A 来获取所有结果（这将忽略 -p 和 -a），所有结果会分页并发拉取并随到随显示。
+
+    使用 --deep 汇总所有课程（或 -n 筛选出的课程）的任务，按截止时间排序显示在一张表中。
+
+    使用 -O 从本地镜像读取（需先运行 'lazy mirror refresh'）。
+
+    使用 --prefetch N 在后台以低优先级预取本页前 N 门课程的目录（最多 10 门），之后展开这些课程的章节时无需再等待请求。
     """
-    # 如果启用--all，则先获取有多少课程
+    output = JSONRecordWriter("Courses List", ndjson, () if quiet else COURSE_SHORT_FIELDS if short else COURSE_FIELDS)
+    json = json or ndjson
+
+    if offline and deep:
+        with MirrorStore() as store:
+            courses_list, results = load_courses_deep_offline(store, keyword)
+        render_courses_deep(courses_list, results, pending, ndjson, json)
+        return
+
+    cookies = None if offline else CredentialManager().load_cookies()
+    if not offline and not cookies:
+        if json:
+            print_with_json(False, "Cookies is unacceptable.")
+        else:
+            rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
+
+    if deep:
+        async with open_client(cookies) as client:
+            await list_courses_deep(client, keyword, pending, ndjson, json)
+        return
+
+    if all and not offline:
+        async with open_client(cookies) as client:
+            await list_all_courses(client, keyword, short, quiet, output, json)
+        return
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
         transient=True,
         disable=json
     ) as progress:
-        
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
-            if json:
-                print_with_json(False, "Cookies is unacceptable.")
-            else:
-                rprint("Cookies不存在！")
-            logger.error("Cookies不存在！")
-            raise typer.Exit(code=1)
-        
         task = progress.add_task(description="拉取课程信息中...", total=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        if offline:
             if all:
-                pre_results = (await zju_api.coursesListAPIFits(client.session, keyword, 1, 1).get_api_data())[0]
-                amount = pre_results.get("total", 0)
                 page_index = 1
-
-            results = (await zju_api.coursesListAPIFits(client.session, keyword, page_index, amount).get_api_data())[0]
+            with MirrorStore() as store:
+                results = store.courses_page(keyword, page_index, None if all else amount)
+        else:
+            async with open_client(cookies) as client:
+                results = (await zju_api.coursesListAPIFits(client.session, keyword, page_index, amount).get_api_data())[0]
+            ingest(lambda store: store.upsert_courses(results.get("courses") or [], prune=False))
 
         progress.advance(task, 1)
         task = progress.add_task(description="渲染课程信息中...", total=1)
@@ -225,124 +904,43 @@ async def list_courses(
             
             raise typer.Exit(code=1)
 
-        courses_list = results.get("courses", [])
+        courses_list = parse_list(results, "courses", Course)
         total_results_amount = results.get("total", 0)
 
         # 如果搜索没有结果，则直接退出
         if total_results_amount == 0:
             if json:
-                print_with_json(True, "Not Found")    
+                output.close("Not Found")
+            elif offline:
+                rprint("本地镜像中没有找到课程，可运行 'lazy mirror refresh' 刷新镜像。")
             else:
                 rprint("啊呀！没有找到课程呢。")
             
             return
 
-        # quiet 模式仅打印课程id，并且不换行
-        if quiet:
-            course_ids = [str(course.get("id", "")) for course in courses_list]
-            if json:
-                print_with_json(True, "Courses List", course_ids)
-            else:
-                print(" ".join(course_ids))
-            
-            return 
-        
+        if prefetch and not offline:
+            spawn_prefetch("courses", [str(course.id) for course in courses_list[:prefetch]])
+
         if json:
-            results = []
             for course in courses_list:
-                course_id = str(course.get("id"))
-                course_name = course.get("name")
-
-                if short:
-                    results.append({
-                        "name": course_name,
-                        "id": course_id
-                    })
-                    
-                    continue
-
-                course_attributes = course.get("course_attributes")
-                course_time = course_attributes.get("teaching_class_name", "N/A") if course_attributes.get("teaching_class_name", "N/A") else "N/A"
-                course_time = ", ".join(course_time.split(";"))
-                teachers = course.get("instructors", [])
-                teachers_name = ', '.join([t.get("name", "") for t in teachers]) or "N/A"
-                department = course.get("department")
-                course_department_name = department.get("name", "N/A") if department else "N/A"
-                academic_year = course.get("academic_year")
-                course_academic_year_name = academic_year.get("name", "N/A") if academic_year else "N/A"
-
-                results.append({
-                    "name": course_name,
-                    "id": course_id,
-                    "time": course_time,
-                    "teachers": teachers_name,
-                    "department_name": course_department_name,
-                    "academic_year": course_academic_year_name
-                })
-
-            print_with_json(True, "Courses List", results)
+                output.write(str(course.id) if quiet else course_json(course, short))
+            
+            output.close()
             return
 
+        # quiet 模式仅打印课程id，并且不换行
+        if quiet:
+            print(" ".join(str(course.id) for course in courses_list))
+            return 
 
-        courses_list_table = Table(
+        courses_list_table = make_courses_table(
             title=f"课程列表 (第 {page_index} / {total_pages} 页)",
             caption=f"共找到 {total_results_amount} 个结果，本页显示 {len(courses_list)} 个。",
-            border_style="bright_black",
-            show_header=True,
-            header_style="bold magenta",
-            expand=True
+            short=short
         )
 
-        # short模式仅显示课程ID与课程名称
-        if short:
-            courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=8)
-            courses_list_table.add_column("课程名称", style="bright_yellow", ratio=1)
-        else:
-            courses_list_table.add_column("课程ID", style="cyan", no_wrap=True, width=6)
-            courses_list_table.add_column("课程名称", style="bright_yellow", ratio=6)
-            courses_list_table.add_column("授课教师", ratio=3)
-            courses_list_table.add_column("上课时间", ratio=3)
-            courses_list_table.add_column("开课院系", ratio=4)
-            courses_list_table.add_column("开课学年", style="white", width=9)
-
-        # short 模式仅按表单格式打印课程名与课程id
         for course in courses_list:
-            course_id = str(course.get("id", "N/A"))
-            course_name = course.get("name", "N/A")
-
-            if short:
-                courses_list_table.add_row(course_id, course_name)
-                continue
-
-            course_attributes = course.get("course_attributes")
-            course_time = course_attributes.get("teaching_class_name", "N/A") if course_attributes.get("teaching_class_name", "N/A") else "N/A"
-
-            course_time = ", ".join(course_time.split(";"))
-
-            teachers = course.get("instructors", [])
-            teachers_name = ', '.join([t.get("name", "") for t in teachers]) or "N/A"
-
-            department = course.get("department")
-            course_department_name = department.get("name", "N/A") if department else "N/A"
-
-            if len(course_department_name) > 10:
-                if "与" in course_department_name:
-                    course_department_name = course_department_name.split("与")[0] + "与\n" + course_department_name.split("与")[1]
-                else:
-                    course_department_name = course_department_name[:11] + "\n" + course_department_name[11:]
-                
-
-            academic_year = course.get("academic_year")
-            course_academic_year_name = academic_year.get("name", "N/A") if academic_year else "N/A"
-            
-            courses_list_table.add_row(
-                course_id,
-                course_name,
-                teachers_name,
-                course_time,
-                course_department_name,
-                course_academic_year_name
-            )
+            add_course_row(courses_list_table, course, short)
             
             if course != courses_list[-1]:
                 courses_list_table.add_row()
@@ -402,6 +1000,8 @@ async def view_syllabus(
     only_classroom: Annotated[bool | None, typer.Option("--classroom", "-c", help="启用此选项，只展示课堂任务")] = False,
     only_exam: Annotated[bool | None, typer.Option("--exam", "-e", help="启用此选项，只展示测试内容")] = False,
     only_homework: Annotated[bool | None, typer.Option("--homework", "-H", help="启用此选项，只展示作业")] = False,
+    offline: Annotated[bool | None, typer.Option("--offline", "-O", help="启用此选项，从本地镜像读取，不访问网络")] = False,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
     """
@@ -409,7 +1009,13 @@ async def view_syllabus(
     
     默认对章节进行折叠，你可以通过 -m 或 -i 来展开指定的章节。
     或者使用 -A 来展开所有章节，并通过 -a, -c, -e 与 -H 进行筛选。
+
+    使用 -O 从本地镜像读取（需先运行 'lazy mirror refresh'）。
+    由 'lazy course list --prefetch' 在后台预取过的课程直接使用预取的内容。
     """
+    output = JSONRecordWriter("Syllabus View", ndjson)
+    json = json or ndjson
+
     # 给出module_id则进行完整的请求
     with Progress(
         SpinnerColumn(),
@@ -417,8 +1023,8 @@ async def view_syllabus(
         transient=True,
         disable=json
     ) as progress:
-        cookies = CredentialManager().load_cookies()
-        if not cookies:
+        cookies = None if offline else CredentialManager().load_cookies()
+        if not offline and not cookies:
             if json:
                 print_with_json(False, "Cookies is unacceptable.")
             else:
@@ -427,75 +1033,73 @@ async def view_syllabus(
             raise typer.Exit(code=1)
 
         task = progress.add_task(description="获取课程信息中...", total=1)
-    
-        # --- 加载预备课程信息 ---
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-            course_messages, raw_course_modules = await zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data()
-        
-        course_name = course_messages.get("name", "null")
-        course_modules: list[dict] = raw_course_modules.get("modules", [])
 
-        if not course_modules:
-            if json:
-                print_with_json(True, "Not Content")
-            else:
-                rprint(f"课程{course_name} (ID: {course_id}) 无章节内容")
+        if offline:
+            with MirrorStore() as store:
+                raw_course_previews = store.course_payloads(course_id, COURSE_PREVIEW_APIS)
+                raw_course_views = store.course_payloads(course_id, COURSE_VIEW_APIS)
 
-            return
-        
-        if all:
-            indices = list(range(0, len(course_modules)))
+            if raw_course_previews == None:
+                if json:
+                    print_with_json(False, "Not Mirrored")
+                else:
+                    rprint(f"本地镜像中没有课程 {course_id} 的内容，请先运行 'lazy mirror refresh'。")
+                raise typer.Exit(code=1)
+
+        async with nullcontext() if offline else open_client(cookies, ResponseCache.load(session_key(cookies))) as client:
+            # --- 加载预备课程信息 ---
+            if offline:
+                course_messages, raw_course_modules = raw_course_previews
+            else:
+                course_messages, raw_course_modules = await zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data()
         
-        if modules_id or indices or last:
-            # --- 筛选目标modules ---
-            modules_list = extract_modules(course_modules, indices, modules_id, last)
-            course_modules_node_list: list[tuple[dict, dict, dict, dict]] = []
-            
-            if not modules_list:
+            course_name = course_messages.get("name", "null")
+            course_modules = parse_list(raw_course_modules, "modules", Module)
+
+            if not course_modules:
                 if json:
-                    print_with_json(True, "Not Found")
+                    output.fields = SYLLABUS_FIELDS
+                    output.close("Not Content")
                 else:
-                    rprint("未找到章节！")
-
-                return 
-
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
-                raw_course_activities, raw_course_exams, raw_course_classrooms, raw_course_activities_reads, raw_homework_completeness, raw_exam_completeness = await zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
-
-            for module_id, module in modules_list:
-                course_activities: list[dict] = raw_course_activities.get("activities", [])
-                course_exams: list[dict] = raw_course_exams.get("exams", [])
-                course_classrooms: list[dict] = raw_course_classrooms.get("classrooms", [])
-                exams_completeness: list[int] = raw_exam_completeness.get("exam_ids", [])
-                activities_completeness: list[int] = [homework_activitie.get("id") for homework_activitie in raw_homework_completeness.get("homework_activities", {}) if homework_activitie.get("status") == "已交"]
-                classrooms_completeness: list[dict] = [activity_read for activity_read in raw_course_activities_reads.get("activity_reads") if activity_read.get("activity_type") == "classroom_activity"]
-
-                # 筛选目标activities, exams 和 classrooms
-                activities_list: list[dict] = []
-                if not (only_classroom or only_exam):
-                    for course_activity in course_activities:
-                        if only_homework and course_activity.get("type", "null") != "homework":
-                            continue
-
-                        if course_activity.get("module_id") == module_id:
-                                activities_list.append(course_activity)
-
-                exams_list: list[dict] = []
-                if not (only_classroom or only_activity or only_homework):
-                    for course_exam in course_exams:
-                        if course_exam.get("module_id") == module_id:
-                            exams_list.append(course_exam)
-
-                classrooms_list: list[dict] = []
-                if not (only_exam or only_activity or only_homework):
-                    for course_classroom in course_classrooms:
-                        if course_classroom.get("module_id") == module_id:
-                            classrooms_list.append(course_classroom)
-                
-                course_modules_node_list.append((module, activities_list, exams_list, classrooms_list))
+                    rprint(f"课程{course_name} (ID: {course_id}) 无章节内容")
 
-            if not course_modules_node_list:
                 return
+            
+            if all:
+                indices = list(range(0, len(course_modules)))
+            
+            expanded = bool(modules_id or indices or last)
+            if expanded:
+                # --- 筛选目标modules ---
+                modules_list = extract_modules(course_modules, indices, modules_id, last)
+                
+                if not modules_list:
+                    if json:
+                        output.fields = SYLLABUS_EXPANDED_FIELDS
+                        output.close("Not Found")
+                    else:
+                        rprint("未找到章节！")
+
+                    return 
+
+                if not offline:
+                    raw_course_views = await zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
+
+        # 在线拉取到的内容顺带更新镜像与检索索引
+        if not offline:
+            payloads = {"view": course_messages, "modules": raw_course_modules}
+            if expanded:
+                payloads.update(zip(COURSE_VIEW_APIS, raw_course_views, strict=True))
+            ingest(lambda store: store.ingest_course_payloads(course_id, payloads))
+
+        if expanded:
+            # 一次性建立章节索引，之后按章节取用
+            course_index = CourseTree.from_responses(course_id, raw_course_modules, *raw_course_views)
+            AssignmentTypeIndex().remember(course_index.assignment_kinds)
+            course_modules_node_list = [
+                filter_module_node(course_index.node(module.id), only_activity, only_classroom, only_exam, only_homework)
+                for module in modules_list
+            ]
         else:
             modules_list = course_modules
             progress.advance(task)
@@ -503,130 +1107,30 @@ async def view_syllabus(
 
         task = progress.add_task(description="加载内容中...", total=1)
 
+        # NDJSON 每行一个章节，附带课程ID与名称
+        if ndjson:
+            output.fields = SYLLABUS_EXPANDED_FIELDS if expanded else SYLLABUS_FIELDS
+            if expanded:
+                for node in course_modules_node_list:
+                    output.write({"course_id": course_id, "course_name": course_name, **module_node_json(course_index, node)})
+            else:
+                for index, module in enumerate(modules_list):
+                    output.write({"course_id": course_id, "course_name": course_name, "index": index, "id": module.id, "name": module.name})
+
+            output.close()
+            return
+
         if json:
             modules = []
-            if modules_id or indices or last:
-                for _, (module, activities_list, exams_list, classrooms_list) in enumerate(course_modules_node_list):
-                    module_name = module.get("name", "null")
-
-                    activities = []
-                    for activity in activities_list: # type: ignore
-                        # 标题、类型与ID
-                        activity_title = activity.get("title")
-                        activity_type = type_map.get(activity.get("type"), activity.get("type"))
-                        activity_id = activity.get("id")
-                        activity_completion_criterion_key = activity.get("completion_criterion_key")
-                        completion_status = activity_id in activities_completeness
-                        completion_text = get_completion_json(completion_status, activity_completion_criterion_key)
-
-                        # 开放日期
-                        activity_start_time = transform_time(activity.get("start_time"))
-                        activity_is_started: bool = activity.get("is_started", False)
-                        
-                        # 截止日期
-                        activity_end_time = transform_time(activity.get("end_time"))
-                        activity_is_closed: bool = activity.get("is_closed", False)
-                        
-                        # 跳转链接
-                        url_jump = make_jump_url(course_id, activity_id, activity.get("type"))
-
-                        # 附件
-                        activity_uploads: list[dict]= activity.get("uploads", [])
-                        uploads = []
-                        for upload in activity_uploads:
-                            file_name = upload.get("name")
-                            file_id = upload.get("id")
-                            file_size = filesize.decimal(upload.get("size", 0))
-
-                            uploads.append({
-                                "filename": file_name,
-                                "id": file_id,
-                                "size": file_size
-                            })
-
-                        activities.append({
-                            "title": activity_title,
-                            "type": activity_type,
-                            "id": activity_id,
-                            "completion": completion_text,
-                            "start_time": activity_start_time,
-                            "is_started": activity_is_started,
-                            "end_time": activity_end_time,
-                            "is_closed": activity_is_closed,
-                            "uploads": uploads
-                        })
-                    
-                    exams = []
-                    for exam in exams_list:
-                        exam_title = exam.get("title", "null")
-                        exam_type = type_map.get(exam.get("type", "null"), exam.get("type", "null"))
-                        exam_id = exam.get("id", "null")
-                        exam_completion_criterion_key = exam.get("completion_criterion_key", "none")
-                        completion_status = exam_id in exams_completeness
-                        completion_text = get_completion_json(completion_status, exam_completion_criterion_key)
-                        # 开放日期
-                        exam_start_time = transform_time(exam.get("start_time"))
-                        exam_is_started: bool = exam.get("is_started", False)
-                        # 截止日期
-                        exam_end_time = transform_time(exam.get("end_time"))
-                        exam_is_closed: bool = exam.get("is_closed", False)
-                        url_jump = make_jump_url(course_id, exam_id, exam.get("type", "null"))
-                        
-                        exams.append({
-                            "title": exam_title,
-                            "type": exam_type,
-                            "id": exam_id,
-                            "completion": completion_text,
-                            "start_time": exam_start_time,
-                            "is_started": exam_is_started,
-                            "end_time": exam_end_time,
-                            "is_closed": exam_is_closed
-                        })
-                        
-
-                    classrooms = []
-                    for classroom in classrooms_list:
-                        classroom_title = classroom.get("title", "null")
-                        classroom_type = type_map.get(classroom.get("type", "null"), classroom.get("type", "null"))
-                        classroom_id = classroom.get("id", "null")
-                        classroom_status = classroom.get("status")
-                        
-                        for classroom_completeness in classrooms_completeness:
-                            if classroom_completeness.get("activity_id") == classroom_id:
-                                classroom_completeness_status = "full"
-                                break
-                        else:
-                            classroom_completeness_status = ""
-
-                        classroom_start_time: str = transform_time(classroom.get("start_at"))
-
-                        classroom_status_text = get_classroom_status_json(classroom_status)
-                        classroom_completeness_status_text = get_classroom_completion_json(classroom_completeness_status)
-
-                        classrooms.append({
-                            "title": classroom_title,
-                            "type": classroom_type,
-                            "id": classroom_id,
-                            "start_time": classroom_start_time,
-                            "status": classroom_status_text,
-                            "completion": classroom_completeness_status_text
-                        })
-                    
-                    modules.append({
-                        "name": module_name,
-                        "activities": activities,
-                        "exams": exams,
-                        "classroom_tests": classrooms
-                    })
+            if expanded:
+                for node in course_modules_node_list:
+                    modules.append(module_node_json(course_index, node))
             else:
                 for index, module in enumerate(modules_list):
-                    module_name = module.get("name", "null")
-                    module_id = module.get("id", "null")
-
                     modules.append({
                         "index": index,
-                        "id": module_id,
-                        "name": module_name
+                        "id": module.id,
+                        "name": module.name
                     })
             
             result = {
@@ -642,235 +1146,16 @@ async def view_syllabus(
         # 装填树状图
         course_tree = Tree(f"[bold yellow]{course_name}[/bold yellow][dim] 课程ID: {course_id}[/dim]")
         
-        if modules_id or indices or last:
-            # _index is unused, thus named with a prefix "_"
-            for _, (module, activities_list, exams_list, classrooms_list) in enumerate(course_modules_node_list):
-                module_name = module.get("name", "null")
-                module_id = module.get("id", "null")
-                module_tree = course_tree.add(f"[green]{module_name}[/green][dim] 章节ID: {module_id}[/dim]")
-                # --- 加载活动内容 ---
-                for activity in activities_list: # type: ignore
-                    # 标题、类型与ID
-                    activity_title = activity.get("title", "null")
-                    activity_type = type_map.get(activity.get("type", "null"), activity.get("type", "null"))
-                    activity_id = activity.get("id", "null")
-                    activity_completion_criterion_key = activity.get("completion_criterion_key", "none")
-                    completion_status = activity_id in activities_completeness
-                    # 活动的start_time和end_time都可能是null值，必须多做一次判断
-                    # is_started 和 is_closed 来判断活动是否开始或者截止
-                    # 开放日期
-                    activity_start_time = transform_time(activity.get("start_time"))
-                    
-                    activity_is_started: bool = activity.get("is_started", False)
-                    
-                    # 截止日期
-                    activity_end_time = transform_time(activity.get("end_time"))
-
-                    activity_is_closed: bool = activity.get("is_closed", False)
-
-                    # 创建状态描述文本和截止时间富文本
-                    status_text = get_status_text(activity_is_started, activity_is_closed)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (activity_start_time, "bright_white")
-                    )
-                    end_time_text = Text.assemble(
-                        ("截止时间: ", "cyan"),
-                        (activity_end_time, "bright_white")
-                    )
-                    # 跳转链接
-                    url_jump = make_jump_url(course_id, activity_id, activity.get("type", "null"))
-                    url_jump_text = Text.assemble(
-                        ("跳转链接: ", "cyan"),
-                        (url_jump, "bright_white")
-                    )
-
-                    # 任务完成状态
-                    if activity_type != "讨论":
-                        completion_text = get_completion_text(completion_status, activity_completion_criterion_key)
-                    else:
-                        completion_text = Text()
-
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{activity_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{activity_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        completion_text,
-                        status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append(end_time_text)
-                    if url_jump:
-                        content_renderables.append(url_jump_text)
-
-                    # 附件
-                    activity_uploads: list[dict]= activity.get("uploads", [])
-                    if activity_uploads:
-                        content_renderables.append("[cyan]附件: [/cyan]")
-
-                    for upload in activity_uploads:
-                        file_name = upload.get("name", "null")
-                        file_id = upload.get("id", "null")
-                        file_size = filesize.decimal(upload.get("size", 0))
-
-                        upload_table = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
-                        upload_table.add_column("Name", no_wrap=True)
-                        upload_table.add_column("Info", justify="right")
-
-                        upload_table.add_row(
-                            f"{file_name}",
-                            f"大小: {file_size} | 文件ID: {file_id}"
-                        )
-                        
-                        content_renderables.append(upload_table)
-
-                    if activity_type == "作业":
-                        panel_title = f"[cyan][{activity_type}][/cyan]"
-
-                    else:
-                        panel_title = f"[white][{activity_type}][/white]"
-
-                    activity_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_cyan" if activity_type == "作业" else "bright_black",
-                        expand=True,
-                        padding=(1, 2)
-                    )
-
-                    module_tree.add(activity_panel)
-
-                # --- 加载测试内容 ---
-                for exam in exams_list:
-                    exam_title = exam.get("title", "null")
-                    exam_type = type_map.get(exam.get("type", "null"), exam.get("type", "null"))
-                    exam_id = exam.get("id", "null")
-                    exam_completion_criterion_key = exam.get("completion_criterion_key", "none")
-                    completion_status = exam_id in exams_completeness
-
-                    # 理由同上
-                    # 开放日期
-                    exam_start_time = transform_time(exam.get("start_time"))
-                    exam_is_started: bool = exam.get("is_started", False)
-                    
-                    # 截止日期
-                    exam_end_time = transform_time(exam.get("end_time"))
-
-                    exam_is_closed: bool = exam.get("is_closed", False)
-
-                    # 创建状态描述文本和截止时间富文本
-                    status_text = get_status_text(exam_is_started, exam_is_closed)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (exam_start_time, "bright_white")
-                    )
-                    end_time_text = Text.assemble(
-                        ("截止时间: ", "cyan"),
-                        (exam_end_time, "bright_white")
-                    )
-                    url_jump = make_jump_url(course_id, exam_id, exam.get("type", "null"))
-                    url_jump_text = Text.assemble(
-                        ("跳转链接: ", "cyan"),
-                        (url_jump, "bright_white")
-                    )
-
-                    completion_text = get_completion_text(completion_status, exam_completion_criterion_key)
-
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{exam_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{exam_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        completion_text,
-                        status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append(end_time_text)
-                    content_renderables.append(url_jump_text)
-
-                    panel_title = f"[yellow][{exam_type}][/yellow]"
-
-                    activity_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_yellow",
-                        expand=True,
-                        padding=(1, 2)
-                    )
-
-                    module_tree.add(activity_panel)
-
-                # --- 加载课堂任务内容 ---
-                for classroom in classrooms_list:
-                    classroom_title = classroom.get("title", "null")
-                    classroom_type = type_map.get(classroom.get("type", "null"), classroom.get("type", "null"))
-                    classroom_id = classroom.get("id", "null")
-                    classroom_status = classroom.get("status")
-                    
-                    for classroom_completeness in classrooms_completeness:
-                        if classroom_completeness.get("activity_id") == classroom_id:
-                            classroom_completeness_status = "full"
-                            break
-                    else:
-                        classroom_completeness_status = ""
-
-                    classroom_start_time: str = transform_time(classroom.get("start_at"))
-
-                    classroom_status_text = get_classroom_status_text(classroom_status)
-                    classroom_completeness_status_text = get_classroom_completion_text(classroom_completeness_status)
-                    start_time_text = Text.assemble(
-                        ("开放时间: ", "cyan"),
-                        (classroom_start_time, "bright_white")
-                    )
-
-                    prompt_text = Text("请在移动端上完成！", "red")
-                    
-                    # --- 准备Panel内容 ---
-                    content_renderables = []
-                    title_line = Text.assemble(
-                        (f"{classroom_title}", "bold bright_magenta"),
-                        (" [ID: ", "bright_white"),
-                        (f"{classroom_id}", "green"),
-                        ("]", "bright_white"),
-                        "\n",
-                        classroom_completeness_status_text,
-                        classroom_status_text
-                    )
-                    content_renderables.append(title_line)
-                    content_renderables.append(start_time_text)
-                    content_renderables.append("")
-                    content_renderables.append(prompt_text)
-
-                    panel_title = f"[yellow][{classroom_type}][/yellow]"
-
-                    classroom_panel = Panel(
-                        Group(*content_renderables),
-                        title=panel_title,
-                        border_style="bright_green",
-                        expand=True,
-                        padding=(1, 2)
-                    )
-
-                    module_tree.add(classroom_panel)
+        if expanded:
+            for node in course_modules_node_list:
+                add_module_node_tree(course_tree, course_index, node)
         else:
             for index, module in enumerate(modules_list):
-                module_name = module.get("name", "null")
-                module_id = module.get("id", "null")
-
                 # 微型表格，装填！ ---- from gemini 2.5pro
                 course_tree_node = Table(show_header=False, box=None, padding=(0, 1), show_edge=False, expand=True)
                 course_tree_node.add_column("Name", no_wrap=True, style="green")
                 course_tree_node.add_column("ID", justify="right", style="bright_white")
-                course_tree_node.add_row(f"[magenta]{index + 1}[/magenta] {module_name}", f"章节ID: {module_id}")
+                course_tree_node.add_row(f"[magenta]{index + 1}[/magenta] {module.name}", f"章节ID: {module.id}")
 
                 course_tree.add(course_tree_node)
 
@@ -913,6 +1198,7 @@ async def view_coursewares(
     short: Annotated[bool | None, typer.Option("--short", "-s", help="启用此选项，简化输出，仅显示文件名与文件ID")] = False,
     quiet: Annotated[bool | None, typer.Option("--quiet", "-q", help="启用此选项，仅输出文件ID")] = False,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此选项，输出所有结果")] = False,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
     """
@@ -921,6 +1207,9 @@ async def view_coursewares(
     默认按分页显示（每页10条）。
     使用 -A 来获取所有结果（这将忽略 -p 和 -a）。
     """
+    output = JSONRecordWriter("Coursewares View", ndjson, () if quiet else ("id", "name") if short else ("id", "name", "size", "update_time"))
+    json = json or ndjson
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -938,14 +1227,14 @@ async def view_coursewares(
 
         task = progress.add_task(description="获取课程信息中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
             # 预请求，检查一下有多少章节
             pre_raw_coursewares = (await zju_api.coursewaresViewAPIFits(client.session, course_id, 1, 1).get_api_data())[0]
             total_syllabuses = pre_raw_coursewares.get("total", 0)
             
             if total_syllabuses == 0:
                 if json:
-                    print_with_json(True, "Not Found Coursewares")
+                    output.close("Not Found Coursewares")
                 else:
                     rprint("当前还没有课件哦~\\( ^ ω ^ )/")
                 
@@ -958,9 +1247,9 @@ async def view_coursewares(
 
         # 提取并拼装所有文件
         coursewares_list: list[dict] = raw_coursewares.get("activities", [])
-        coursewares_uploads: list[dict] = []
+        coursewares_uploads: list[Upload] = []
         for courseware in coursewares_list:
-            coursewares_uploads.extend(courseware.get("uploads", []))
+            coursewares_uploads.extend(parse_list(courseware, "uploads", Upload))
 
         total: int = len(coursewares_uploads)
         if all:
@@ -982,9 +1271,13 @@ async def view_coursewares(
         coursewares_uploads_shown = coursewares_uploads[start_index: end_index]
 
         if quiet:
-            courseware_ids = [str(courseware_upload.get("id", "null")) for courseware_upload in coursewares_uploads_shown]
+            courseware_ids = [str(courseware_upload.id) for courseware_upload in coursewares_uploads_shown]
             if json:
-                print_with_json(True, "Courses List", courseware_ids)
+                # 沿用原有的描述
+                output.description = "Courses List"
+                for courseware_id in courseware_ids:
+                    output.write(courseware_id)
+                output.close()
             else:
                 print(" ".join(courseware_ids))
             
@@ -992,29 +1285,28 @@ async def view_coursewares(
 
         # --- JSON FORMAT HEAD ---
         if json:
-            results = []
             for courseware_upload in coursewares_uploads_shown:
-                courseware_id          = str(courseware_upload.get("id", "null"))
-                courseware_name        = courseware_upload.get("name", "null")
+                courseware_id          = str(courseware_upload.id)
+                courseware_name        = courseware_upload.name
                 if short:
-                    results.append({
+                    output.write({
                         "id": courseware_id,
                         "name": courseware_name
                     })
 
                     continue
                 
-                courseware_size        = filesize.decimal(courseware_upload.get("size", 0))
-                courseware_update_time = transform_time(courseware_upload.get("updated_at", "1900-01-01T00:00:00Z"))
+                courseware_size        = filesize.decimal(courseware_upload.size)
+                courseware_update_time = transform_time(courseware_upload.updated_at or "1900-01-01T00:00:00Z")
 
-                results.append({
+                output.write({
                     "id": courseware_id,
                     "name": courseware_name,
                     "size": courseware_size,
                     "update_time": courseware_update_time
                 })
 
-            print_with_json(True, "Coursewares View", results)
+            output.close()
             return
         # --- JSON FORMAT END ---
 
@@ -1038,8 +1330,8 @@ async def view_coursewares(
             coursewares_table.add_column("文件大小", ratio=1)
 
         for courseware_upload in coursewares_uploads_shown:
-            courseware_id   = str(courseware_upload.get("id", "null"))
-            courseware_name = courseware_upload.get("name", "null")
+            courseware_id   = str(courseware_upload.id)
+            courseware_name = courseware_upload.name
 
             if short:
                 coursewares_table.add_row(
@@ -1052,8 +1344,8 @@ async def view_coursewares(
 
                 continue
 
-            courseware_size        = filesize.decimal(courseware_upload.get("size", 0))
-            courseware_update_time = transform_time(courseware_upload.get("updated_at", "1900-01-01T00:00:00Z"))
+            courseware_size        = filesize.decimal(courseware_upload.size)
+            courseware_update_time = transform_time(courseware_upload.updated_at or "1900-01-01T00:00:00Z")
 
             coursewares_table.add_row(
                 courseware_id,
@@ -1101,6 +1393,7 @@ async def view_members(
     course_id: Annotated[int, typer.Argument(help="课程ID")],
     instructor: Annotated[bool | None, typer.Option("--instructor", "-I", help="启用此选项，只输出教师")] = False,
     student: Annotated[bool | None, typer.Option("--student", "-S", help="启用此选项，只输出学生")] = False,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
     """
@@ -1108,6 +1401,9 @@ async def view_members(
 
     默认同时展示教师与学生，你可以通过 -I 或 -S 来指定输出教师还是学生，两个选项互斥。
     """
+    output = JSONRecordWriter("Members View", ndjson, ("name", "role"))
+    json = json or ndjson
+
     if instructor and student:
         rprint("[red](#`Д´)ﾉ不可以同时'只'输出啦！[/red]")
         raise typer.Exit(code=1)
@@ -1129,7 +1425,7 @@ async def view_members(
         
         task = progress.add_task(description="请求数据中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
             raw_course_enrollments = (await zju_api.courseMembersViewAPIFits(client.session, course_id).get_api_data())[0]
 
         progress.update(task, description="渲染任务信息中...", advance=1)
@@ -1137,7 +1433,7 @@ async def view_members(
 
         if not course_enrollments:
             if json:
-                print_with_json(True, "Not Found")
+                output.close("Not Found")
             else:
                 rprint("[red]∑(✘Д✘๑ )呀，没有结果呢~[/red]")
             return 
@@ -1155,12 +1451,22 @@ async def view_members(
 
         if not instructor_course_enrollments and not student_course_enrollments:
             if json:
-                print_with_json(True, "No member chosen")
+                output.close("No member chosen")
             else:
                 rprint("[red]∑(✘Д✘๑ )呀，没有结果呢~[/red]")
             
             return 
         
+        # NDJSON 每行一个成员
+        if ndjson:
+            for name in instructor_course_enrollments:
+                output.write({"name": name, "role": "instructor"})
+            for name in student_course_enrollments:
+                output.write({"name": name, "role": "student"})
+            
+            output.close()
+            return
+
         if json:
             result = {}
 
@@ -1234,8 +1540,12 @@ async def view_rollcalls(
     page_index: Annotated[int | None, typer.Option("--page", "-p", help="点名记录页面索引")] = 1,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此参数，一次性输出所有结果")] = False,
     summary: Annotated[bool | None, typer.Option("--summary", "-S", help="启用此选项，统计点名情况")] = False,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
 ):
+    output = JSONRecordWriter("Rollcalls View", ndjson, ("id", "time", "type", "status"))
+    json = json or ndjson
+
     student_id = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_LAZ_STUDENTID_NAME)
     rollcall_type_map = {
         "radar": "雷达点名",
@@ -1259,16 +1569,16 @@ async def view_rollcalls(
         
         task = progress.add_task(description="请求数据中...", total=2)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
             raw_course_rollcalls = (await zju_api.courseRollcallsViewAPIFits(client.session, course_id=course_id, student_id=student_id).get_api_data())[0]
 
         progress.update(task, description="渲染点名记录中...", completed=1)
         
-        course_rollcalls: list[dict] = raw_course_rollcalls.get("rollcalls")
+        course_rollcalls = parse_list(raw_course_rollcalls, "rollcalls", Rollcall)
 
         if not course_rollcalls:
             if json:
-                print_with_json(True, "Not Found Rollcalls history")
+                output.close("Not Found Rollcalls history")
             else:
                 rprint("暂无点名记录哦~")
             
@@ -1280,10 +1590,14 @@ async def view_rollcalls(
             on_call_rollcalls_amount = 0
             
             for rollcall in course_rollcalls:
-                if rollcall.get("status") == "on_call_fine":
+                if rollcall.status == "on_call_fine":
                     on_call_rollcalls_amount += 1
 
-            if json:
+            if ndjson:
+                summary_output = JSONRecordWriter("Rollcalls Summary", ndjson, ("total", "on_call"))
+                summary_output.write({"total": total_rollcalls_amount, "on_call": on_call_rollcalls_amount})
+                summary_output.close()
+            elif json:
                 print_with_json(
                     True, 
                     "Rollcalls Summary",
@@ -1317,28 +1631,27 @@ async def view_rollcalls(
 
         # --- JSON FORMAT HEAD ---
         if json:
-            results = []
             for rollcall in course_rollcalls_shown:
-                rollcall_id = str(rollcall.get("rollcall_id", 0))
-                rollcall_time = transform_time(rollcall.get("rollcall_time"))
-                rollcall_type = rollcall_type_map.get(rollcall.get("source"), "None")
+                rollcall_id = str(rollcall.rollcall_id or 0)
+                rollcall_time = transform_time(rollcall.rollcall_time)
+                rollcall_type = rollcall_type_map.get(rollcall.source, "None")
 
-                if rollcall.get("status") == "on_call_fine":
+                if rollcall.status == "on_call_fine":
                     rollcall_status_text = "Signed in"
                 else:
-                    if rollcall.get("rollcall_status") == "finished":   
+                    if rollcall.rollcall_status == "finished":   
                         rollcall_status_text = "No sign-in"
                     else:
                         rollcall_status_text = "In progress"
 
-                results.append({
+                output.write({
                     "id": rollcall_id,
                     "time": rollcall_time,
                     "type": rollcall_type,
                     "status": rollcall_status_text
                 })
 
-            print_with_json(True, "Rollcalls View", results)
+            output.close()
             return 
         # --- JSON FORMAT END ---
 
@@ -1357,17 +1670,17 @@ async def view_rollcalls(
         rollcalls_table.add_column("签到类型")
 
         for rollcall in course_rollcalls_shown:
-            rollcall_id = str(rollcall.get("rollcall_id", 0))
-            rollcall_time = transform_time(rollcall.get("rollcall_time"))
-            rollcall_type = rollcall_type_map.get(rollcall.get("source"), "None")
+            rollcall_id = str(rollcall.rollcall_id or 0)
+            rollcall_time = transform_time(rollcall.rollcall_time)
+            rollcall_type = rollcall_type_map.get(rollcall.source, "None")
 
-            if rollcall.get("status") == "on_call_fine":
+            if rollcall.status == "on_call_fine":
                 rollcall_status_text = Text(
                     "√ 已签到",
                     "green"
                 )
             else:
-                if rollcall.get("rollcall_status") == "finished":   
+                if rollcall.rollcall_status == "finished":   
                     rollcall_status_text = Text(
                         "✘ 未签到",
                         "red"
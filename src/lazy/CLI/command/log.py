@@ -3,22 +3,107 @@ from typing import Annotated
 
 import typer
 from rich import print as rprint
+from rich.table import Table
 
-from ...core.load_config.backup import BackupManager
+from ...core.load_config.backup import (
+    COMPRESSION_METHODS,
+    DEFAULT_COMPRESSION,
+    BackupManager,
+)
+from ...core.load_config.load_config import logBackupConfig
+from ...core.printlog.log_stats import latency_stats, request_events
+from ..utils.utils import print_with_json
 
 app =  typer.Typer(help="管理 LAZY CLI 日志文件")
 
+def default_log_archive()->Path:
+    """'lazy log export' 默认导出到的日志压缩包"""
+    tasks = logBackupConfig().load_config().get("tasks") or []
+    output_name = tasks[0]["params"]["output_name"] if tasks else "lazy-logs.zip"
+    return Path.home() / output_name
+
 @app.command(
     "export",
     help="导出 LAZY CLI 本地日志文件"
 )
 def export(
-    output_dir: Annotated[str | None, typer.Option("--dest", "-d", help="日志导出目录")] = Path.home()
+    output_dir: Annotated[str | None, typer.Option("--dest", "-d", help="日志导出目录")] = Path.home(),
+    compression: Annotated[str, typer.Option("--compression", "-c", help="压缩方式: deflate, zstd (需 Python 3.14+) 或 store")] = DEFAULT_COMPRESSION,
+    incremental: Annotated[bool | None, typer.Option("--incremental", "-i", help="启用此选项，只导出自上次导出后变化的日志")] = False
 ):
-    mannager = BackupManager(output_dir)
+    if compression not in COMPRESSION_METHODS:
+        rprint(f"[red]不支持的压缩方式 {compression}！[/red]可选: {', '.join(COMPRESSION_METHODS)}")
+        raise typer.Exit(code=1)
+
+    mannager = BackupManager(output_dir, compression, incremental)
     if mannager.run_for_log():
         rprint(f"[green]日志导出成功！[/green]导出目录: {output_dir}")
         return 
     
     rprint("[red]日志导出失败！[/red]")
-    raise typer.Exit(code=1)
\ No newline at end of file
+    raise typer.Exit(code=1)
+
+@app.command(
+    "stats",
+    help="统计导出日志中各接口的请求耗时"
+)
+def stats(
+    archive: Annotated[Path | None, typer.Argument(help="日志压缩包或 lazy_cli.jsonl 文件，默认为 'lazy log export' 导出的压缩包")] = None,
+    keyword: Annotated[str | None, typer.Option("--name", "-n", help="只统计名称包含关键字的接口")] = None,
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    """
+    读取 'lazy log export' 导出的日志，按接口统计请求次数、失败次数与耗时的 p50/p90/p99。
+    """
+    archive = archive or default_log_archive()
+    if not archive.exists():
+        if json:
+            print_with_json(False, "Archive not found.")
+        else:
+            rprint(f"[red]未找到日志文件 {archive}！[/red]请先运行 'lazy log export'。")
+        raise typer.Exit(code=1)
+
+    endpoint_stats = latency_stats(request_events(archive), keyword)
+
+    if json:
+        print_with_json(True, "Latency Stats", [
+            {
+                "api_name": item.api_name,
+                "count": item.count,
+                "errors": item.errors,
+                "p50_ms": item.p50,
+                "p90_ms": item.p90,
+                "p99_ms": item.p99,
+                "max_ms": item.max,
+                "avg_bytes": round(item.avg_bytes)
+            } for item in endpoint_stats
+        ])
+        return
+
+    if not endpoint_stats:
+        rprint("日志中没有请求记录。")
+        return
+
+    stats_table = Table(title="接口请求耗时 (ms)", caption=f"{archive}，共 {sum(item.count for item in endpoint_stats)} 次请求")
+    stats_table.add_column("接口", style="cyan", no_wrap=True)
+    stats_table.add_column("次数", justify="right")
+    stats_table.add_column("失败", justify="right", style="red")
+    stats_table.add_column("p50", justify="right", style="green")
+    stats_table.add_column("p90", justify="right", style="yellow")
+    stats_table.add_column("p99", justify="right", style="bright_red")
+    stats_table.add_column("最大", justify="right")
+    stats_table.add_column("平均大小", justify="right", style="dim")
+
+    for item in endpoint_stats:
+        stats_table.add_row(
+            item.api_name,
+            str(item.count),
+            str(item.errors),
+            f"{item.p50:.0f}",
+            f"{item.p90:.0f}",
+            f"{item.p99:.0f}",
+            f"{item.max:.0f}",
+            f"{item.avg_bytes / 1024:.1f} KB"
+        )
+
+    rprint(stats_table)
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from functools import partial
+from textwrap import dedent
+from typing import Annotated
+
+import typer
+from asyncer import syncify
+from rich import filesize
+from rich import print as rprint
+from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.table import Table
+
+from ...core.login.login import CredentialManager, ZjuAsyncClient
+from ...core.mirror.store import COURSE_PREVIEW_APIS, COURSE_VIEW_APIS, MirrorStore
+from ...core.zjuAPI import zju_api
+from ..session import open_client
+from ..utils.utils import print_with_json
+
+logger = logging.getLogger(__name__)
+
+MIRROR_PAGE_SIZE = 50
+MIRROR_PAGE_CONCURRENCY = 4
+MIRROR_CONCURRENCY = 6
+
+# mirror 命令组
+app = typer.Typer(help="""
+                  管理学在浙大数据的本地镜像，镜像可供 --offline 离线查询。
+                  """,
+                  no_args_is_help=True)
+
+async def fetch_course_payloads(client: ZjuAsyncClient, course_id: int, semaphore: asyncio.Semaphore)->dict[str, dict]:
+    """拉取一门课程的基本信息、章节与全部任务，返回 接口名 -> 原始响应。"""
+    async with semaphore:
+        raw_previews, raw_views = await asyncio.gather(
+            zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data(),
+            zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
+        )
+
+    return dict(zip(COURSE_PREVIEW_APIS + COURSE_VIEW_APIS, [*raw_previews, *raw_views], strict=True))
+
+def format_timestamp(timestamp: str|None)->str:
+    if timestamp == None:
+        return "从未"
+    return datetime.fromtimestamp(float(timestamp)).strftime("%Y-%m-%d %H:%M:%S")
+
+@app.command(
+    "refresh",
+    help="增量刷新本地镜像",
+    epilog=dedent("""
+        EXAMPLES:
+
+          $ lazy mirror refresh
+            (刷新课程列表、有变化或已过期的课程内容与待办清单)
+
+          $ lazy mirror refresh --full
+            (忽略过期时间，重新拉取所有课程内容)
+
+          $ lazy mirror refresh -n 微积分
+            (只刷新名称包含"微积分"的课程)
+    """))
+@partial(syncify, raise_sync_error=False)
+async def refresh_mirror(
+    keyword: Annotated[str | None, typer.Option("--name", "-n", help="只刷新名称包含关键字的课程")] = None,
+    full: Annotated[bool | None, typer.Option("--full", "-F", help="启用此选项，重新拉取所有课程内容")] = False,
+    max_age: Annotated[float, typer.Option("--max-age", help="课程内容的过期时间（小时），未过期且列表条目未变化的课程将被跳过")] = 6.0,
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    """
+    增量刷新本地镜像。
+
+    每次都会重新拉取课程列表与待办清单；课程内容只在课程新增、列表条目发生变化
+    或距上次拉取超过 --max-age 小时时才会重新请求，未变化的响应不会重复写入。
+    """
+    cookies = CredentialManager().load_cookies()
+    if not cookies:
+        if json:
+            print_with_json(False, "Cookies is unacceptable.")
+        else:
+            rprint("Cookies不存在！")
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
+
+    start = time.perf_counter()
+    failed: list[int] = []
+    changed_amount = 0
+
+    with MirrorStore() as store, Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed}/{task.total}"),
+        transient=True,
+        disable=json
+    ) as progress:
+        task = progress.add_task(description="拉取课程列表中...", total=None)
+
+        async with open_client(cookies) as client:
+            raw_courses: list[dict] = []
+            pages = zju_api.iter_api_pages(
+                lambda page, page_size: zju_api.coursesListAPIFits(client.session, keyword, page, page_size),
+                MIRROR_PAGE_SIZE,
+                MIRROR_PAGE_CONCURRENCY
+            )
+            async for page in pages:
+                raw_courses.extend(page.get("courses") or [])
+
+            # 只有完整拉取了全部课程时才能确定哪些课程已经不存在
+            changed_ids = store.upsert_courses(raw_courses, prune=keyword == None and not pages.failed_pages)
+            course_ids = [raw.get("id") for raw in raw_courses if raw.get("id") != None]
+            if full:
+                due_ids = course_ids
+            else:
+                due_set = set(changed_ids) | set(store.courses_due(course_ids, max_age * 3600))
+                due_ids = [course_id for course_id in course_ids if course_id in due_set]
+
+            logger.info(f"镜像刷新: 共 {len(course_ids)} 门课程，{len(due_ids)} 门需要拉取内容")
+            progress.update(task, description="拉取课程内容中...", total=len(due_ids), completed=0)
+
+            semaphore = asyncio.Semaphore(MIRROR_CONCURRENCY)
+
+            async def fetch(course_id: int)->tuple[int, dict[str, dict]|None]:
+                try:
+                    return course_id, await fetch_course_payloads(client, course_id, semaphore)
+                except Exception as e:
+                    logger.error(f"镜像刷新: 课程 {course_id} 内容拉取失败: {repr(e)}")
+                    return course_id, None
+
+            # 谁先到先写入，写入在事件循环线程内串行进行
+            for future in asyncio.as_completed([fetch(course_id) for course_id in due_ids]):
+                course_id, payloads = await future
+                progress.advance(task)
+
+                if payloads == None:
+                    failed.append(course_id)
+                    continue
+
+                failed_apis = [api for api, raw in payloads.items() if not raw]
+                if failed_apis:
+                    logger.warning(f"镜像刷新: 课程 {course_id} 部分接口请求失败: {', '.join(failed_apis)}")
+                    failed.append(course_id)
+
+                if store.save_course_payloads(course_id, payloads):
+                    changed_amount += 1
+
+            progress.update(task, description="拉取待办事项中...", total=None)
+            raw_todo_list = (await zju_api.assignmentTodoListAPIFits(client.session).get_api_data())[0]
+            store.save_todos(raw_todo_list)
+
+    result = {
+        "courses": len(course_ids),
+        "fetched": len(due_ids),
+        "changed": changed_amount,
+        "skipped": len(course_ids) - len(due_ids),
+        "failed": failed,
+        "failed_pages": sorted(pages.failed_pages),
+        "elapsed": round(time.perf_counter() - start, 3)
+    }
+
+    if json:
+        print_with_json(True, "Mirror Refresh", result)
+        return
+
+    rprint(f"[green]镜像刷新完成！[/green]共 {result['courses']} 门课程，拉取 {result['fetched']} 门，"
+           f"更新 {result['changed']} 门，跳过 {result['skipped']} 门，用时 {result['elapsed']} 秒。")
+    if failed:
+        rprint(f"[yellow]{len(failed)} 门课程部分内容拉取失败，已保留旧数据: {', '.join(map(str, failed))}[/yellow]")
+    if pages.failed_pages:
+        rprint(f"[yellow]课程列表第 {', '.join(map(str, result['failed_pages']))} 页拉取失败，本次未清理已删除的课程[/yellow]")
+
+@app.command(
+    "status",
+    help="查看本地镜像状态"
+)
+def mirror_status(
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    """
+    查看本地镜像的位置、表结构版本、各类数据的数量与最近刷新时间。
+    """
+    with MirrorStore() as store:
+        status = store.status()
+
+    if json:
+        print_with_json(True, "Mirror Status", status)
+        return
+
+    status_table = Table(
+        title="本地镜像状态",
+        show_header=False,
+        border_style="bright_black",
+        box=None
+    )
+    status_table.add_column("Key", style="bright_yellow", no_wrap=True)
+    status_table.add_column("Value", style="bright_white")
+
+    status_table.add_row("路径", status["path"])
+    status_table.add_row("表结构版本", str(status["schema_version"]))
+    status_table.add_row("占用空间", filesize.decimal(status["size"]))
+    status_table.add_row("课程列表刷新于", format_timestamp(status["courses_listed_at"]))
+    status_table.add_row("待办清单刷新于", format_timestamp(status["todos_refreshed_at"]))
+    status_table.add_row("已镜像内容的课程", f"{status['courses_with_content']} / {status['counts']['courses']}")
+
+    counts_name_map = {
+        "modules": "章节",
+        "activities": "活动",
+        "exams": "测试",
+        "classrooms": "课堂任务",
+        "uploads": "附件",
+        "todos": "待办事项"
+    }
+    for table, name in counts_name_map.items():
+        status_table.add_row(name, str(status["counts"][table]))
+
+    rprint(status_table)
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+import os
+import subprocess
+from functools import partial
+from typing import Annotated
+
+import typer
+from asyncer import syncify
+
+from ...core.login.login import CredentialManager
+from ...core.mirror.prefetch import ResponseCache, session_key
+from ...core.zjuAPI import zju_api
+from ..session import open_client
+from ..utils.utils import lazy_command
+
+logger = logging.getLogger(__name__)
+
+# 单次最多预取的条目数
+PREFETCH_MAX_ITEMS = 10
+# 预取进程的并发数与总时限（秒），只在后台占用少量连接
+PREFETCH_CONCURRENCY = 2
+PREFETCH_TIMEOUT = 60
+# 预取进程的 nice 增量
+PREFETCH_NICENESS = 10
+
+# prefetch 命令组，由 --prefetch 选项在后台调用
+app = typer.Typer(help="""
+                  在后台预取任务与课程内容，供随后的查看命令直接使用。
+                  """,
+                  no_args_is_help=True)
+
+def spawn_prefetch(kind: str, targets: list[str]):
+    """启动分离的低优先级进程预取 targets，最多 PREFETCH_MAX_ITEMS 个，不等待其结束"""
+    targets = targets[:PREFETCH_MAX_ITEMS]
+    if not targets:
+        return
+
+    try:
+        subprocess.Popen(
+            lazy_command("prefetch", kind, *targets),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            creationflags=getattr(subprocess, "BELOW_NORMAL_PRIORITY_CLASS", 0)
+        )
+    except OSError as e:
+        logger.warning(f"预取进程启动失败: {e}")
+        return
+
+    logger.info(f"已在后台预取 {kind}: {' '.join(targets)}")
+
+def lower_priority():
+    if hasattr(os, "nice"):
+        try:
+            os.nice(PREFETCH_NICENESS)
+        except OSError as e:
+            logger.warning(f"无法降低预取进程优先级: {e}")
+
+async def prefetch_all(fetch_one, targets: list)->int:
+    """以 PREFETCH_CONCURRENCY 的并发预取全部条目，超过 PREFETCH_TIMEOUT 时放弃剩余部分，返回失败数量"""
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+
+    async def run_one(target)->bool:
+        async with semaphore:
+            try:
+                await fetch_one(target)
+                return True
+            except Exception as e:
+                logger.warning(f"预取 {target} 失败: {repr(e)}")
+                return False
+
+    try:
+        results = await asyncio.wait_for(asyncio.gather(*(run_one(target) for target in targets)), PREFETCH_TIMEOUT)
+    except TimeoutError:
+        logger.warning(f"预取超过 {PREFETCH_TIMEOUT} 秒，已放弃剩余条目")
+        return len(targets)
+
+    return results.count(False)
+
+@app.command("assignments", help="预取任务内容")
+@partial(syncify, raise_sync_error=False)
+async def prefetch_assignments(
+    targets: Annotated[list[str], typer.Argument(help="任务id，可附带待办类型，如 114514:exam")]
+):
+    """
+    按 'lazy assignment view' 的请求顺序拉取任务，记录下的响应供其直接使用。
+    """
+    # assignment 模块导入了本模块的 spawn_prefetch，在此处导入以避免循环导入
+    from .assignment import TODO_TYPE_MAP, AssignmentType, resolve_and_view
+
+    lower_priority()
+
+    cookies = CredentialManager().load_cookies()
+    if not cookies:
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
+
+    assignments: list[tuple[int, AssignmentType]] = []
+    for target in targets[:PREFETCH_MAX_ITEMS]:
+        assignment_id, _, todo_type = target.partition(":")
+        if not assignment_id.isdigit():
+            logger.warning(f"忽略无效的任务id: {target}")
+            continue
+        assignments.append((int(assignment_id), TODO_TYPE_MAP.get(todo_type, AssignmentType.UNKOWN)))
+
+    cache = ResponseCache(session_key(cookies), record=True)
+    async with open_client(cookies, cache) as client:
+        async def fetch_one(assignment: tuple[int, AssignmentType]):
+            await resolve_and_view(client, *assignment, preview=False, json=True, show_progress=False)
+
+        failed = await prefetch_all(fetch_one, assignments)
+
+    logger.info(f"任务预取完成: {len(assignments) - failed}/{len(assignments)} 成功")
+
+@app.command("courses", help="预取课程内容")
+@partial(syncify, raise_sync_error=False)
+async def prefetch_courses(
+    course_ids: Annotated[list[int], typer.Argument(help="课程id")]
+):
+    """
+    拉取课程的基本信息、章节与全部任务，供 'lazy course view syllabus' 直接使用。
+    """
+    lower_priority()
+
+    cookies = CredentialManager().load_cookies()
+    if not cookies:
+        logger.error("Cookies不存在！")
+        raise typer.Exit(code=1)
+
+    course_ids = course_ids[:PREFETCH_MAX_ITEMS]
+    cache = ResponseCache(session_key(cookies), record=True)
+    async with open_client(cookies, cache) as client:
+        async def fetch_one(course_id: int):
+            await asyncio.gather(
+                zju_api.coursePreviewAPIFits(client.session, course_id).get_api_data(),
+                zju_api.courseViewAPIFits(client.session, course_id).get_api_data()
+            )
+
+        failed = await prefetch_all(fetch_one, course_ids)
+
+    logger.info(f"课程预取完成: {len(course_ids) - failed}/{len(course_ids)} 成功")
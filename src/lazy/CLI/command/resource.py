@@ -22,10 +22,10 @@ from rich.progress import (
 from rich.table import Table
 from rich.text import Text
 
-from ...core.login.login import CredentialManager, ZjuAsyncClient
+from ...core.login.login import CredentialManager
 from ...core.zjuAPI import zju_api
-from ..state import state
-from ..utils.utils import print_with_json, transform_time
+from ..session import open_client
+from ..utils.utils import JSONRecordWriter, print_with_json, transform_time
 
 # resource 命令组
 app = typer.Typer(help="管理学在浙大云盘资源",
@@ -113,6 +113,27 @@ def to_upload_dir_walker(dir: Path)->list[Path]:
 
     return to_upload_files
 
+RESOURCES_PAGE_SIZE = 50
+RESOURCE_FIELDS = ("id", "name", "size", "update_time")
+RESOURCE_SHORT_FIELDS = ("id", "name")
+
+def resource_json(resource: dict, short: bool)->dict:
+    resource_id = str(resource.get('id', 'null'))
+    resource_name = resource.get('name', 'null')
+
+    if short:
+        return {
+            "id": resource_id,
+            "name": resource_name
+        }
+
+    return {
+        "id": resource_id,
+        "name": resource_name,
+        "size": filesize.decimal(resource.get('size', 0)),
+        "update_time": transform_time(resource.get("updated_at", "1900-01-01T00:00:00Z"))
+    }
+
 # 注册资源列举命令
 @app.command(
         "ls",
@@ -154,6 +175,7 @@ async def list_resources(
     short: Annotated[bool | None, typer.Option("--short", "-s", help="简化输出内容，仅显示文件名与文件id")] = False,
     quiet: Annotated[bool | None, typer.Option("--quiet", "-q", help="仅输出文件id")] = False,
     all: Annotated[bool | None, typer.Option("--all", "-A", help="启用此参数，一次性输出所有结果")] = False,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头，配合 -A 边拉取边输出")] = False,
     json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
     ):
     """
@@ -163,6 +185,9 @@ async def list_resources(
     你可以通过 -p 与 -a 指定页码与每页显示数量，或通过 -A 输出全部文件（此时会无视 -p 与 -a）。
     你可以通过 -t 筛选指定的文件类型，合法的文件类型有："file", "video", "document", "image", "audio", "scorm", "swf", "link"
     """
+    output = JSONRecordWriter("Resources List", ndjson, () if quiet else RESOURCE_SHORT_FIELDS if short else RESOURCE_FIELDS)
+    json = json or ndjson
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
@@ -180,7 +205,26 @@ async def list_resources(
             logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
+            # NDJSON 模式下逐页拉取并随到随输出
+            if all and ndjson:
+                found = False
+                pages = zju_api.iter_api_pages(
+                    lambda page, page_size: zju_api.resourcesListAPIFits(client.session, keyword, page, page_size, file_type),
+                    RESOURCES_PAGE_SIZE
+                )
+                async for page in pages:
+                    for resource in page.get("uploads", []):
+                        output.write(str(resource.get('id', 'null')) if quiet else resource_json(resource, short))
+                        found = True
+
+                if pages.failed_pages:
+                    output.fail(f"Failed to fetch pages: {', '.join(map(str, sorted(pages.failed_pages)))}")
+                    raise typer.Exit(code=1)
+
+                output.close(None if found else "Not Found Resources")
+                return
+
             # 如果启用--all，则先获取文件资源总数
             if all:
                 pre_results = (await zju_api.resourcesListAPIFits(client.session, keyword, 1, 1, file_type).get_api_data(False))[0]
@@ -207,7 +251,7 @@ async def list_resources(
 
         if current_results_amount == 0:
             if json:
-                print_with_json(True, "Not Found Resources")
+                output.close("Not Found Resources")
             else:
                 rprint("啊呀！没有找到文件呢。")
             
@@ -216,7 +260,9 @@ async def list_resources(
         if quiet:
             resourse_ids = [str(resource.get('id', 'null')) for resource in resources_list]
             if json:
-                print_with_json(True, "Resources List", resourse_ids)
+                for resource_id in resourse_ids:
+                    output.write(resource_id)
+                output.close()
             else:
                 print(" ".join(resourse_ids))
 
@@ -224,30 +270,10 @@ async def list_resources(
 
         # --- JSON FORMAT HEAD ---
         if json:
-            results = []
             for resource in resources_list:
-                resource_id = str(resource.get('id', 'null'))
-                resource_name = resource.get('name', 'null')
-                
-                if short:
-                    results.append({
-                        "id": resource_id,
-                        "name": resource_name
-                    })
-                    
-                    continue
-                
-                resource_size = filesize.decimal(resource.get('size', 0))
-                resource_update_time = transform_time(resource.get("updated_at", "1900-01-01T00:00:00Z"))
-                
-                results.append({
-                    "id": resource_id,
-                    "name": resource_name,
-                    "size": resource_size,
-                    "update_time": resource_update_time
-                })
+                output.write(resource_json(resource, short))
             
-            print_with_json(True, "Resources List", results)
+            output.close()
             return 
         # --- JSON FORMAT END ---
 
@@ -404,7 +430,7 @@ async def upload_resources(
                 raise typer.Exit(code=1)
 
             results = []
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+            async with open_client(cookies) as client:
                 files_uploader = zju_api.resourceUploadAPIFits(client.session)
                 
                 for to_upload_file in to_upload_files:
@@ -524,7 +550,7 @@ async def remove_resources(
         if batch:
             task = progress.add_task(description="删除文件中...", total=1)
 
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+            async with open_client(cookies) as client:
                 file_deleter = zju_api.resourcesRemoveAPIFits(client.session, resources_id=files_id)
             
             if await file_deleter.batch_delete():
@@ -548,7 +574,7 @@ async def remove_resources(
         task = progress.add_task(description="删除文件中...", total=files_id_amount)
         
         results = []
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
             for file_id in files_id:
                 file_deleter = zju_api.resourcesRemoveAPIFits(client.session, resource_id=file_id)
                 
@@ -662,7 +688,7 @@ async def download_resource(
                     logger.error("Cookies不存在！")
                     raise typer.Exit(code=1)
 
-                async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+                async with open_client(cookies) as client:
                     resources_downloader = zju_api.resourcesDownloadAPIFits(client.session, output_path=dest, resources_id=files_id, basename=basename)
                 
                     # 子任务，跟踪文件下载进度
@@ -712,7 +738,7 @@ async def download_resource(
                 raise typer.Exit(code=1)
 
             results = []
-            async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+            async with open_client(cookies) as client:
                 for file_id in files_id:
                     resource_downloader = zju_api.resourcesDownloadAPIFits(client.session, output_path=dest, resource_id=file_id, basename=basename)
                     
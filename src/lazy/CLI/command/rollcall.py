@@ -20,8 +20,10 @@ from rich.table import Table
 
 from ...core.load_config import load_config
 from ...core.login.login import CredentialManager, ZjuAsyncClient
+from ...core.models.models import Rollcall, parse_list
 from ...core.zjuAPI import zju_api
-from ..state import state
+from ..session import open_client
+from ..utils.utils import JSONRecordWriter, print_with_json
 from .subcommand import rollcall_config
 
 logger = logging.getLogger(__name__)
@@ -78,7 +80,7 @@ async def answer_radar_rollcall(rollcall_id: int, site: str):
         raise typer.Exit(code=1)
         
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with open_client(cookies) as client:
         raw_rollcall_answer_list = await zju_api.rollcallAnswerRadarAPIFits(
             client.session, rollcall_id, rollcall_data
         ).put_api_data()
@@ -158,7 +160,7 @@ async def answer_number_rollcall(rollcall_id: int, number_code: str|None):
         logger.error("Cookies不存在！")
         raise typer.Exit(code=1)
 
-    async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+    async with open_client(cookies) as client:
         if number_code:
             rollcall_data = {
                 "deviceId": device_id,
@@ -243,33 +245,58 @@ async def answer_number_rollcall(rollcall_id: int, number_code: str|None):
                 (查看当前正在进行的签到任务) 
         """))
 @partial(syncify, raise_sync_error=False)
-async def list_rollcall():
+async def list_rollcall(
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
     """
     查看学在浙大正在进行的签到任务。
     """
+    output = JSONRecordWriter("Rollcalls List", ndjson, ("id", "course_name", "initiator", "is_radar"))
+    json = json or ndjson
+
     with Progress(
         SpinnerColumn(),
         TextColumn("[progress.description]{task.description}"),
-        transient=True
+        transient=True,
+        disable=json
     ) as progress:
         task = progress.add_task(description="请求数据中...", total=2)
         cookies = CredentialManager().load_cookies()
         if not cookies:
-            rprint("Cookies不存在！")
+            if json:
+                print_with_json(False, "Cookies is unacceptable.")
+            else:
+                rprint("Cookies不存在！")
             logger.error("Cookies不存在！")
             raise typer.Exit(code=1)
 
-        async with ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env) as client:
+        async with open_client(cookies) as client:
             raw_rollcalls_list = (await zju_api.rollcallListAPIFits(client.session).get_api_data())[0]
         
-        rollcalls_list: list[dict] = raw_rollcalls_list.get("rollcalls", [])
+        rollcalls_list = parse_list(raw_rollcalls_list, "rollcalls", Rollcall)
 
         progress.update(task, description="渲染数据中...", completed=1)
 
         if not rollcalls_list:
-            print("暂时还没有签到任务哦~")
+            if json:
+                output.close("No Rollcalls")
+            else:
+                print("暂时还没有签到任务哦~")
             return 
 
+        if json:
+            for rollcall in rollcalls_list:
+                output.write({
+                    "id": str(rollcall.rollcall_id),
+                    "course_name": rollcall.course_title,
+                    "initiator": rollcall.created_by_name,
+                    "is_radar": rollcall.is_radar
+                })
+
+            output.close()
+            return
+
         rollcall_list_table = Table(
             title=f"签到任务 共 {len(rollcalls_list)} 个",
             border_style="bright_black",
@@ -284,10 +311,10 @@ async def list_rollcall():
         rollcall_list_table.add_column("签到属性", ratio=2)
 
         for rollcall in rollcalls_list:
-            rollcall_course_title = rollcall.get("course_title", "null")
-            rollcall_initiator = rollcall.get("created_by_name", "null")
-            rollcall_id = str(rollcall.get("rollcall_id", "null"))
-            rollcall_is_radar = rollcall.get("is_radar", False)
+            rollcall_course_title = rollcall.course_title
+            rollcall_initiator = rollcall.created_by_name
+            rollcall_id = str(rollcall.rollcall_id)
+            rollcall_is_radar = rollcall.is_radar
 
             rollcall_description = "雷达点名" if rollcall_is_radar else "非雷达点名"
 
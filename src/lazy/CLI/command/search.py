@@ -0,0 +1,137 @@
+import logging
+import time
+from textwrap import dedent
+from typing import Annotated
+
+import typer
+from rich import print as rprint
+from rich.table import Table
+from rich.text import Text
+
+from ...core.mirror.search import SEARCH_KINDS
+from ...core.mirror.store import MirrorStore
+from ..utils.utils import JSONRecordWriter
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ("kind", "id", "title", "course_id", "course_name", "parent_id", "body")
+
+kind_name_map = {
+    "activity": "活动",
+    "exam": "测试",
+    "classroom": "课堂任务",
+    "upload": "附件"
+}
+
+def parse_kinds(kinds: list[str] | None)->list[str] | None:
+    if not kinds:
+        return kinds
+
+    for kind in kinds:
+        if kind not in SEARCH_KINDS:
+            raise typer.BadParameter(f"类型只能是 {', '.join(SEARCH_KINDS)} 之一")
+
+    return kinds
+
+# search 只有一个命令，按需加载时会折叠为 'lazy search'
+app = typer.Typer()
+
+@app.command(
+    "search",
+    help="在本地镜像中检索课程内容",
+    epilog=dedent("""
+        EXAMPLES:
+
+          $ lazy search 期中
+            (检索标题或简介包含"期中"的任务与附件)
+
+          $ lazy search 实验报告 -k upload
+            (只检索附件文件名)
+
+          $ lazy search 习题 -c 114514
+            (只检索ID为"114514"的课程)
+    """),
+    no_args_is_help=True
+)
+def search_materials(
+    query: Annotated[str, typer.Argument(help="检索关键词，多个关键词以空格分隔，需同时命中")],
+    kinds: Annotated[list[str] | None, typer.Option("--kind", "-k", help="只检索指定类型：activity, exam, classroom, upload", callback=parse_kinds)] = None,
+    course_id: Annotated[int | None, typer.Option("--course", "-c", help="只检索指定课程")] = None,
+    amount: Annotated[int, typer.Option("--amount", "-a", help="显示结果数量")] = 20,
+    ndjson: Annotated[bool | None, typer.Option("--ndjson", help="以 NDJSON 格式逐行输出，首行为 schema 头")] = False,
+    json: Annotated[bool | None, typer.Option("--json", "-J", hidden=True)] = False
+):
+    """
+    在本地镜像中检索所有课程的活动、测试、课堂任务与附件。
+
+    检索范围为标题、简介与附件文件名，数据来自 'lazy mirror refresh'，
+    浏览课程目录时拉取到的内容也会顺带更新到镜像中。
+    """
+    output = JSONRecordWriter("Search Results", ndjson, SEARCH_FIELDS)
+    json = json or ndjson
+
+    start = time.perf_counter()
+    with MirrorStore() as store:
+        if store.get_meta("courses_listed_at") == None:
+            if json:
+                output.close("Not Mirrored")
+            else:
+                rprint("本地镜像为空，请先运行 'lazy mirror refresh'。")
+            raise typer.Exit(code=1)
+
+        hits = store.search(query, kinds, course_id, amount)
+    elapsed = (time.perf_counter() - start) * 1000
+    logger.info(f"检索 '{query}' 命中 {len(hits)} 条，用时 {elapsed:.1f} ms")
+
+    if json:
+        if not hits:
+            output.close("Not Found")
+            return
+
+        for hit in hits:
+            output.write({
+                "kind": hit.kind,
+                "id": hit.item_id,
+                "title": hit.title,
+                "course_id": hit.course_id,
+                "course_name": hit.course_name,
+                "parent_id": hit.parent_id or None,
+                "body": hit.body
+            })
+        output.close()
+        return
+
+    if not hits:
+        rprint(f"没有找到与 '{query}' 相关的内容。")
+        return
+
+    search_table = Table(
+        title=f"'{query}' 的检索结果",
+        caption=f"共 {len(hits)} 条结果，用时 {elapsed:.1f} ms。",
+        border_style="bright_black",
+        show_header=True,
+        header_style="bold magenta",
+        expand=True
+    )
+    search_table.add_column("类型", no_wrap=True)
+    search_table.add_column("名称", ratio=4)
+    search_table.add_column("ID", style="cyan", no_wrap=True)
+    search_table.add_column("课程名称", style="bright_yellow", ratio=2)
+    search_table.add_column("所属", style="dim", ratio=2)
+
+    terms = query.split()
+    for hit in hits:
+        title = Text(hit.title)
+        title.highlight_words(terms, style="bold green", case_sensitive=False)
+
+        # 附件显示所属活动，其余显示简介开头
+        belongs = hit.body if hit.kind == "upload" else hit.body[:40]
+        search_table.add_row(
+            kind_name_map.get(hit.kind, hit.kind),
+            title,
+            str(hit.item_id),
+            f"{hit.course_name} ({hit.course_id})",
+            belongs
+        )
+
+    rprint(search_table)
@@ -0,0 +1,105 @@
+"""按需加载子命令的 Typer 命令组。
+
+各命令组模块会连带导入 httpx、lxml、keyring、cryptography 与 zju_api 等重量级依赖，
+而一次调用只会用到其中一个。`LazyTyperGroup` 只登记子命令所在的模块，解析到该子命令时才导入；
+生成 `--help` 的命令列表时使用登记的帮助文本作为占位，不会触发导入。
+"""
+import importlib
+import logging
+from dataclasses import dataclass
+
+import click
+import typer
+from typer.core import TyperGroup
+
+logger = logging.getLogger(__name__)
+
+COMPLETION_PARAMS = ("install_completion", "show_completion")
+
+
+def _remaining_args(ctx: click.Context) -> list[str]:
+    # click 8.2 起 protected_args 改为私有属性 _protected_args
+    protected = getattr(ctx, "_protected_args", None)
+    if protected is None:
+        protected = ctx.protected_args
+    return [*protected, *ctx.args]
+
+
+def resolve_leaf_params(ctx: click.Context, cmd_name: str, command: click.Command, args: list[str]) -> dict:
+    """按各级子命令自己的参数定义解析 args（不执行命令），返回最终子命令的参数。
+
+    用于在根命令的回调执行之前得知子命令的选项，解析失败时返回空 dict。
+    """
+    try:
+        sub_ctx = command.make_context(cmd_name, list(args), parent=ctx, resilient_parsing=True)
+        # 新版 typer 自带 click 的副本，其命令组不是 click.Group 的实例，按接口判断
+        while hasattr(command, "resolve_command"):
+            rest = _remaining_args(sub_ctx)
+            if not rest:
+                break
+            cmd_name, command, rest = command.resolve_command(sub_ctx, rest)
+            if command is None:
+                break
+            sub_ctx = command.make_context(cmd_name, rest, parent=sub_ctx, resilient_parsing=True)
+    except Exception:
+        # 参数有误、校验回调退出等都留给正式解析时报告
+        return {}
+    return sub_ctx.params
+
+
+@dataclass(frozen=True, slots=True)
+class LazySubcommand:
+    # "模块路径:属性名"，属性为 typer.Typer 实例
+    import_path: str
+    help: str
+    hidden: bool = False
+
+
+class LazyTyperGroup(TyperGroup):
+    """子类通过类属性 `lazy_subcommands` 登记子命令，再以 `typer.Typer(cls=...)` 使用。"""
+
+    lazy_subcommands: dict[str, LazySubcommand] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._formatting_help = False
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        commands = super().list_commands(ctx)
+        return commands + [name for name in self.lazy_subcommands if name not in commands]
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> click.Command | None:
+        command = super().get_command(ctx, cmd_name)
+        if command is not None or cmd_name not in self.lazy_subcommands:
+            return command
+
+        subcommand = self.lazy_subcommands[cmd_name]
+        if self._formatting_help:
+            return click.Command(cmd_name, help=subcommand.help, hidden=subcommand.hidden)
+
+        command = self._load(cmd_name, subcommand)
+        # 加载后缓存到 commands 中，同一进程内只导入一次
+        self.add_command(command, cmd_name)
+        return command
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        self._formatting_help = True
+        try:
+            return super().format_help(ctx, formatter)
+        finally:
+            self._formatting_help = False
+
+    @staticmethod
+    def _load(cmd_name: str, subcommand: LazySubcommand) -> click.Command:
+        module_name, attr = subcommand.import_path.split(":")
+        logger.debug(f"加载子命令 {cmd_name}: {subcommand.import_path}")
+        typer_app: typer.Typer = getattr(importlib.import_module(module_name), attr)
+
+        command = typer.main.get_command(typer_app)
+        # 独立转换的 Typer 实例会带上补全选项，add_typer 注册的子命令组没有，这里去掉以保持一致
+        command.params = [param for param in command.params if param.name not in COMPLETION_PARAMS]
+        command.name = cmd_name
+        # 与 add_typer(help=...) 一致，登记的帮助文本优先于 Typer 实例自带的
+        command.help = subcommand.help
+        command.hidden = subcommand.hidden
+        return command
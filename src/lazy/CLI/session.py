@@ -0,0 +1,63 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import httpx
+import keyring
+
+from ..core.login.auth import SessionAuth
+from ..core.login.login import (
+    KEYRING_PASSWORD_NAME,
+    KEYRING_SERVICE_NAME,
+    KEYRING_STUDENTID_NAME,
+    CredentialManager,
+    ZjuAsyncClient,
+)
+from ..core.mirror.prefetch import ResponseCache
+from ..core.printlog.print_log import save_studentid_hash
+from .state import state
+
+logger = logging.getLogger(__name__)
+
+async def relogin_with_keyring(client: ZjuAsyncClient)->httpx.Cookies|None:
+    """使用 keyring 中保存的凭据重新登录并保存新的 Cookies，失败时返回 None"""
+    studentid = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_STUDENTID_NAME)
+    password = keyring.get_password(KEYRING_SERVICE_NAME, KEYRING_PASSWORD_NAME)
+
+    if not studentid or not password:
+        logger.error("未能找到登录凭据！")
+        return None
+
+    if not await client.login(studentid, password):
+        logger.error("使用保存的凭据登录失败！")
+        return None
+
+    save_studentid_hash(studentid)
+    # 保存失败不影响本次调用继续使用新会话
+    if not CredentialManager().save_cookies(client.session.cookies):
+        logger.error("Cookies保存失败！")
+
+    return client.session.cookies
+
+@asynccontextmanager
+async def open_client(cookies: dict|None, cache: ResponseCache|None = None)->AsyncIterator[ZjuAsyncClient]:
+    """打开本次调用共用的 ZjuAsyncClient。
+
+    会话不预先验证，请求遇到会话失效时自动使用 keyring 中的凭据重新登录并重发；
+    同一次调用中嵌套打开时直接复用已打开的 client 与连接池。
+    给定 cache 时 GET 请求先查询后台预取的响应，见 `core/mirror/prefetch.py`。
+    """
+    if state.client != None:
+        yield state.client
+        return
+
+    async def relogin()->httpx.Cookies|None:
+        return await relogin_with_keyring(client)
+
+    client = ZjuAsyncClient(cookies=cookies, trust_env=state.trust_env, auth=SessionAuth(relogin), cache=cache)
+    async with client:
+        state.client = client
+        try:
+            yield client
+        finally:
+            state.client = None
@@ -4,7 +4,10 @@ class State:
     """状态类，用于在 LAZY CLI 内共享全局状态
     """
     def __init__(self):
-        # self.client: ZjuClient = None
         self.trust_env: bool = True
+        # 本次调用中已打开的 ZjuAsyncClient，由 session.open_client 维护
+        self.client = None
+        # 本次调用的子命令是否启用了 --offline，由根命令组在解析子命令时设置
+        self.offline: bool = False
 
 state = State()
\ No newline at end of file
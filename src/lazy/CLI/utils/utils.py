@@ -1,8 +1,10 @@
-import json
+import sys
 from datetime import datetime
 
 from rich.text import Text
 
+from ...core.codec import json_codec
+
 
 def print_with_json(status: bool, description: str|None = None, result = None):
     text = {
@@ -10,7 +12,71 @@ def print_with_json(status: bool, description: str|None = None, result = None):
         "description": description,
         "result": result
     }
-    print(json.dumps(text, ensure_ascii=False))
+    print(json_codec.dumps_str(text))
+
+def lazy_command(*args: str)->list[str]:
+    """构造在子进程中运行 lazy 子命令的命令行；PyInstaller 打包后 sys.executable 即 lazy 本身"""
+    if getattr(sys, "frozen", False):
+        return [sys.executable, *args]
+    return [sys.executable, "-m", "lazy.cli", *args]
+
+NDJSON_SCHEMA_VERSION = 1
+
+def print_ndjson(record):
+    """以 NDJSON 格式输出一条记录并立即刷新，供流式输出使用。"""
+    print(json_codec.dumps_str(record), flush=True)
+
+class JSONRecordWriter:
+    """列表类命令的 `--json` / `--ndjson` 输出。
+
+    `--json` 时汇总全部记录，结束时按 `print_with_json` 的格式一次性输出；
+    `--ndjson` 时首行输出 schema 头，之后每条记录产生后立即输出一行，不在内存中保留。
+    schema 头在第一次输出时才写出，因此请求阶段的报错仍然只有一行 `print_with_json` 的错误对象。
+    """
+    def __init__(self, description: str, ndjson: bool, fields: tuple[str, ...] = ()):
+        self.description = description
+        self.ndjson = ndjson
+        self.fields = fields
+        self.records = []
+        self.header_written = False
+
+    def write_header(self):
+        if self.header_written:
+            return
+        self.header_written = True
+        print_ndjson({
+            "schema": NDJSON_SCHEMA_VERSION,
+            "description": self.description,
+            "fields": list(self.fields)
+        })
+
+    def write(self, record):
+        if self.ndjson:
+            self.write_header()
+            print_ndjson(record)
+        else:
+            self.records.append(record)
+
+    def close(self, description: str|None = None):
+        """结束输出。给出 `description` 表示没有结果，`--json` 下输出该描述，`--ndjson` 下只输出 schema 头。"""
+        if self.ndjson:
+            self.write_header()
+            return
+
+        if description != None:
+            print_with_json(True, description)
+            return
+
+        print_with_json(True, self.description, self.records)
+
+    def fail(self, description: str):
+        """部分结果缺失时结束输出：`--json` 下以 `"status": false` 输出已有的记录，`--ndjson` 下在已输出的记录之后追加一行错误对象。"""
+        if self.ndjson:
+            self.write_header()
+            print_with_json(False, description)
+            return
+
+        print_with_json(False, description, self.records)
 
 def transform_time(time: str|None)->str:
     if time:
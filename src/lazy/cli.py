@@ -1,10 +1,13 @@
 from .CLI.CLI import app
-from .core.printlog.print_log import setup_global_logging
+from .core.printlog.print_log import load_studentid_hash, setup_global_logging
+from .core.printlog.structured import log_context
 
 
 def main():
     setup_global_logging()
-    app()
+    # 本次调用的全部日志共用一个 request_id，并带上最近一次登录的学号摘要
+    with log_context(studentid_hash=load_studentid_hash()):
+        app()
 
 
 if __name__ == "__main__":
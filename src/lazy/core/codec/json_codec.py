@@ -0,0 +1,141 @@
+"""可插拔的 JSON 编解码层。
+
+按 orjson > msgspec > 标准库 json 的顺序自动选择后端，也可通过环境变量
+`LAZY_JSON_BACKEND` 强制指定。所有后端对外行为保持一致：
+- `dumps` 返回 UTF-8 bytes，不转义非 ASCII 字符；
+- datetime 统一序列化为 ISO 8601 字符串，数据类序列化为对象；
+- `indent=True` 时统一由标准库输出 4 空格缩进，写入的配置文件与所装后端无关；
+- 超过 `OFFLOAD_THRESHOLD` 的载荷在 `*_async` 中放到工作线程处理，避免阻塞事件循环。
+"""
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+from collections.abc import Callable
+from datetime import date, datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+OFFLOAD_THRESHOLD = 256 * 1024
+
+
+def _default(obj):
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, datetime | date):
+        return obj.isoformat()
+    if isinstance(obj, set | frozenset):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    # orjson 只支持 2 空格缩进，msgspec.json.format 的空容器与分隔符也与标准库不同，缩进输出都走标准库
+    return json.dumps(obj, ensure_ascii=False, indent=4, default=_default).encode("utf-8")
+
+
+def _stdlib_backend():
+    def loads(data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return _dumps_indented(obj)
+        return json.dumps(obj, ensure_ascii=False, default=_default).encode("utf-8")
+
+    return loads, dumps, json.JSONDecodeError
+
+
+def _orjson_backend():
+    import orjson
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return _dumps_indented(obj)
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+    return orjson.loads, dumps, orjson.JSONDecodeError
+
+
+def _msgspec_backend():
+    import msgspec
+
+    encoder = msgspec.json.Encoder(enc_hook=_default)
+    decoder = msgspec.json.Decoder()
+
+    def dumps(obj: Any, indent: bool = False) -> bytes:
+        if indent:
+            return _dumps_indented(obj)
+        return encoder.encode(obj)
+
+    return decoder.decode, dumps, msgspec.DecodeError
+
+
+_BACKENDS: dict[str, Callable] = {
+    "orjson": _orjson_backend,
+    "msgspec": _msgspec_backend,
+    "json": _stdlib_backend,
+}
+
+BACKEND: str = "json"
+JSONDecodeError: type[Exception] = json.JSONDecodeError
+_loads: Callable[[bytes | str], Any] = json.loads
+_dumps: Callable[..., bytes] = _stdlib_backend()[1]
+
+
+def set_backend(name: str) -> str:
+    """切换 JSON 后端，返回实际生效的后端名称。"""
+    global BACKEND, JSONDecodeError, _loads, _dumps
+
+    factory = _BACKENDS.get(name)
+    if factory == None:
+        raise ValueError(f"未知的 JSON 后端: {name}")
+
+    _loads, _dumps, JSONDecodeError = factory()
+    BACKEND = name
+    return BACKEND
+
+
+def _select_default_backend():
+    forced = os.environ.get("LAZY_JSON_BACKEND")
+    candidates = [forced] if forced else ["orjson", "msgspec"]
+    for name in candidates:
+        try:
+            set_backend(name)
+            return
+        except ImportError:
+            continue
+        except ValueError as e:
+            logger.warning(f"{e}，回退到标准库 json")
+    set_backend("json")
+
+
+_select_default_backend()
+
+
+def loads(data: bytes | str) -> Any:
+    return _loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    return _dumps(obj, indent)
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    return _dumps(obj, indent).decode("utf-8")
+
+
+async def loads_async(data: bytes | str) -> Any:
+    """载荷超过阈值时在工作线程中解码。"""
+    if len(data) >= OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(_loads, data)
+    return _loads(data)
+
+
+async def dumps_async(obj: Any, size_hint: int = 0, indent: bool = False) -> bytes:
+    """`size_hint` 为预估的输出大小（通常是原始响应长度），超过阈值时在工作线程中编码。"""
+    if size_hint >= OFFLOAD_THRESHOLD:
+        return await asyncio.to_thread(_dumps, obj, indent)
+    return _dumps(obj, indent)
@@ -1,3 +1,6 @@
+from functools import lru_cache
+
+
 class RSAKeyPython:
     def __init__(self, public_exponent_hex: str, modulus_hex: str):
         """
@@ -25,6 +28,13 @@ class RSAKeyPython:
         elif self.chunkSize <= 0 and self.m <= 0xFFFF and self.m != 0 : 
              pass
 
+@lru_cache(maxsize=16)
+def get_rsa_key(public_exponent_hex: str, modulus_hex: str) -> RSAKeyPython:
+    """
+    按公钥指数和模数缓存解析后的 RSA 密钥对象，同一公钥只解析一次。
+    """
+    return RSAKeyPython(public_exponent_hex, modulus_hex)
+
 def encrypted_string_python(key: RSAKeyPython, s: str) -> str:
     """
     使用给定的 RSA 密钥加密字符串 s。
@@ -33,50 +43,37 @@ def encrypted_string_python(key: RSAKeyPython, s: str) -> str:
     因为JS代码 `a[i] = s.charCodeAt(i)` 后，这些值被用于构建16位数字单元
     `a[k] | (a[k+1] << 8)`，这隐含了a[k]和a[k+1]是字节。
     """
-    char_codes = []
-    for char_in_s in s:
-        code = ord(char_in_s)
-        if not (0 <= code <= 255):
-            raise ValueError(
-                f"Character '{char_in_s}' with ord() value {code} is outside the "
-                "byte range (0-255). The RSA encryption logic in the provided "
-                "JavaScript expects character codes that fit into byte-sized "
-                "components for block construction."
-            )
-        char_codes.append(code)
+    try:
+        # latin-1 把每个字符映射为与 ord() 相同的单个字节
+        data = s.encode("latin-1")
+    except UnicodeEncodeError as e:
+        char_in_s = s[e.start]
+        raise ValueError(
+            f"Character '{char_in_s}' with ord() value {ord(char_in_s)} is outside the "
+            "byte range (0-255). The RSA encryption logic in the provided "
+            "JavaScript expects character codes that fit into byte-sized "
+            "components for block construction."
+        ) from None
 
     if key.chunkSize == 0:
-        if not char_codes: 
+        if not data: 
             return ""      
         
         raise ValueError(
             "key.chunkSize is 0. This typically means the RSA modulus is too small "
             "(<= 16 bits or 0xFFFF), making encryption impossible with this scheme."
         )
-    
-    current_len = len(char_codes)
-    padding_count = 0
-    if current_len % key.chunkSize != 0:
-        padding_count = key.chunkSize - (current_len % key.chunkSize)
-    
-    char_codes.extend([0] * padding_count)
-    al = len(char_codes)
+
+    # 补零到 chunkSize 的整数倍
+    padding_count = -len(data) % key.chunkSize
+    blocks = memoryview(data + bytes(padding_count))
+
     result_parts = []
-    for i in range(0, al, key.chunkSize):
-        current_block_bytes_source = char_codes[i : i + key.chunkSize]
-        block_int = int.from_bytes(bytes(current_block_bytes_source), byteorder='little')
+    for i in range(0, len(blocks), key.chunkSize):
+        block_int = int.from_bytes(blocks[i : i + key.chunkSize], byteorder='little')
         encrypted_int = pow(block_int, key.e, key.m)
-        hex_text: str
-        if encrypted_int == 0:
-            num_16bit_digits_crypt = 1 
-        else:
-            num_16bit_digits_crypt = (encrypted_int.bit_length() + 15) // 16
-        
-        expected_hex_len = num_16bit_digits_crypt * 4 
-        hex_text = format(encrypted_int, f'0{expected_hex_len}x') 
-        result_parts.append(hex_text)
-    
-    if not result_parts: 
-        return ""
-    
+        # 按 16 位数字单元补齐十六进制位数，加密结果为 0 时仍输出一个单元
+        expected_hex_len = max(1, (encrypted_int.bit_length() + 15) // 16) * 4
+        result_parts.append(format(encrypted_int, f'0{expected_hex_len}x'))
+
     return " ".join(result_parts)
@@ -1,11 +1,16 @@
 import abc
+import hashlib
 import json
 import logging
+import os
 import sys
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
+from ..codec import json_codec
 from .load_config import lazyBackupConfig, logBackupConfig, userBackupConfig
 
 logger = logging.getLogger(__name__)
@@ -21,129 +26,198 @@ def resource_path(relative_path: str|Path = "") -> Path:
     
     return base_path / relative_path
 
+# 压缩方式，zstd 需要 Python 3.14 及以上的 zipfile
+COMPRESSION_METHODS: dict[str, int|None] = {
+    "deflate": zipfile.ZIP_DEFLATED,
+    "zstd": getattr(zipfile, "ZIP_ZSTANDARD", None),
+    "store": zipfile.ZIP_STORED
+}
+DEFAULT_COMPRESSION = "deflate"
+# 记录每个压缩包上次导出时各文件的 sha256，供增量导出比较
+EXPORT_STATE_PATH = Path.home() / ".lazy_cli_export_state.json"
+MANIFEST_NAME = "mainfest.json"
+HASH_WORKERS = min(8, os.cpu_count() or 1)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def resolve_compression(name: str)->int:
+    """返回 zipfile 的压缩方式常量，当前 Python 不支持 zstd 时退回 deflate；名称无效时抛出 ValueError"""
+    if name not in COMPRESSION_METHODS:
+        raise ValueError(f"不支持的压缩方式: {name}")
+
+    method = COMPRESSION_METHODS[name]
+    if method == None:
+        logger.warning(f"当前 Python 不支持 {name} 压缩，改用 {DEFAULT_COMPRESSION}")
+        return COMPRESSION_METHODS[DEFAULT_COMPRESSION]
+    return method
+
+def file_sha256(path: Path)->str:
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+def hash_files(paths: list[Path])->list[str]:
+    """并发计算文件的 sha256，按 paths 的顺序返回"""
+    if len(paths) < 2:
+        return [file_sha256(path) for path in paths]
+
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        return list(executor.map(file_sha256, paths))
+
+def load_export_state(output: Path)->dict[str, str]:
+    try:
+        state = json_codec.loads(EXPORT_STATE_PATH.read_bytes())
+    except (OSError, json_codec.JSONDecodeError):
+        return {}
+    return state.get(str(output.resolve()), {})
+
+def save_export_state(output: Path, hashes: dict[str, str]):
+    try:
+        state = json_codec.loads(EXPORT_STATE_PATH.read_bytes())
+    except (OSError, json_codec.JSONDecodeError):
+        state = {}
+
+    state[str(output.resolve())] = hashes
+    EXPORT_STATE_PATH.write_bytes(json_codec.dumps(state))
+
+@dataclass(slots=True)
+class ArchiveEntry:
+    path: Path
+    # 压缩包内的路径，同时作为 mainfest 中的 original_path
+    arcname: str
+
+class ArchiveBuilder:
+    """流式写入 zip 压缩包：文件按块读取并压缩，mainfest 直接写入压缩包，不产生临时文件。
+
+    压缩包先写入同目录下的 .tmp 文件，完成后再替换，写入中途出错不会留下不完整的压缩包。
+    增量导出时只写入与上次导出相比新增或内容变化的文件，mainfest 中记录全部文件的 sha256。
+    """
+    def __init__(self, output: Path, compression: str = DEFAULT_COMPRESSION, incremental: bool = False):
+        self.output = Path(output)
+        self.compression = compression
+        self.compress_type = resolve_compression(compression)
+        self.incremental = incremental
+
+    def archive_path(self)->Path:
+        """增量导出另存为带时间戳的压缩包，不覆盖上次的完整导出"""
+        if not self.incremental:
+            return self.output
+        return self.output.with_name(f"{self.output.stem}-incremental-{datetime.now().strftime('%Y%m%d-%H%M%S')}{self.output.suffix}")
+
+    def build(self, entries: list[ArchiveEntry])->Path|None:
+        """写入压缩包并返回其路径；增量导出且没有文件变化时不写入，返回 None"""
+        hashes = dict(zip((entry.arcname for entry in entries), hash_files([entry.path for entry in entries]), strict=True))
+
+        previous = load_export_state(self.output) if self.incremental else {}
+        changed = [entry for entry in entries if previous.get(entry.arcname) != hashes[entry.arcname]]
+        if self.incremental and not changed:
+            logger.info(f"自上次导出后没有文件变化，跳过 {self.output}")
+            return None
+
+        mainfest = {
+            "backup_time": datetime.now().strftime('%Y-%m-%d'),
+            "compression": self.compression,
+            "incremental": self.incremental,
+            "files": [
+                dict(
+                    archive_path=entry.path.name,
+                    original_path=entry.arcname,
+                    sha256=hashes[entry.arcname]
+                ) for entry in changed
+            ],
+            "hashes": hashes
+        }
+
+        archive_path = self.archive_path()
+        temp_path = archive_path.with_name(archive_path.name + ".tmp")
+        try:
+            with zipfile.ZipFile(temp_path, 'w', compression=self.compress_type) as zf:
+                for entry in changed:
+                    logger.info(f"正在备份 {entry.path}")
+                    zf.write(entry.path, arcname=entry.arcname)
+
+                zf.writestr(MANIFEST_NAME, json_codec.dumps(mainfest, indent=True))
+            os.replace(temp_path, archive_path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        save_export_state(self.output, hashes)
+        logger.info(f"已写入 {len(changed)}/{len(entries)} 个文件: {archive_path}")
+        return archive_path
+
 # 文件备份抽象基类
 class BaseFileBackupHandler(metaclass=abc.ABCMeta):
-    @abc.abstractmethod
-    def backup(self):
-        pass
-
-# 日志文件备份
-class logFileHandler(BaseFileBackupHandler):
-    def __init__(self, 
+    def __init__(self,
                  paths: list[str|Path],
-                 output: str|Path = None):
+                 output: str|Path = None,
+                 compression: str = DEFAULT_COMPRESSION,
+                 incremental: bool = False):
         if output is None:
             output = Path.home()
-        self.paths: list[Path] = list(map(lambda path: Path.home() / path, paths))
-        self.output = output
-        self.log_paths = []
+        self.paths: list[Path] = list(map(resource_path, paths))
+        self.output = Path(output)
+        self.compression = compression
+        self.incremental = incremental
 
-        for path in self.paths:
-            logs_to_zip = path.glob("lazy_cli.log*")
-            self.log_paths.extend(logs_to_zip)
+    @abc.abstractmethod
+    def entries(self)->list[ArchiveEntry]:
+        pass
 
     def backup(self)->bool:
         try:
-            with zipfile.ZipFile(self.output, 'w') as zf:
-                for path in self.log_paths:
-                    zf.write(path)
-
+            archive = ArchiveBuilder(self.output, self.compression, self.incremental).build(self.entries())
         except Exception as e:
             logger.error(f"备份出错！{e}")
             return False
-        
-        logger.info(f"日志备份完成，保存位置: {self.output}")
+
+        if archive != None:
+            logger.info(f"{self.description}备份完成，保存位置: {archive}")
         return True
 
-# lazy文件备份
-class LazyFileHandler(BaseFileBackupHandler):
-    def __init__(self, 
-                 paths: list[str|Path],
-                 output: str|Path = None):
-        if output is None:
-            output = Path.home()
-        self.base_path = resource_path()
-        self.paths: list[Path] = list(map(resource_path, paths))
-        self.output = output
+# 日志文件备份
+class logFileHandler(BaseFileBackupHandler):
+    description = "日志"
 
-    def backup(self)->bool:
-        try:
-            with open(resource_path("mainfest.json"), 'w') as f:
-                mainfest = {
-                    "backup_time": datetime.now().strftime('%Y-%m-%d'),
-                    "files": [
-                        dict(
-                            archive_path=path.name,
-                            original_path=str(path.relative_to(self.base_path))
-                        ) for path in self.paths
-                    ]
-                }
-
-                f.write(json.dumps(mainfest))
-
-            with zipfile.ZipFile(self.output, 'w') as zf:
-                for path in self.paths:
-                    logger.info(f"正在备份 {path}")
-                    zf.write(path, arcname=path.relative_to(self.base_path))
-
-                zf.write(resource_path("mainfest.json"), arcname="mainfest.json")
+    def __init__(self, paths: list[str|Path], output: str|Path = None, **kwargs):
+        super().__init__([], output, **kwargs)
+        self.paths: list[Path] = list(map(lambda path: Path.home() / path, paths))
+        self.log_paths = []
 
-        except Exception as e:
-            logger.error(f"备份出错！{e}")
-            return False
-        
-        logger.info(f"应用配置备份完成，保存位置: {self.output}")
-        return True
+        for path in self.paths:
+            # 文本日志与 JSON 日志（lazy_cli.jsonl），含轮转后的文件
+            logs_to_zip = [*path.glob("lazy_cli.log*"), *path.glob("lazy_cli.jsonl*")]
+            self.log_paths.extend(logs_to_zip)
 
-# 用户文件备份
-class LazyUserFileHandler(BaseFileBackupHandler):
-    def __init__(self, 
-                 paths: list[str|Path],
-                 output: str|Path = None):
-        if output is None:
-            output = Path.home()
-        self.base_path = resource_path()
-        self.paths: list[Path] = list(map(resource_path, paths))
-        self.output = output
+    def entries(self)->list[ArchiveEntry]:
+        return [ArchiveEntry(path, path.relative_to(Path.home()).as_posix()) for path in self.log_paths]
 
-    def backup(self)->bool:
-        try:
-            with open(resource_path("mainfest.json"), 'w') as f:
-                mainfest = {
-                    "backup_time": datetime.now().strftime('%Y-%m-%d'),
-                    "files": [
-                        dict(
-                            archive_path=path.name,
-                            original_path=str(path.relative_to(self.base_path))
-                        ) for path in self.paths
-                    ]
-                }
-
-                f.write(json.dumps(mainfest))
-
-            with zipfile.ZipFile(self.output, 'w') as zf:
-                for path in self.paths:
-                    logger.info(f"正在备份 {path}")
-                    zf.write(path, arcname=path.relative_to(self.base_path))
-
-                zf.write(resource_path("mainfest.json"), arcname="mainfest.json")
+# lazy文件备份
+class LazyFileHandler(BaseFileBackupHandler):
+    description = "应用配置"
 
-        except Exception as e:
-            logger.error(f"备份出错！{e}")
-            return False
-        
-        logger.info(f"用户配置备份完成，保存位置: {self.output}")
-        return True
+    def entries(self)->list[ArchiveEntry]:
+        base_path = resource_path()
+        return [ArchiveEntry(path, path.relative_to(base_path).as_posix()) for path in self.paths]
+
+# 用户文件备份
+class LazyUserFileHandler(LazyFileHandler):
+    description = "用户配置"
 
 class BackupManager:
     def __init__(self,
-                 output_dir: str|Path = None):
+                 output_dir: str|Path = None,
+                 compression: str = DEFAULT_COMPRESSION,
+                 incremental: bool = False):
         if output_dir is None:
             output_dir = Path.home()
         self.user_backup_config = userBackupConfig().load_config()
         self.lazy_backup_config = lazyBackupConfig().load_config()
         self.log_backup_config = logBackupConfig().load_config()
-        self.output_dir = output_dir
+        self.output_dir = Path(output_dir)
+        self.compression = compression
+        self.incremental = incremental
 
     def run_for_user(self):
         for task in self.user_backup_config["tasks"]:
@@ -154,7 +228,7 @@ class BackupManager:
             cls = globals().get(class_name)
 
             if cls:
-                instance = cls(sources_list, output)
+                instance = cls(sources_list, output, compression=self.compression, incremental=self.incremental)
                 if not instance.backup():
                     break
             else:
@@ -174,7 +248,7 @@ class BackupManager:
             cls = globals().get(class_name)
 
             if cls:
-                instance = cls(sources_list, output)
+                instance = cls(sources_list, output, compression=self.compression, incremental=self.incremental)
                 if not instance.backup():
                     break
             else:
@@ -194,7 +268,7 @@ class BackupManager:
             cls = globals().get(class_name)
 
             if cls:
-                instance = cls(sources_list, output)
+                instance = cls(sources_list, output, compression=self.compression, incremental=self.incremental)
                 if not instance.backup():
                     break
             else:
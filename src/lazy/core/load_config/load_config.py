@@ -1,8 +1,9 @@
-import json
 import logging
 import sys
 from pathlib import Path
 
+from ..codec import json_codec
+
 logger = logging.getLogger(__name__)
 
 def resource_path(relative_path: str) -> Path:
@@ -36,12 +37,11 @@ class BaseConfig:
         config = None
         # print(self.config_path)
         try:
-            with open(self.config_path) as f:
-                config = json.load(f)
+            config = json_codec.loads(self.config_path.read_bytes())
             logger.info(f"配置文件 '{self.config_name}'加载成功",)
         except FileNotFoundError:
             logger.warning(f"配置文件 '{self.config_name}' 未找到！",)
-        except json.JSONDecodeError: # 处理 JSON 格式错误
+        except json_codec.JSONDecodeError: # 处理 JSON 格式错误
             logger.warning(f"配置文件 '{self.config_name}' 可能为空！",)
         except OSError as e: # 捕获其他 IO 错误
             logger.warning(f"配置读取失败，IO错误: {e}",)
@@ -69,8 +69,7 @@ class BaseConfig:
         self.config_parent_dir_path.mkdir(parents = True, exist_ok = True)
         logger.info(f"配置文件{self.config_name}更新中中...",)
         try:
-            with open(self.config_path, "w", encoding='utf-8') as f: # 推荐添加 encoding
-                json.dump(config_data, f, indent=4, ensure_ascii=False)
+            self.config_path.write_bytes(json_codec.dumps(config_data, indent=True))
             
             logger.info(f"{self.config_name}配置更新成功，路径{self.config_path}",)
 
@@ -137,3 +136,7 @@ class rollcallSiteConfig(BaseConfig):
         super().__init__("", "rollcall_site.json")
         if not self.config_path.exists():
             self.config_path.touch()
+
+class assignmentTypeIndexConfig(BaseConfig):
+    def __init__(self):
+        super().__init__("all_api_data/user_index", "assignment_type_index.json")
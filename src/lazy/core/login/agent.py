@@ -0,0 +1,163 @@
+"""本地会话代理，在内存中保存解密后的 Cookies。
+
+与 ssh-agent 类似，代理进程运行期间，`CredentialManager.load_cookies` 会优先通过 Unix 套接字向代理索取 Cookies，
+无需每次都访问 keyring 并解密会话文件。代理只在 Cookies 与会话文件一致时才会被采用：
+应答中带有会话文件的签名（修改时间与大小），与当前文件不符时退回到本地解密。
+
+协议为一行一个 JSON 请求、一行一个 JSON 应答：
+
+- `{"op": "get"}` -> `{"ok": true, "cookies": {...}|null, "signature": [...]|null}`
+- `{"op": "set", "cookies": {...}, "signature": [...]}` -> `{"ok": true}`
+- `{"op": "status"}` -> `{"ok": true, "pid": ..., "expires_in": ...}`
+- `{"op": "stop"}` -> `{"ok": true}`
+
+代理在最近一次写入 Cookies 后 `ttl` 秒自动退出。
+
+套接字位于临时目录下，其他本地用户可能抢先创建同名目录或套接字。连接与启动之前都会检查
+目录与套接字属于当前用户、且组与其他用户没有任何权限，不满足时拒绝使用代理。
+"""
+import asyncio
+import logging
+import os
+import socket
+import stat
+import tempfile
+import time
+from pathlib import Path
+
+from ..codec import json_codec
+
+logger = logging.getLogger(__name__)
+
+AGENT_SUPPORTED = hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+AGENT_SOCKET_ENV = "LAZY_AGENT_SOCK"
+AGENT_DEFAULT_TTL = 15 * 60
+# 客户端等待代理应答的上限，代理无响应时应尽快退回到本地解密
+AGENT_TIMEOUT = 0.5
+
+def agent_socket_path()->Path:
+    if os.environ.get(AGENT_SOCKET_ENV):
+        return Path(os.environ[AGENT_SOCKET_ENV])
+    return Path(tempfile.gettempdir()) / f"lazy-agent-{os.getuid()}" / "agent.sock"
+
+def is_private(path: Path, file_type: int)->bool:
+    """path 为指定类型（不跟随符号链接）、属于当前用户，且组与其他用户没有任何权限"""
+    try:
+        st = path.lstat()
+    except OSError:
+        return False
+
+    if stat.S_IFMT(st.st_mode) != file_type:
+        logger.warning(f"会话代理: {path} 类型不符，拒绝使用")
+        return False
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        logger.warning(f"会话代理: {path} 不属于当前用户或权限过宽 ({stat.filemode(st.st_mode)})，拒绝使用")
+        return False
+    return True
+
+def request(message: dict)->dict|None:
+    """向代理发送一条请求，代理不存在、套接字不安全或出错时返回 None。"""
+    if not AGENT_SUPPORTED:
+        return None
+
+    path = agent_socket_path()
+    if not path.exists():
+        return None
+    if not (is_private(path.parent, stat.S_IFDIR) and is_private(path, stat.S_IFSOCK)):
+        return None
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(AGENT_TIMEOUT)
+            conn.connect(str(path))
+            conn.sendall(json_codec.dumps(message) + b"\n")
+
+            buffer = b""
+            while not buffer.endswith(b"\n"):
+                chunk = conn.recv(65536)
+                if not chunk:
+                    break
+                buffer += chunk
+        reply = json_codec.loads(buffer)
+    except (OSError, json_codec.JSONDecodeError) as e:
+        logger.info(f"会话代理请求失败: {e}")
+        return None
+
+    if not isinstance(reply, dict) or not reply.get("ok"):
+        return None
+    return reply
+
+class SessionAgent:
+    def __init__(self, cookies: dict|None, signature: list|None, ttl: float = AGENT_DEFAULT_TTL):
+        self.cookies = cookies
+        self.signature = signature
+        self.ttl = ttl
+        self.expires_at = time.monotonic() + ttl
+        self._stopped = asyncio.Event()
+
+    def handle(self, message: dict)->dict:
+        if not isinstance(message, dict):
+            return {"ok": False}
+
+        op = message.get("op")
+        if op == "get":
+            return {"ok": True, "cookies": self.cookies, "signature": self.signature}
+
+        if op == "set":
+            self.cookies = message.get("cookies")
+            self.signature = message.get("signature")
+            self.expires_at = time.monotonic() + self.ttl
+            logger.info("会话代理: Cookies已更新")
+            return {"ok": True}
+
+        if op == "status":
+            return {
+                "ok": True,
+                "pid": os.getpid(),
+                "has_cookies": self.cookies != None,
+                "expires_in": round(self.expires_at - time.monotonic(), 1)
+            }
+
+        if op == "stop":
+            self._stopped.set()
+            return {"ok": True}
+
+        return {"ok": False}
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line = await reader.readline()
+            try:
+                reply = self.handle(json_codec.loads(line))
+            except json_codec.JSONDecodeError:
+                reply = {"ok": False}
+            writer.write(json_codec.dumps(reply) + b"\n")
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, path: Path):
+        # 套接字目录仅当前用户可访问；目录已存在时必须是当前用户自己的目录
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        if not is_private(path.parent, stat.S_IFDIR):
+            raise PermissionError(f"套接字目录 {path.parent} 不安全，拒绝启动会话代理")
+        path.unlink(missing_ok=True)
+
+        server = await asyncio.start_unix_server(self._on_connect, path=str(path))
+        os.chmod(path, 0o600)
+        logger.info(f"会话代理已启动: {path}, pid {os.getpid()}")
+
+        try:
+            async with server:
+                while not self._stopped.is_set():
+                    remaining = self.expires_at - time.monotonic()
+                    if remaining <= 0:
+                        logger.info("会话代理已过期，退出")
+                        break
+                    try:
+                        await asyncio.wait_for(self._stopped.wait(), timeout=remaining)
+                    except TimeoutError:
+                        continue
+        finally:
+            path.unlink(missing_ok=True)
+            logger.info("会话代理已停止")
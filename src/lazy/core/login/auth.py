@@ -0,0 +1,73 @@
+"""会话失效时自动重新登录的 httpx 认证流程。
+
+请求照常发出，不预先验证会话；响应为 401，或请求学在浙大却被重定向到统一身份认证时，
+视为会话失效：调用 `relogin` 重新登录，并以新的 Cookies 重发原请求一次。
+并发请求同时失效时只会重新登录一次，其余请求等待后直接重发。
+"""
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from contextvars import ContextVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+ZJUAM_HOST = "zjuam.zju.edu.cn"
+
+# 重新登录过程中发出的请求本身会经过统一身份认证，不应再次触发重新登录
+_relogging: ContextVar[bool] = ContextVar("relogging", default=False)
+
+def is_auth_failure(request: httpx.Request, response: httpx.Response)->bool:
+    if response.status_code == 401:
+        return True
+    return response.url.host == ZJUAM_HOST and request.url.host != ZJUAM_HOST
+
+class SessionAuth(httpx.Auth):
+    def __init__(self, relogin: Callable[[], Awaitable[httpx.Cookies|None]]):
+        """
+        Parameters
+        ----------
+        relogin : Callable[[], Awaitable[httpx.Cookies | None]]
+            重新登录并返回新的 Cookies，失败时返回 None
+        """
+        self._relogin = relogin
+        self._lock = asyncio.Lock()
+        self._generation = 0
+        self._cookies: httpx.Cookies|None = None
+        self.failed = False
+
+    async def async_auth_flow(self, request: httpx.Request):
+        generation = self._generation
+        response = yield request
+
+        if _relogging.get() or self.failed or not is_auth_failure(request, response):
+            return
+
+        async with self._lock:
+            if self.failed:
+                return
+            # 等待期间其他请求已完成重新登录
+            if generation == self._generation:
+                logger.info(f"会话已失效 ({request.method} {request.url.path})，尝试重新登录...")
+                token = _relogging.set(True)
+                try:
+                    self._cookies = await self._relogin()
+                finally:
+                    _relogging.reset(token)
+
+                if self._cookies == None:
+                    # 重新登录失败后不再重试，交由调用方处理失效的响应
+                    self.failed = True
+                    logger.error("重新登录失败！")
+                    return
+                self._generation += 1
+
+        await response.aread()
+        request.headers.pop("Cookie", None)
+        self._cookies.set_cookie_header(request)
+        logger.info(f"已重新登录，重发请求 {request.method} {request.url.path}")
+        yield request
+
+    def sync_auth_flow(self, request: httpx.Request):
+        raise RuntimeError("SessionAuth 只能用于 httpx.AsyncClient")
@@ -0,0 +1,188 @@
+"""版本化的二进制 Cookies 文件，CLI 与 lazy-server 共用。
+
+一个文件可保存多条记录（CLI 只有一条 `default`，服务端按学号各一条），每条记录单独以 Fernet 加密。
+文件头后是明文索引，记录每条记录的保存时间、最早过期时间以及密文的位置：
+读取某个用户的 Cookies 时只解密这一条记录，判断 Cookies 是否过期则只需读取索引，无需解密，也无需联网。
+
+文件布局（小端）::
+
+    header: magic "LZCJ" | version u8 | flags u8 | count u16
+    entry:  key_length u16 | saved_at i64 | expires_at i64 | offset u32 | length u32 | key (UTF-8)
+    ...
+    payload: Fernet(JSON [[name, value, domain, path, expires], ...])
+    ...
+
+expires_at 为 0 表示记录中的 Cookies 都是会话 Cookies，过期时间未知。
+"""
+import logging
+import os
+import struct
+import time
+from dataclasses import dataclass
+from http.cookiejar import CookieJar
+from pathlib import Path
+
+import httpx
+from cryptography.fernet import Fernet
+
+from ..codec import json_codec
+
+logger = logging.getLogger(__name__)
+
+JAR_MAGIC = b"LZCJ"
+JAR_VERSION = 1
+
+_HEADER = struct.Struct("<4sBBH")
+_ENTRY = struct.Struct("<HqqII")
+
+class CookieJarFormatError(ValueError):
+    """文件不是 Cookies 文件，或版本高于当前支持的版本"""
+
+@dataclass(slots=True, frozen=True)
+class CookieRecord:
+    name: str
+    value: str
+    domain: str = ""
+    path: str = "/"
+    expires: int | None = None
+
+@dataclass(slots=True, frozen=True)
+class JarEntry:
+    key: str
+    saved_at: int
+    expires_at: int | None
+    offset: int
+    length: int
+
+    def is_expired(self, now: float | None = None)->bool:
+        """记录中最早过期的 Cookie 是否已过期；全部为会话 Cookies 时无法判断，返回 False"""
+        if self.expires_at == None:
+            return False
+        return self.expires_at <= (time.time() if now == None else now)
+
+def cookie_records(cookies: httpx.Cookies | CookieJar | dict)->list[CookieRecord]:
+    """把 httpx 的 Cookies、CookieJar 或 名称 -> 值 的字典转换为记录，前两者保留域名、路径与过期时间"""
+    if isinstance(cookies, httpx.Cookies):
+        cookies = cookies.jar
+
+    if isinstance(cookies, CookieJar):
+        return [
+            CookieRecord(cookie.name, cookie.value or "", cookie.domain, cookie.path, cookie.expires)
+            for cookie in cookies
+        ]
+
+    return [CookieRecord(name, value) for name, value in cookies.items()]
+
+def cookies_to_dict(records: list[CookieRecord])->dict[str, str]:
+    return {record.name: record.value for record in records}
+
+class CookieJarFile:
+    def __init__(self, path: Path, fernet: Fernet | None = None):
+        # 只读取索引时无需密钥
+        self.path = path
+        self._fernet = fernet
+
+    def read_index(self)->dict[str, JarEntry]:
+        """只读取文件头与索引。文件不存在时返回空索引，格式不符时抛出 CookieJarFormatError"""
+        try:
+            with open(self.path, "rb") as f:
+                return self._read_index(f)
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def _read_index(f)->dict[str, JarEntry]:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise CookieJarFormatError("文件头不完整")
+
+        magic, version, _, count = _HEADER.unpack(header)
+        if magic != JAR_MAGIC:
+            raise CookieJarFormatError("不是 Cookies 文件")
+        if version > JAR_VERSION:
+            raise CookieJarFormatError(f"不支持的版本 {version}")
+
+        index = {}
+        for _ in range(count):
+            raw_entry = f.read(_ENTRY.size)
+            if len(raw_entry) < _ENTRY.size:
+                raise CookieJarFormatError("索引不完整")
+            key_length, saved_at, expires_at, offset, length = _ENTRY.unpack(raw_entry)
+            key = f.read(key_length).decode()
+            index[key] = JarEntry(key, saved_at, expires_at or None, offset, length)
+
+        return index
+
+    def entry(self, key: str)->JarEntry | None:
+        return self.read_index().get(key)
+
+    def load(self, key: str)->list[CookieRecord] | None:
+        """只解密指定的一条记录，记录不存在时返回 None；密钥不符时抛出 InvalidToken"""
+        try:
+            with open(self.path, "rb") as f:
+                entry = self._read_index(f).get(key)
+                if entry == None:
+                    return None
+                f.seek(entry.offset)
+                token = f.read(entry.length)
+        except FileNotFoundError:
+            return None
+
+        return [CookieRecord(*fields) for fields in json_codec.loads(self._fernet.decrypt(token))]
+
+    def save(self, key: str, cookies: httpx.Cookies | CookieJar | dict):
+        self.save_many({key: cookies})
+
+    def save_many(self, cookies_map: dict[str, httpx.Cookies | CookieJar | dict]):
+        """写入多条记录，整个文件只重写一次"""
+        # 其余记录原样保留密文，无需解密
+        tokens = self._read_tokens()
+        saved_at = int(time.time())
+        for key, cookies in cookies_map.items():
+            records = cookie_records(cookies)
+            expires = [record.expires for record in records if record.expires != None]
+            token = self._fernet.encrypt(json_codec.dumps([
+                [record.name, record.value, record.domain, record.path, record.expires]
+                for record in records
+            ]))
+            tokens[key] = (saved_at, min(expires) if expires else 0, token)
+        self._write(tokens)
+
+    def remove(self, key: str)->bool:
+        tokens = self._read_tokens()
+        if tokens.pop(key, None) == None:
+            return False
+        self._write(tokens)
+        return True
+
+    def _read_tokens(self)->dict[str, tuple[int, int, bytes]]:
+        try:
+            with open(self.path, "rb") as f:
+                index = self._read_index(f)
+                tokens = {}
+                for entry in index.values():
+                    f.seek(entry.offset)
+                    tokens[entry.key] = (entry.saved_at, entry.expires_at or 0, f.read(entry.length))
+                return tokens
+        except FileNotFoundError:
+            return {}
+
+    def _write(self, tokens: dict[str, tuple[int, int, bytes]]):
+        encoded_keys = {key: key.encode() for key in tokens}
+        offset = _HEADER.size + sum(_ENTRY.size + len(encoded) for encoded in encoded_keys.values())
+
+        index_parts = [_HEADER.pack(JAR_MAGIC, JAR_VERSION, 0, len(tokens))]
+        payload_parts = []
+        for key, (saved_at, expires_at, token) in tokens.items():
+            index_parts.append(_ENTRY.pack(len(encoded_keys[key]), saved_at, expires_at, offset, len(token)))
+            index_parts.append(encoded_keys[key])
+            payload_parts.append(token)
+            offset += len(token)
+
+        # 先写临时文件再替换，写入中途出错不会损坏原文件
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(temp_path, "wb") as f:
+            f.write(b"".join(index_parts + payload_parts))
+        os.chmod(temp_path, 0o600)
+        os.replace(temp_path, self.path)
@@ -1,31 +1,74 @@
+import importlib.util
 import logging
-import pickle
 import ssl
+import time
 from pathlib import Path
 
 import httpx
 import keyring
-import requests
 from cryptography.fernet import Fernet, InvalidToken
-from httpx import ConnectTimeout, HTTPStatusError, RequestError
+from httpx import ConnectTimeout, HTTPStatusError
 from lxml import etree
-from requests.exceptions import ConnectionError, HTTPError
 
+from ..codec import json_codec
 from ..encrypt import LoginRSA
-from ..load_config import load_config
-
-CURRENT_SCRIPT_PATH = Path(__file__)
-USER_AVATAR_PATH = CURRENT_SCRIPT_PATH.parent.parent.parent.parent / "images/user_avatar.png"
+from ..mirror.prefetch import (
+    CachedTransport,
+    ResponseCache,
+    invalidate_prefetched,
+    is_write,
+)
+from . import agent
+from .cookie_jar import (
+    CookieJarFile,
+    CookieJarFormatError,
+    cookie_records,
+    cookies_to_dict,
+)
 
 KEYRING_SERVICE_NAME = "lazy"
 KEYRING_STUDENTID_NAME = "studentid"
 KEYRING_PASSWORD_NAME = "password"
 KEYRING_LAZ_STUDENTID_NAME = "laz_studentid"
 ENCRYPTION_KEY_NAME = "session_encryption_key"
-SESSION_FILE = Path.home() / ".lazy_cli_session.enc"
+SESSION_FILE = Path.home() / ".lazy_cli_session.jar"
+# 旧版以 pickle 保存的会话文件，不再读取
+LEGACY_SESSION_FILE = Path.home() / ".lazy_cli_session.enc"
+SESSION_JAR_KEY = "default"
+# CAS 登录公钥的缓存时间（秒）
+PUBKEY_TTL = 30 * 60
+# 安装了 h2（httpx[http2]）时启用 HTTP/2，同一连接上的并发请求可多路复用
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") != None
 
 logger = logging.getLogger(__name__)
 
+class PubKeyCache:
+    """CAS 登录公钥的进程内缓存
+
+    公钥在较长时间内保持不变，批量重新登录（如 lazy-server 重启后恢复所有用户）时无需每次请求 getPubKey；
+    解析后的密钥对象由 LoginRSA.get_rsa_key 按模数缓存。
+    """
+    def __init__(self, ttl: float = PUBKEY_TTL):
+        self.ttl = ttl
+        self._pubkey: tuple[str, str]|None = None
+        self._expires_at = 0.0
+
+    def get(self)->tuple[str, str]|None:
+        if self._pubkey == None or time.monotonic() >= self._expires_at:
+            return None
+        return self._pubkey
+
+    def put(self, exponent: str, modulus: str):
+        self._pubkey = (exponent, modulus)
+        self._expires_at = time.monotonic() + self.ttl
+
+    def invalidate(self, modulus: str|None = None):
+        """清除缓存；指定 modulus 时只在缓存的仍是该公钥时清除，避免清掉并发登录刚刷新的公钥"""
+        if self._pubkey != None and (modulus == None or self._pubkey[1] == modulus):
+            self._pubkey = None
+
+pubkey_cache = PubKeyCache()
+
 def generate_encryption_key()->bytes:
     """提取已有的会话加密密钥，如果不存在则创建并保存
 
@@ -43,16 +86,37 @@ def generate_encryption_key()->bytes:
     keyring.set_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME, password=new_key.hex())
     return new_key        
 
+def session_signature()->list[int]|None:
+    """会话文件的签名（修改时间与大小），用于判断缓存的 Cookies 是否仍与文件一致"""
+    try:
+        stat = SESSION_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
 # 凭据管理器
 class CredentialManager:
     """加密、解密、加载与保存会话/Cookies文件
+
+    密钥与解密后的 Cookies 在进程内缓存，同一次调用中多次实例化只会访问一次 keyring；
+    会话代理运行时，加载 Cookies 无需访问 keyring。
     """
+    _encryption_key_cache: bytes|None = None
+    _cookies_cache: tuple[list[int], dict]|None = None
+
     def __init__(self):
-        # 初始化加密器
-        logger.info("初始化加密器中...")
-        self._encryption_key = self._generate_encryption_key()
-        self._fernet = Fernet(self._encryption_key)
-        logger.info("初始化加密器成功")
+        self._fernet_instance: Fernet|None = None
+
+    @property
+    def _fernet(self)->Fernet:
+        # 加密器在首次加解密时才初始化，从缓存或会话代理取得 Cookies 时无需访问 keyring
+        if self._fernet_instance == None:
+            logger.info("初始化加密器中...")
+            if CredentialManager._encryption_key_cache == None:
+                CredentialManager._encryption_key_cache = self._generate_encryption_key()
+            self._fernet_instance = Fernet(CredentialManager._encryption_key_cache)
+            logger.info("初始化加密器成功")
+        return self._fernet_instance
 
     def _generate_encryption_key(self)->bytes:
         """提取已有的会话加密密钥，如果不存在则创建并保存
@@ -66,52 +130,104 @@ class CredentialManager:
         keyring.set_password(service_name=KEYRING_SERVICE_NAME, username=ENCRYPTION_KEY_NAME, password=new_key.hex())
         return new_key
         
-    def save_cookies(self, cookies: dict)->bool:
-        """以序列化和加密的方式保存会话Cookies至本地家目录
+    @property
+    def _jar(self)->CookieJarFile:
+        return CookieJarFile(SESSION_FILE, self._fernet)
+
+    def save_cookies(self, cookies: httpx.Cookies|dict)->bool:
+        """加密保存会话Cookies至本地家目录
+
+        传入 httpx 的 Cookies 时会一并保存域名、路径与过期时间，可在不联网的情况下判断会话是否过期。
         """        
         logger.info("会话保存中...")
         try:
-            # 序列化
-            pickled_cookies = pickle.dumps(cookies)
-            # 加密
-            encrypted_pickled_cookies = self._fernet.encrypt(pickled_cookies)
-            with open(SESSION_FILE, 'wb') as f:
-                f.write(encrypted_pickled_cookies)
+            self._jar.save(SESSION_JAR_KEY, cookies)
             logger.info("会话保存成功！")
-            return True
         except Exception as e:
             logger.error(f"会话保存未成功！错误信息: {e}")
             return False
+
+        # 新会话已保存，旧版会话文件不再需要
+        LEGACY_SESSION_FILE.unlink(missing_ok=True)
+
+        cookies = cookies_to_dict(cookie_records(cookies))
+        signature = session_signature()
+        CredentialManager._cookies_cache = (signature, cookies)
+        # 仅在会话代理已由 'lazy agent start' 启动时推送，代理未运行时不向套接字写入 Cookies
+        if agent.request({"op": "status"}) != None:
+            agent.request({"op": "set", "cookies": cookies, "signature": signature})
+        return True
         
     def load_cookies(self)->dict|None:
         logger.info("Cookies加载中...")
-        if not SESSION_FILE.exists():
-            logger.error("Cookies文件不存在！")
+        signature = session_signature()
+        if signature == None:
+            if LEGACY_SESSION_FILE.exists():
+                logger.warning("检测到旧版会话文件，已不再支持，将重新登录")
+            else:
+                logger.error("Cookies文件不存在！")
             return None
 
-        # 读取文件，解密并反序列化        
+        cached = CredentialManager._cookies_cache
+        if cached != None and cached[0] == signature:
+            logger.info("Cookies加载成功（进程内缓存）")
+            return dict(cached[1])
+
+        reply = agent.request({"op": "get"})
+        if reply != None and reply.get("signature") == signature and isinstance(reply.get("cookies"), dict):
+            CredentialManager._cookies_cache = (signature, reply["cookies"])
+            logger.info("Cookies加载成功（会话代理）")
+            return dict(reply["cookies"])
+
+        # 读取文件并解密
         try:
-            with open(SESSION_FILE, 'rb') as f:
-                encrypted_pickled_cookies =f.read()
-            
-            decrypted_pickled_cookies = self._fernet.decrypt(encrypted_pickled_cookies)
-            cookies = pickle.loads(decrypted_pickled_cookies)
-            logger.info("Cookies加载成功！")
-            return cookies
-        except (InvalidToken, pickle.UnpicklingError, EOFError, FileNotFoundError) as e:
+            records = self._jar.load(SESSION_JAR_KEY)
+        except (InvalidToken, CookieJarFormatError, json_codec.JSONDecodeError, OSError) as e:
             logger.error(f"Cookies加载失败！错误原因: {e}")
             logger.info("Cookies加载未成功，请检查会话文件是否损坏或密钥已更改")
             return None
 
+        if records == None:
+            logger.error("会话文件中没有Cookies！")
+            return None
+
+        cookies = cookies_to_dict(records)
+        logger.info("Cookies加载成功！")
+        CredentialManager._cookies_cache = (signature, cookies)
+        # 会话代理中的 Cookies 已过时（例如在代理之外重新登录），顺带更新
+        if reply != None:
+            agent.request({"op": "set", "cookies": cookies, "signature": signature})
+        return dict(cookies)
+
+    def session_expired(self)->bool:
+        """根据保存时记录的过期时间判断会话是否已过期，无需联网与解密；过期时间未知时返回 False"""
+        try:
+            entry = CookieJarFile(SESSION_FILE).entry(SESSION_JAR_KEY)
+        except (CookieJarFormatError, OSError) as e:
+            logger.error(f"会话文件读取失败: {e}")
+            return True
+
+        return entry == None or entry.is_expired()
+
 # 异步架构Client类
 class ZjuAsyncClient:
+    # 进程内的 SSL 探测结果：None 为尚未探测，True 为需要兼容模式（SECLEVEL=1）
+    _ssl_compat: bool|None = None
+
     def __init__(
         self, 
         headers   = None, 
         cookies   = None,
-        trust_env = False
+        trust_env = False,
+        auth: httpx.Auth|None = None,
+        cache: ResponseCache|None = None
     ):
-        """初始化会话配置参数"""
+        """初始化会话配置参数
+
+        auth 为 SessionAuth 时，会话失效的请求会自动重新登录后重发，无需预先验证会话。
+        cache 为 ResponseCache 时，GET 请求先查询后台预取的响应。
+        无论是否给定 cache，发出过修改请求的 client 关闭时都会清空镜像中的预取响应。
+        """
         if headers is None:
             headers = {
                 'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
@@ -122,7 +238,11 @@ class ZjuAsyncClient:
         # 为了防止后续 update(None) 报错，建议这里给个空字典兜底
         self.cookies = cookies or {} 
         self.trust_env = trust_env
+        self.auth = auth
+        self.cache = cache
         self.studentid = None
+        # 是否向学在浙大发出过修改请求
+        self._wrote = False
         
         # 先占位，不要在这里 await
         self.session = None
@@ -135,19 +255,19 @@ class ZjuAsyncClient:
         else:
             logger.info("全局代理关闭")
 
+        # 同一进程内已探测过 SSL 配置时直接沿用，批量创建会话时不必每次都发探测请求
+        if ZjuAsyncClient._ssl_compat != None:
+            logger.info("初始化会话成功[沿用SSL配置]")
+            return self._new_session(ZjuAsyncClient._ssl_compat)
+
         try:
-            session = httpx.AsyncClient(
-                trust_env=self.trust_env, 
-                timeout=20.0, 
-                follow_redirects=True
-            )
-            session.headers.update(self.headers)
-            session.cookies.update(self.cookies)
+            session = self._new_session(compat=False)
             url = "https://courses.zju.edu.cn/user/index#/"
 
-            # test the ssl
-            response = await session.get(url)
+            # test the ssl，探测请求不经过 auth，会话失效时不触发重新登录
+            response = await session.get(url, auth=None)
             response.raise_for_status()
+            ZjuAsyncClient._ssl_compat = False
             logger.info("初始化会话成功")
             return session
         except httpx.ConnectError as e:
@@ -156,21 +276,12 @@ class ZjuAsyncClient:
                 logger.warning("DH KEY TOO SMALL! SECLEVEL=1")
 
                 await session.aclose()
-                ssl_context = ssl.create_default_context()
-                ssl_context.set_ciphers('DEFAULT@SECLEVEL=1')
-
-                session = httpx.AsyncClient(
-                    trust_env=self.trust_env,
-                    timeout=20,
-                    verify=ssl_context,
-                    follow_redirects=True
-                )
-                session.headers.update(self.headers)
-                session.cookies.update(self.cookies)
+                session = self._new_session(compat=True)
 
                 try:
-                    response = await session.get(url)
+                    response = await session.get(url, auth=None)
                     response.raise_for_status()
+                    ZjuAsyncClient._ssl_compat = True
                     logger.info("初始化会话成功[兼容模式]")
                     return session
                 except Exception as sub_e:
@@ -179,16 +290,54 @@ class ZjuAsyncClient:
             else:
                 logger.error(f"未知错误: {e}")
                 raise
+
+    def _new_session(self, compat: bool)->httpx.AsyncClient:
+        verify = True
+        if compat:
+            verify = ssl.create_default_context()
+            verify.set_ciphers('DEFAULT@SECLEVEL=1')
+
+        transport = None
+        if self.cache != None:
+            # 给定 transport 时 httpx 不再使用 verify 与 http2，需交给底层传输
+            transport = CachedTransport(
+                httpx.AsyncHTTPTransport(verify=verify, http2=HTTP2_AVAILABLE, trust_env=self.trust_env),
+                self.cache
+            )
+
+        session = httpx.AsyncClient(
+            trust_env=self.trust_env,
+            timeout=20.0,
+            verify=verify,
+            follow_redirects=True,
+            http2=HTTP2_AVAILABLE,
+            auth=self.auth,
+            transport=transport,
+            event_hooks={"request": [self._on_request]}
+        )
+        session.headers.update(self.headers)
+        session.cookies.update(self.cookies)
+        return session
     
     async def __aenter__(self):
         self.session = await self._init_session()
         return self
     
+    async def _on_request(self, request: httpx.Request):
+        # 请求钩子对代理挂载同样生效，修改请求发出前先清空进程内的预取缓存
+        if is_write(request):
+            self._wrote = True
+            if self.cache != None:
+                self.cache.invalidate()
+
     async def __aexit__(self, exc_type, exc_value, exc_traceback):
         if self.session:
             await self.session.aclose()
+        # 使用缓存时由 CachedTransport 关闭时一并清空
+        if self._wrote and self.cache == None:
+            invalidate_prefetched()
 
-    async def login(self, studentid: str, password: str)->bool:
+    async def login(self, studentid: str, password: str, retry_stale_pubkey: bool = True)->bool:
         """学在浙大登录逻辑，返回bool值表示登录结果是否成功。
 
         Parameters
@@ -197,6 +346,8 @@ class ZjuAsyncClient:
             学号
         password : str
             密码
+        retry_stale_pubkey : bool
+            使用缓存的公钥登录失败、且确认服务端已更换公钥时，是否用新公钥重试一次
 
         Returns
         -------
@@ -209,23 +360,21 @@ class ZjuAsyncClient:
 
         # 初始化常量
         url = "https://courses.zju.edu.cn/user/index#/"
-        pubkey_url = "https://zjuam.zju.edu.cn/cas/v2/getPubKey"
         self.studentid = studentid
         self.password = password
         # 初始化登录POST表单
         # 获取password RSA加密所需的exponent与modulus
-        try: 
+        pubkey_cached = False
+        try:
             login_response = await self.session.get(url=url, follow_redirects=True)
-            pubkey_json = await self.session.get(url=pubkey_url, follow_redirects=True)
-            pubkey_json.raise_for_status()
-            
-            # 解析，获取exponent和modulus
-            data = pubkey_json.json()
-            exponent = data.get("exponent")
-            modulus = data.get("modulus")
 
-            if exponent is None or modulus is None:
-                logger.error("PubKey API调用存在问题，请将此问题报告给开发者！")
+            pubkey = pubkey_cache.get()
+            pubkey_cached = pubkey != None
+            if pubkey_cached:
+                logger.info("使用缓存的公钥")
+                exponent, modulus = pubkey
+            else:
+                exponent, modulus = await self._fetch_pubkey()
 
         except httpx.RequestError as exc:
             # 这样可以精准捕获连接错误、超时、代理错误等所有 httpx 网络层面的异常
@@ -276,9 +425,41 @@ class ZjuAsyncClient:
         if "学在浙大" in response.text:
             logger.info("登录成功！")
             return True
+
+        if pubkey_cached and retry_stale_pubkey:
+            # 失败可能是缓存的公钥已被服务端更换；重新获取公钥（不消耗登录次数），
+            # 只有公钥确实变化时才重试一次，学号或密码错误时不重复提交，避免加速账号锁定
+            cached_modulus = modulus
+            pubkey_cache.invalidate(cached_modulus)
+            try:
+                _, modulus = await self._fetch_pubkey()
+            except (httpx.HTTPError, ValueError) as e:
+                logger.error(f"刷新公钥失败: {e}")
+                return False
+            if modulus != None and modulus != cached_modulus:
+                logger.warning("服务端公钥已更换，使用新公钥重试登录")
+                return await self.login(studentid, password, retry_stale_pubkey=False)
+
         logger.error("登录失败，可能是学号或密码不正确！")
         return False
 
+    async def _fetch_pubkey(self)->tuple[str|None, str|None]:
+        """请求 getPubKey，返回 (exponent, modulus) 并写入公钥缓存"""
+        pubkey_url = "https://zjuam.zju.edu.cn/cas/v2/getPubKey"
+        pubkey_json = await self.session.get(url=pubkey_url, follow_redirects=True)
+        pubkey_json.raise_for_status()
+
+        # 解析，获取exponent和modulus
+        data = pubkey_json.json()
+        exponent = data.get("exponent")
+        modulus = data.get("modulus")
+
+        if exponent is None or modulus is None:
+            logger.error("PubKey API调用存在问题，请将此问题报告给开发者！")
+        else:
+            pubkey_cache.put(exponent, modulus)
+        return exponent, modulus
+
     def _encrypt_password(self, password: str, exponent: str, modulus: str)->str:
         """用RSA算法加密password
 
@@ -290,7 +471,7 @@ class ZjuAsyncClient:
         if not password.isascii():
             raise ValueError
 
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
+        key_obj = LoginRSA.get_rsa_key(public_exponent_hex=exponent, modulus_hex=modulus)
         reversed_password = password[::-1]
         return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
 
@@ -300,7 +481,7 @@ class ZjuAsyncClient:
 
         Parameters
         ----------
-        response : requests.Response
+        response : httpx.Response
             the response of the requests from the base url
 
         Returns
@@ -313,12 +494,12 @@ class ZjuAsyncClient:
         
         return html.xpath(xpath_pattern)
     
-    def _get_username(self, response: requests.Response)->str:
+    def _get_username(self, response: httpx.Response)->str:
         """从index.html获取用户的姓名
 
         Parameters
         ----------
-        response : requests.Response
+        response : httpx.Response
             login返回的已登录index
 
         Returns
@@ -410,432 +591,3 @@ class ZjuAsyncClient:
         except Exception as e:
             logger.error(f"未知错误: {e}")
             return False
-
-# 新版Client类
-class ZjuClient:
-    def __init__(self, headers=None):
-        """初始化会话
-
-        Parameters
-        ----------
-        headers : dict, optional
-            _description_, by default None
-        """
-        # 初始化会话    
-        logger.info("初始化会话中...")
-        self.session = requests.Session()
-        if headers is None:
-            headers = {
-                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-                'Accept-Language': 'zh-CN,zh;q=0.9',
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36'
-            }
-
-        self.session.headers.update(headers)
-        self.studentid = None
-        logger.info("初始化会话成功")
-
-        # 初始化加密器
-        logger.info("初始化加密器中...")
-        self._encryption_key = generate_encryption_key()
-        self._fernet = Fernet(self._encryption_key)
-        logger.info("初始化加密器成功")
-    
-    def login(self, studentid: str, password: str)->bool:
-        """学在浙大登录逻辑，返回bool值表示登录结果是否成功。
-
-        Parameters
-        ----------
-        studentid : str
-            学号
-        password : str
-            密码
-
-        Returns
-        -------
-        bool
-            登录状态，True为成功，False为失败
-        """        
-        
-        # 初始化常量
-        url = "https://courses.zju.edu.cn/user/index#/"
-        pubkey_url = "https://zjuam.zju.edu.cn/cas/v2/getPubKey"
-        self.studentid = studentid
-
-        # 初始化登录POST表单
-        # 获取password RSA加密所需的exponent与modulus
-        try: 
-            login_response = self.session.get(url=url)
-            pubkey_json = self.session.get(url=pubkey_url)
-            pubkey_json.raise_for_status()
-            
-            # 解析，获取exponent和modulus
-            data = pubkey_json.json()
-            exponent = data.get("exponent")
-            modulus = data.get("modulus")
-
-            if exponent is None or modulus is None:
-                logger.error("PubKey API调用存在问题，请将此问题报告给开发者！")
-
-        except HTTPError as errh:
-            logger.error(f"HTTP错误: {errh}")
-
-        except ConnectionError as errc:
-            logger.error(f"连接错误: {errc}")
-
-        except ConnectTimeout as errt:
-            logger.error(f"超时错误: {errt}")
-
-        except RequestError as err:
-            logger.error(f"发生了其他请求错误: {err}")
-
-        except ValueError as e: # 当响应不是有效JSON时，.json()会抛出json.JSONDecodeError，它是ValueError的子类
-            logger.error(f"无法解析JSON数据: {e}")
-
-        # 加密password
-        try:
-            encrypted_password = self._encrypt_password(password=password, exponent=exponent, modulus=modulus)
-        
-        except ValueError:
-            logger.error("密码值错误！发生在RSA加密时。")
-
-        # 获取execution
-        execution = self._get_execution(response=login_response)
-
-        # 构建POST表单
-        logger.info("构建POST表单中...")
-        data = {
-            'username': self.studentid,
-            'password': encrypted_password,
-            'authcode': '',
-            'execution': execution[0],
-            '_eventId': 'submit'
-        }
-
-        logger.info("POST登录请求中...")
-        response = self.session.post(
-            url=login_response.url, 
-            data=data)
-        
-        if "学在浙大" in response.text:
-            logger.info(f"登录成功！学号: {self.studentid}")
-            return True
-        logger.error("登录失败，请检查学号与密码是否正确！")
-        return False
-
-    def _encrypt_password(self, password: str, exponent: str, modulus: str)->str:
-        """用RSA算法加密password
-
-        Returns
-        -------
-        str
-            return the encrypted password for POST
-        """        
-
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
-        reversed_password = password[::-1]
-        return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
-
-
-    def _get_execution(self, response: requests.Response)->str:
-        """得到登录的动态口令
-
-        Parameters
-        ----------
-        response : requests.Response
-            the response of the requests from the base url
-
-        Returns
-        -------
-        str
-            return the execution
-        """        
-
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//input[@name="execution"]/@value'
-        
-        return html.xpath(xpath_pattern)
-    
-    def _get_username(self, response: requests.Response)->str:
-        """从index.html获取用户的姓名
-
-        Parameters
-        ----------
-        response : requests.Response
-            login返回的已登录index
-
-        Returns
-        -------
-        str
-            用户姓名
-        """        
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//root-scope-variable[@name="currentUserName"]/@value'
-        username = html.xpath(xpath_pattern)
-        return username[0]
-
-    def save_session(self):
-        """以序列化和加密的方式保存会话至本地家目录
-        """        
-        logger.info("会话保存中...")
-        try:
-            # 序列化
-            pickled_session = pickle.dumps(self.session)
-            # 加密
-            encrypted_pickled_session = self._fernet.encrypt(pickled_session)
-            with open(SESSION_FILE, 'wb') as f:
-                f.write(encrypted_pickled_session)
-            logger.info("会话保存成功！")
-        except Exception as e:
-            logger.error(f"会话保存未成功！错误信息: {e}")
-
-    def load_session(self)->bool:
-        logger.info("会话加载中...")
-        if not SESSION_FILE.exists():
-            logger.error("会话文件不存在！")
-            return False
-
-        # 读取文件，解密并反序列化        
-        try:
-            with open(SESSION_FILE, 'rb') as f:
-                encrypted_pickled_session =f.read()
-            
-            decrypted_pickled_session = self._fernet.decrypt(encrypted_pickled_session)
-            self.session = pickle.loads(decrypted_pickled_session)
-            return True
-        except (InvalidToken, pickle.UnpicklingError, EOFError, FileNotFoundError) as e:
-            logger.error(f"会话加载失败！错误原因: {e}")
-            logger.info("会话加载未成功，请检查会话文件是否损坏或密钥已更改")
-            return False
-
-    def is_valid_session(self)->bool:
-        if not self.session.cookies:
-            logger.warning("Session.Cookies不存在，需手动登录")
-            return False
-        
-        # 验证登录状态
-        try:
-            response = self.session.get(url="https://courses.zju.edu.cn/api/activities/is-locked", follow_redirects=False)
-            response.raise_for_status()
-            if response.status_code == 200:
-                logger.info("会话验证有效")
-                return True
-            
-            return False
-        except RequestError:
-            logger.warning("会话已过期失效！")
-            return False
-
-# 旧版Login类
-class LoginFit:
-    def __init__(self, base_url: str = None, cookies: dict[str:str] = None, headers=None):
-        self.studentid = keyring.get_password("lazy", "studentid")
-        self.password = keyring.get_password("lazy", "password")
-        
-        if base_url == None:
-            self.base_url = "https://courses.zju.edu.cn/user/index#/"
-        else:
-            self.base_url = base_url
-
-        while self.studentid == None:
-            self.studentid = input("请输入学号：")
-            if self.studentid == None:
-                logger.error("学号不能为空！")
-            else:
-                keyring.set_password("lazy", "studentid", self.studentid)
-
-        while self.password == None:
-            self.password = input("请输入密码：")
-            if self.password == None:
-                logger.error("密码不能为空！")
-            else:
-                keyring.set_password("lazy", "password", self.password)
-
-        self.headers = headers
-        self.login_session = creat_login_session(headers=headers)
-
-    def login(self)->requests.Session:
-        """学在浙大登录方法
-
-        Returns
-        -------
-        requests.Session
-            已登录的会话
-        """        
-        login_response = self.login_session.get(url=self.base_url)
-        
-        # 准备登录POST表单内容
-        # 请求加密password所需的exponent和modulus
-        try: 
-            pubkey_json = self.login_session.get(url="https://zjuam.zju.edu.cn/cas/v2/getPubKey")
-            pubkey_json.raise_for_status()
-            data = pubkey_json.json()
-            
-            # 解析，获取exponent和modulus
-            exponent = data["exponent"]
-            modulus = data["modulus"]
-
-        except HTTPError as errh:
-            print(f"HTTP错误: {errh}")
-
-        except ConnectionError as errc:
-            print(f"连接错误: {errc}")
-
-        except ConnectTimeout as errt:
-            print(f"超时错误: {errt}")
-
-        except RequestError as err:
-            print(f"发生了其他请求错误: {err}")
-
-        except ValueError as e: # 当响应不是有效JSON时，.json()会抛出json.JSONDecodeError，它是ValueError的子类
-            print(f"无法解析JSON数据: {e}")
-            print(f"响应内容: {pubkey_json.text}") # 打印原始响应内容进行调试
-
-        # 加密passwrod
-        try:
-            encrypted_password = self.encrypt_password(exponent=exponent, modulus=modulus)
-        
-        except ValueError:
-            logger.error("密码值错误！发生在RSA加密时。")
-
-        # 获取execution
-        execution = self.get_execution(response=login_response)
-
-        # 构建POST表单
-        logger.info("构建POST表单中...")
-        data = {
-            'username': self.studentid,
-            'password': encrypted_password,
-            'authcode': '',
-            'execution': execution[0],
-            '_eventId': 'submit'
-        }
-        
-        logger.info("构建成功！")
-        
-        # POST登录
-        logger.info("POST登录请求中...")
-        login_response = self.login_session.post(url=login_response.url, headers=self.headers, data=data)
-        
-        if "学在浙大" in login_response.text:
-            logger.info(f"登录成功！学号: {self.studentid}")
-            self.update_user_config(login_response)
-            logger.info("User Config配置更新成功")
-            self.get_user_avatar(login_response)
-            logger.info("用户头像更新成功")
-        else:
-            logger.error("登录失败！")
-
-        return self.login_session
-    
-    def update_user_config(self, response: requests.Response):
-        """更新用户信息文件，记录登录地址，用户学在浙大id和用户姓名。
-
-        Parameters
-        ----------
-        response : requests.Response
-            _description_
-        """        
-        user_config_file = load_config.userConfig()
-        user_config = user_config_file.load_config()
-        user_config["url"] = response.url
-        user_config["userid"] = self.get_userid(response)
-        user_config["username"] = self.get_username(response)
-        user_config_file.update_config(config_data=user_config)
-        
-    def get_user_avatar(self, response: requests.Response)->str:
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//root-scope-variable/@value'
-        result = html.xpath(xpath_pattern)
-        
-        if result != []:
-            avatar_url = result[0].split('?')[0]
-            with open(USER_AVATAR_PATH, "wb") as f:
-                f.write(requests.get(avatar_url).content)
-
-    def get_userid(self, response: requests.Response)->str:
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//span[@id="userId"]/@value'
-        result = html.xpath(xpath_pattern)
-        return result[0]
-
-    def encrypt_password(self, exponent:str, modulus:str)->str:
-        """encrypt password by RSA
-
-        Returns
-        -------
-        str
-            return the encrypted password for POST
-        """        
-
-        key_obj = LoginRSA.RSAKeyPython(public_exponent_hex=exponent, modulus_hex=modulus)
-        reversed_password = self.password[::-1]
-        return LoginRSA.encrypted_string_python(key=key_obj, s=reversed_password)
-
-    
-    def get_execution(self, response: requests.Response)->str:
-        """get the execution for POST
-
-        Parameters
-        ----------
-        response : requests.Response
-            the response of the requests from the base url
-
-        Returns
-        -------
-        str
-            return the execution
-        """        
-
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//input[@name="execution"]/@value'
-        
-        return html.xpath(xpath_pattern)
-
-    def get_username(self, response: requests.Response)->str:
-        """从index.html获取用户的姓名
-
-        Parameters
-        ----------
-        response : requests.Response
-            login返回的已登录index
-
-        Returns
-        -------
-        str
-            用户姓名
-        """        
-        html = etree.HTML(response.text)
-        xpath_pattern = r'//root-scope-variable[@name="currentUserName"]/@value'
-        username = html.xpath(xpath_pattern)
-        return username[0]
-
-def creat_login_session(headers=None)->requests.Session:
-    """create a session for login
-
-    Parameters
-    ----------
-     headers : dict[str:str], optional
-        headers for login, by default None
-
-    Returns
-    -------
-    requests.Session
-        _description_
-    """    
-
-    default_headers = {
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-        'Accept-Language': 'zh-CN,zh;q=0.9',
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36'
-    }
-    login_session = requests.session()
-
-    if headers == None:
-        logger.info("未检测到登录需求headers，启用默认headers")
-        headers = default_headers
-        logger.info("已启用默认headers")
-
-    login_session.headers.update(headers)
-    
-    return login_session
@@ -0,0 +1,100 @@
+"""供同步代码使用的 ZjuAsyncClient 薄封装。
+
+所有请求都提交到一个进程内共享的后台事件循环，由 ZjuAsyncClient 完成，
+同步调用方（GUI 等）因此与 CLI 共用同一套连接池、HTTP/2、自动重新登录与日志，无需再维护一套 requests 实现。
+
+    with ZjuSyncClient(cookies=cookies) as client:
+        course = client.run(zju_api.courseViewAPIFits(client.session, course_id).get_api_data())
+"""
+import asyncio
+import atexit
+import logging
+import threading
+from collections.abc import Coroutine
+from typing import Any, TypeVar
+
+import httpx
+
+from .login import ZjuAsyncClient
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_loop: asyncio.AbstractEventLoop|None = None
+_loop_lock = threading.Lock()
+
+def background_loop()->asyncio.AbstractEventLoop:
+    """返回共享的后台事件循环，首次调用时在守护线程中启动"""
+    global _loop
+    with _loop_lock:
+        if _loop == None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="lazy-event-loop", daemon=True).start()
+            _loop = loop
+            logger.info("后台事件循环已启动")
+    return _loop
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: float|None = None)->T:
+    """在后台事件循环中运行协程并阻塞等待结果，协程抛出的异常原样抛出"""
+    loop = background_loop()
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+
+    if running_loop is loop:
+        coro.close()
+        raise RuntimeError("不能在后台事件循环内同步等待，请直接 await")
+
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+@atexit.register
+def _stop_background_loop():
+    if _loop != None and not _loop.is_closed():
+        _loop.call_soon_threadsafe(_loop.stop)
+
+class ZjuSyncClient:
+    def __init__(
+        self,
+        headers   = None,
+        cookies   = None,
+        trust_env = False,
+        auth: httpx.Auth|None = None
+    ):
+        """参数与 ZjuAsyncClient 相同"""
+        self._client = ZjuAsyncClient(headers=headers, cookies=cookies, trust_env=trust_env, auth=auth)
+
+    @property
+    def session(self)->httpx.AsyncClient|None:
+        """底层的 httpx.AsyncClient，可直接传给 APIFits，再由 run 执行"""
+        return self._client.session
+
+    @property
+    def studentid(self)->str|None:
+        return self._client.studentid
+
+    def __enter__(self):
+        run_sync(self._client.__aenter__())
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        run_sync(self._client.__aexit__(exc_type, exc_value, exc_traceback))
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float|None = None)->T:
+        return run_sync(coro, timeout)
+
+    def login(self, studentid: str, password: str)->bool:
+        return run_sync(self._client.login(studentid, password))
+
+    def is_valid_session(self)->bool:
+        return run_sync(self._client.is_valid_session())
+
+    def request(self, method: str, url: str, **kwargs)->httpx.Response:
+        return run_sync(self._client.session.request(method, url, **kwargs))
+
+    def get(self, url: str, **kwargs)->httpx.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs)->httpx.Response:
+        return self.request("POST", url, **kwargs)
@@ -0,0 +1,122 @@
+"""后台预取的响应缓存。
+
+`lazy assignment todo --prefetch N` 等命令列出结果后，在后台以低优先级进程按与前台相同的代码路径
+拉取排在前面的条目，经 `CachedTransport` 记录下每个成功的 JSON GET 响应，结束时写入镜像的
+`prefetched_responses` 表。随后的 `lazy assignment view` 等命令在传输层先查缓存，命中时直接应答，
+不再联网。
+
+缓存按会话（Cookies 的摘要）与完整 URL（含查询参数）匹配，只保留 `PREFETCH_TTL` 秒。
+任何 ZjuAsyncClient 发出非 GET 请求（提交作业、上传资源、签到等）后都会调用 `invalidate_prefetched`
+清空镜像中的全部预取响应，无论该 client 是否使用缓存，避免之后读到修改前的数据；
+修改请求发生在预取进行期间时，预取结束后记录到的响应整批丢弃。
+启用 --proxy 且设置了代理环境变量时，请求经 httpx 的代理挂载发出，不经过缓存。
+"""
+import hashlib
+import logging
+import sqlite3
+import time
+
+import httpx
+
+from .store import MIRROR_PATH, MirrorStore, ingest
+
+logger = logging.getLogger(__name__)
+
+# 预取响应的有效期（秒）
+PREFETCH_TTL = 10 * 60
+# 预取响应所属的站点
+API_HOST = "courses.zju.edu.cn"
+
+def session_key(cookies: dict|None)->str:
+    """预取响应所属会话的标识，取 Cookies 的摘要，不在镜像中保存 Cookies 本身"""
+    items = sorted((cookies or {}).items())
+    return hashlib.sha256(repr(items).encode()).hexdigest()[:16]
+
+def is_write(request: httpx.Request)->bool:
+    """发往学在浙大的修改请求；CAS 登录等其他站点的 POST 不影响预取的数据"""
+    return request.method not in ("GET", "HEAD", "OPTIONS") and request.url.host == API_HOST
+
+def invalidate_prefetched():
+    """清空镜像中的全部预取响应，镜像不存在时不做任何事"""
+    if MIRROR_PATH.exists():
+        ingest(lambda store: store.clear_prefetched())
+
+class ResponseCache:
+    def __init__(self, session: str, responses: dict[str, bytes]|None = None, record: bool = False):
+        """session 为 session_key 的结果；responses 为 URL -> 原始响应体；record 为 True 时记录经过的成功 JSON GET 响应"""
+        self.session = session
+        self.responses = responses or {}
+        self.record = record
+        self._pending: dict[str, bytes] = {}
+        self._invalidated = False
+        self._started_at = time.time()
+
+    @classmethod
+    def load(cls, session: str, max_age: float = PREFETCH_TTL)->"ResponseCache":
+        """读取镜像中会话 session 未过期的预取响应，镜像不存在或读取失败时返回空缓存"""
+        if not MIRROR_PATH.exists():
+            return cls(session)
+
+        try:
+            with MirrorStore() as store:
+                responses = store.prefetched(session, max_age)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"预取缓存读取失败: {e}")
+            return cls(session)
+
+        if responses:
+            logger.info(f"已加载 {len(responses)} 个预取响应")
+        return cls(session, responses)
+
+    def __len__(self)->int:
+        return len(self.responses) + len(self._pending)
+
+    def get(self, url: str)->bytes|None:
+        return self.responses.get(url)
+
+    def put(self, url: str, raw: bytes):
+        self._pending[url] = raw
+
+    def invalidate(self):
+        if self.responses or self._pending:
+            logger.info("会话中发出了修改请求，清空预取缓存")
+        self.responses = {}
+        self._pending = {}
+        self._invalidated = True
+
+    def flush(self):
+        """把记录到的响应写入镜像；缓存被清空过时一并删除镜像中的预取响应"""
+        if self._invalidated:
+            self._invalidated = False
+            invalidate_prefetched()
+
+        if self._pending:
+            pending, self._pending = self._pending, {}
+            ingest(lambda store: store.save_prefetched(self.session, pending, PREFETCH_TTL, self._started_at))
+            logger.info(f"已写入 {len(pending)} 个预取响应")
+
+class CachedTransport(httpx.AsyncBaseTransport):
+    """在 httpx 传输层查询与记录 ResponseCache，对上层的 APIFits 与 BatchExecutor 透明"""
+    def __init__(self, transport: httpx.AsyncBaseTransport, cache: ResponseCache):
+        self.transport = transport
+        self.cache = cache
+
+    async def handle_async_request(self, request: httpx.Request)->httpx.Response:
+        # 修改请求由 ZjuAsyncClient 的请求钩子清空缓存，这里只处理 GET
+        if request.method != "GET":
+            return await self.transport.handle_async_request(request)
+
+        url = str(request.url)
+        raw = self.cache.get(url)
+        if raw != None:
+            logger.debug(f"预取缓存命中: {url}")
+            return httpx.Response(200, headers={"Content-Type": "application/json"}, content=raw)
+
+        response = await self.transport.handle_async_request(request)
+        if self.cache.record and response.status_code == 200 and response.headers.get("Content-Type", "").startswith("application/json"):
+            self.cache.put(url, await response.aread())
+        return response
+
+    async def aclose(self):
+        await self.transport.aclose()
+        self.cache.flush()
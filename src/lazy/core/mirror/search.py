@@ -0,0 +1,207 @@
+"""本地镜像上的全文检索。
+
+检索条目保存在 `search_items` 中（活动、测试、课堂任务的标题与简介，以及附件文件名），
+并通过触发器同步到外部内容的 FTS5 表 `search_fts`。学在浙大的标题以中文为主，
+unicode61 分词器会把连续的汉字当成一个词，因此优先使用 trigram 分词器做子串匹配；
+trigram 要求每个检索词至少 3 个字符，更短的检索词以及不支持 FTS5 的 SQLite 退回到 LIKE 扫描。
+"""
+import logging
+import sqlite3
+from dataclasses import dataclass
+
+from lxml import html
+from lxml.etree import ParserError
+
+from ..codec import json_codec
+
+logger = logging.getLogger(__name__)
+
+SEARCH_KINDS = ("activity", "exam", "classroom", "upload")
+
+TRIGRAM_MIN_LENGTH = 3
+
+_SEARCH_ITEMS_SCHEMA = """
+    CREATE TABLE search_items (
+        rowid INTEGER PRIMARY KEY,
+        kind TEXT NOT NULL,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        item_id INTEGER NOT NULL,
+        parent_id INTEGER NOT NULL DEFAULT 0,
+        title TEXT NOT NULL,
+        body TEXT NOT NULL DEFAULT ''
+    );
+    CREATE INDEX search_items_course ON search_items(course_id);
+"""
+
+_SEARCH_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE search_fts USING fts5(
+        title, body, content='search_items', content_rowid='rowid', tokenize='{tokenizer}'
+    );
+    CREATE TRIGGER search_items_ai AFTER INSERT ON search_items BEGIN
+        INSERT INTO search_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+    END;
+    CREATE TRIGGER search_items_ad AFTER DELETE ON search_items BEGIN
+        INSERT INTO search_fts (search_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+    END;
+    CREATE TRIGGER search_items_au AFTER UPDATE ON search_items BEGIN
+        INSERT INTO search_fts (search_fts, rowid, title, body) VALUES ('delete', old.rowid, old.title, old.body);
+        INSERT INTO search_fts (rowid, title, body) VALUES (new.rowid, new.title, new.body);
+    END;
+"""
+
+
+def execute_script(conn: sqlite3.Connection, script: str):
+    """逐条执行 SQL 脚本。
+
+    executescript 会隐式提交事务，迁移需要与 user_version 在同一事务内完成；
+    按完整语句切分而不是按分号切分，触发器体内的分号不会被拆开。
+    """
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            conn.execute(statement)
+            statement = ""
+
+
+def migrate_search_index(conn: sqlite3.Connection):
+    """镜像表结构 v2：建立检索表，并按 SQLite 的能力选择检索后端。"""
+    execute_script(conn, _SEARCH_ITEMS_SCHEMA)
+
+    backend = "like"
+    for tokenizer in ("trigram", "unicode61"):
+        try:
+            conn.execute("SAVEPOINT search_fts")
+            execute_script(conn, _SEARCH_FTS_SCHEMA.format(tokenizer=tokenizer))
+            conn.execute("RELEASE search_fts")
+        except sqlite3.OperationalError as e:
+            logger.info(f"FTS5 分词器 {tokenizer} 不可用: {e}")
+            conn.execute("ROLLBACK TO search_fts")
+            conn.execute("RELEASE search_fts")
+            continue
+
+        backend = tokenizer
+        break
+
+    logger.info(f"镜像检索后端: {backend}")
+    conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('search_backend', ?)", (backend,))
+
+    # 由 v1 升级时为已镜像的课程补建检索条目
+    payloads: dict[int, dict[str, dict]] = {}
+    for course_id, api, raw in conn.execute(
+        "SELECT course_id, api, raw FROM course_payloads WHERE api IN ('activities', 'exams', 'classrooms')"
+    ):
+        payloads.setdefault(course_id, {})[api] = json_codec.loads(raw)
+    for course_id, course_payloads in payloads.items():
+        reindex_course(conn, course_id, course_payloads.get("activities"), course_payloads.get("exams"), course_payloads.get("classrooms"))
+
+
+def html_text(raw_content: str | None) -> str:
+    if not raw_content or not raw_content.strip():
+        return ""
+    try:
+        return " ".join(html.fromstring(raw_content).text_content().split())
+    except ParserError:
+        return ""
+
+
+def build_course_rows(course_id: int, raw_activities: dict, raw_exams: dict, raw_classrooms: dict) -> list[tuple]:
+    """把一门课程的任务列表转换为 search_items 的行。"""
+    rows = []
+    for activity in (raw_activities or {}).get("activities") or []:
+        activity_id = activity.get("id")
+        activity_title = activity.get("title") or ""
+        rows.append(("activity", course_id, activity_id, 0, activity_title, html_text((activity.get("data") or {}).get("description"))))
+        for upload in activity.get("uploads") or []:
+            rows.append(("upload", course_id, upload.get("id"), activity_id, upload.get("name") or "", activity_title))
+
+    for exam in (raw_exams or {}).get("exams") or []:
+        rows.append(("exam", course_id, exam.get("id"), 0, exam.get("title") or "", html_text(exam.get("description"))))
+
+    for classroom in (raw_classrooms or {}).get("classrooms") or []:
+        rows.append(("classroom", course_id, classroom.get("id"), 0, classroom.get("title") or "", ""))
+
+    return [row for row in rows if row[2] != None]
+
+
+def reindex_course(conn: sqlite3.Connection, course_id: int, raw_activities: dict, raw_exams: dict, raw_classrooms: dict):
+    """重建一门课程的检索条目，需在调用方的事务中执行。"""
+    conn.execute("DELETE FROM search_items WHERE course_id = ?", (course_id,))
+    conn.executemany(
+        "INSERT INTO search_items (kind, course_id, item_id, parent_id, title, body) VALUES (?, ?, ?, ?, ?, ?)",
+        build_course_rows(course_id, raw_activities, raw_exams, raw_classrooms)
+    )
+
+
+@dataclass(slots=True, frozen=True)
+class SearchHit:
+    kind: str
+    course_id: int
+    course_name: str
+    item_id: int
+    parent_id: int
+    title: str
+    body: str
+
+
+def _fts_query(terms: list[str]) -> str:
+    # 每个词作为短语加引号，词之间为隐式 AND
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def search(
+    conn: sqlite3.Connection,
+    query: str,
+    kinds: list[str] | None = None,
+    course_id: int | None = None,
+    limit: int = 20,
+) -> list[SearchHit]:
+    terms = query.split()
+    if not terms:
+        return []
+
+    row = conn.execute("SELECT value FROM meta WHERE key = 'search_backend'").fetchone()
+    backend = row[0] if row else "like"
+
+    filters, params = [], []
+    if kinds:
+        filters.append(f"search_items.kind IN ({', '.join('?' * len(kinds))})")
+        params.extend(kinds)
+    if course_id != None:
+        filters.append("search_items.course_id = ?")
+        params.append(course_id)
+
+    columns = """
+        search_items.kind, search_items.course_id, courses.name, search_items.item_id,
+        search_items.parent_id, search_items.title, search_items.body
+    """
+    use_fts = backend == "unicode61" or (backend == "trigram" and all(len(term) >= TRIGRAM_MIN_LENGTH for term in terms))
+    if use_fts:
+        where = " AND ".join(["search_fts MATCH ?", *filters])
+        sql = f"""
+            SELECT {columns} FROM search_fts
+            JOIN search_items ON search_items.rowid = search_fts.rowid
+            JOIN courses ON courses.id = search_items.course_id
+            WHERE {where}
+            ORDER BY bm25(search_fts, 10.0, 1.0)
+            LIMIT ?
+        """
+        params = [_fts_query(terms), *params, limit]
+    else:
+        like_filters, like_params = [], []
+        for term in terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            like_filters.append("(search_items.title LIKE ? ESCAPE '\\' OR search_items.body LIKE ? ESCAPE '\\')")
+            like_params.extend([pattern, pattern])
+        where = " AND ".join([*like_filters, *filters])
+        # 标题命中的排在简介命中的前面
+        sql = f"""
+            SELECT {columns} FROM search_items
+            JOIN courses ON courses.id = search_items.course_id
+            WHERE {where}
+            ORDER BY (search_items.title LIKE ? ESCAPE '\\') DESC, search_items.course_id DESC, search_items.rowid
+            LIMIT ?
+        """
+        params = [*like_params, *params, like_params[0], limit]
+
+    return [SearchHit(*row) for row in conn.execute(sql, params)]
@@ -0,0 +1,493 @@
+"""学在浙大数据的本地 SQLite 镜像。
+
+镜像保存课程列表、每门课程的章节/活动/测试/课堂任务/附件以及待办清单，供 `--offline`
+直接读取。原始响应按 (课程, 接口) 原样存入 `course_payloads`，离线读取时还原为与在线
+请求相同的结构，渲染代码无需区分数据来源；同时拆分为各实体表，便于按字段查询。
+
+增量刷新依赖每份响应的 sha256：响应未变化时跳过写入，课程列表条目未变化且内容
+未过期的课程不再请求其内容。
+
+`prefetched_responses` 保存后台预取到的 GET 响应，供随后的在线命令直接使用，见 `prefetch.py`。
+
+数据库使用 WAL 模式，表结构通过 `PRAGMA user_version` 记录版本，启动时按顺序执行
+`MIGRATIONS` 中尚未应用的迁移。
+"""
+import hashlib
+import logging
+import sqlite3
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+from ..codec import json_codec
+from ..load_config.load_config import resource_path
+from .search import (
+    SearchHit,
+    execute_script,
+    migrate_search_index,
+    reindex_course,
+    search,
+)
+
+logger = logging.getLogger(__name__)
+
+MIRROR_PATH = resource_path("data") / "mirror" / "mirror.sqlite3"
+
+# coursePreviewAPIFits 与 courseViewAPIFits 的接口名，也是 course_payloads 中的 api 列取值
+COURSE_PREVIEW_APIS = ("view", "modules")
+COURSE_VIEW_APIS = ("activities", "exams", "classrooms", "activities_reads", "homework-completeness", "exam-completeness")
+# 一门课程的完整内容，全部拉取成功才更新 content_refreshed_at
+COURSE_CONTENT_APIS = COURSE_PREVIEW_APIS + COURSE_VIEW_APIS
+
+# 下标 i 的迁移将 user_version 从 i 升级到 i + 1，只能追加，不能修改已发布的迁移。
+# 迁移可以是 SQL 脚本，也可以是接受连接的函数（用于需要按运行环境选择结构的情况）
+MIGRATIONS: list[str | Callable[[sqlite3.Connection], None]] = [
+    """
+    CREATE TABLE meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE courses (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        academic_year TEXT,
+        raw BLOB NOT NULL,
+        sha TEXT NOT NULL,
+        listed_at REAL NOT NULL,
+        content_refreshed_at REAL
+    );
+    CREATE TABLE course_payloads (
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        api TEXT NOT NULL,
+        raw BLOB NOT NULL,
+        sha TEXT NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (course_id, api)
+    );
+    CREATE TABLE modules (
+        id INTEGER PRIMARY KEY,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        sort INTEGER NOT NULL,
+        name TEXT
+    );
+    CREATE TABLE activities (
+        id INTEGER PRIMARY KEY,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        module_id INTEGER,
+        title TEXT,
+        type TEXT,
+        start_time TEXT,
+        end_time TEXT
+    );
+    CREATE TABLE exams (
+        id INTEGER PRIMARY KEY,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        module_id INTEGER,
+        title TEXT,
+        type TEXT,
+        start_time TEXT,
+        end_time TEXT
+    );
+    CREATE TABLE classrooms (
+        id INTEGER PRIMARY KEY,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        module_id INTEGER,
+        title TEXT,
+        type TEXT,
+        status TEXT,
+        start_at TEXT
+    );
+    CREATE TABLE uploads (
+        id INTEGER NOT NULL,
+        activity_id INTEGER NOT NULL,
+        course_id INTEGER NOT NULL REFERENCES courses(id) ON DELETE CASCADE,
+        name TEXT,
+        size INTEGER,
+        PRIMARY KEY (activity_id, id)
+    );
+    CREATE TABLE todos (
+        id INTEGER NOT NULL,
+        type TEXT NOT NULL,
+        course_id INTEGER,
+        course_name TEXT,
+        title TEXT,
+        end_time TEXT,
+        raw BLOB NOT NULL,
+        PRIMARY KEY (type, id)
+    );
+    CREATE INDEX modules_course ON modules(course_id);
+    CREATE INDEX activities_course ON activities(course_id);
+    CREATE INDEX exams_course ON exams(course_id);
+    CREATE INDEX classrooms_course ON classrooms(course_id);
+    CREATE INDEX uploads_course ON uploads(course_id);
+    """,
+    migrate_search_index,
+    """
+    CREATE TABLE prefetched_responses (
+        url TEXT PRIMARY KEY,
+        raw BLOB NOT NULL,
+        fetched_at REAL NOT NULL
+    );
+    """,
+    # 预取响应按会话区分，切换账号或重新登录后不再读到其他会话的响应
+    """
+    DROP TABLE prefetched_responses;
+    CREATE TABLE prefetched_responses (
+        session TEXT NOT NULL,
+        url TEXT NOT NULL,
+        raw BLOB NOT NULL,
+        fetched_at REAL NOT NULL,
+        PRIMARY KEY (session, url)
+    );
+    """,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def payload_sha(raw: dict) -> str:
+    return hashlib.sha256(json_codec.dumps(raw)).hexdigest()
+
+
+class MirrorStore:
+    """镜像数据库的读写入口，可作为上下文管理器使用以在结束时关闭连接。"""
+
+    def __init__(self, path: Path | None = None):
+        self.path = path or MIRROR_PATH
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None 关闭隐式事务，事务边界由 transaction() 显式控制
+        self.conn = sqlite3.connect(self.path, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.migrate()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def transaction(self):
+        return _Transaction(self.conn)
+
+    @property
+    def schema_version(self) -> int:
+        return self.conn.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self):
+        version = self.schema_version
+        if version > SCHEMA_VERSION:
+            logger.warning(f"镜像数据库版本 {version} 高于当前支持的 {SCHEMA_VERSION}，可能由更新版本的 lazy 创建")
+            return
+
+        for target, script in enumerate(MIGRATIONS[version:], start=version + 1):
+            logger.info(f"镜像数据库迁移至版本 {target}")
+            with self.transaction():
+                if callable(script):
+                    script(self.conn)
+                else:
+                    execute_script(self.conn, script)
+                self.conn.execute(f"PRAGMA user_version = {target}")
+
+    # --- 写入 ---
+
+    def set_meta(self, key: str, value: str):
+        self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def get_meta(self, key: str) -> str | None:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def upsert_courses(self, raw_courses: list[dict], prune: bool) -> list[int]:
+        """写入课程列表条目，返回新增或发生变化的课程ID。
+
+        prune 为 True 时删除不在本次列表中的课程及其全部内容，只应在拉取了完整列表时使用。
+        """
+        now = time.time()
+        changed: list[int] = []
+        with self.transaction():
+            old_shas = {row["id"]: row["sha"] for row in self.conn.execute("SELECT id, sha FROM courses")}
+            for raw in raw_courses:
+                course_id = raw.get("id")
+                if course_id == None:
+                    continue
+
+                sha = payload_sha(raw)
+                if old_shas.get(course_id) == sha:
+                    self.conn.execute("UPDATE courses SET listed_at = ? WHERE id = ?", (now, course_id))
+                    continue
+
+                changed.append(course_id)
+                self.conn.execute(
+                    """
+                    INSERT INTO courses (id, name, academic_year, raw, sha, listed_at) VALUES (?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(id) DO UPDATE SET
+                        name = excluded.name, academic_year = excluded.academic_year,
+                        raw = excluded.raw, sha = excluded.sha, listed_at = excluded.listed_at
+                    """,
+                    (course_id, raw.get("name", "N/A"), (raw.get("academic_year") or {}).get("name"), json_codec.dumps(raw), sha, now)
+                )
+
+            if prune:
+                listed_ids = {raw.get("id") for raw in raw_courses}
+                stale_ids = [(course_id,) for course_id in old_shas if course_id not in listed_ids]
+                if stale_ids:
+                    logger.info(f"镜像中移除 {len(stale_ids)} 门已不在列表中的课程")
+                    self.conn.executemany("DELETE FROM courses WHERE id = ?", stale_ids)
+
+            self.set_meta("courses_listed_at", str(now))
+
+        return changed
+
+    def courses_due(self, course_ids: list[int], max_age: float) -> list[int]:
+        """返回内容从未拉取过或已超过 max_age 秒的课程ID。"""
+        deadline = time.time() - max_age
+        due = []
+        for course_id in course_ids:
+            row = self.conn.execute("SELECT content_refreshed_at FROM courses WHERE id = ?", (course_id,)).fetchone()
+            if row == None or row["content_refreshed_at"] == None or row["content_refreshed_at"] < deadline:
+                due.append(course_id)
+        return due
+
+    def save_course_payloads(self, course_id: int, payloads: dict[str, dict]) -> bool:
+        """保存一门课程的接口响应并重建对应的实体表，返回内容是否发生变化。
+
+        空响应（请求失败）不会覆盖已有数据。只有 COURSE_CONTENT_APIS 全部成功时才记为已刷新，
+        只带部分接口的写入（如 syllabus 只拉取章节）不会让 `mirror refresh` 跳过该课程。
+        """
+        now = time.time()
+        changed_apis = set()
+        with self.transaction():
+            old_shas = {
+                row["api"]: row["sha"]
+                for row in self.conn.execute("SELECT api, sha FROM course_payloads WHERE course_id = ?", (course_id,))
+            }
+            for api, raw in payloads.items():
+                if not raw:
+                    continue
+
+                sha = payload_sha(raw)
+                if old_shas.get(api) == sha:
+                    continue
+
+                changed_apis.add(api)
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO course_payloads (course_id, api, raw, sha, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                    (course_id, api, json_codec.dumps(raw), sha, now)
+                )
+
+            if "modules" in changed_apis:
+                self._rebuild_modules(course_id, payloads["modules"])
+            if "activities" in changed_apis:
+                self._rebuild_activities(course_id, payloads["activities"])
+            if "exams" in changed_apis:
+                self._rebuild_exams(course_id, payloads["exams"])
+            if "classrooms" in changed_apis:
+                self._rebuild_classrooms(course_id, payloads["classrooms"])
+
+            if changed_apis & {"activities", "exams", "classrooms"}:
+                reindex_course(self.conn, course_id, *self._latest_payloads(course_id, payloads, ("activities", "exams", "classrooms")))
+
+            if all(payloads.get(api) for api in COURSE_CONTENT_APIS):
+                self.conn.execute("UPDATE courses SET content_refreshed_at = ? WHERE id = ?", (now, course_id))
+
+        return bool(changed_apis)
+
+    def _latest_payloads(self, course_id: int, payloads: dict[str, dict], apis: tuple[str, ...]) -> list[dict]:
+        # 本次请求失败的接口沿用镜像中的旧响应
+        latest = []
+        for api in apis:
+            raw = payloads.get(api)
+            if not raw:
+                row = self.conn.execute("SELECT raw FROM course_payloads WHERE course_id = ? AND api = ?", (course_id, api)).fetchone()
+                raw = json_codec.loads(row["raw"]) if row else {}
+            latest.append(raw)
+        return latest
+
+    def ingest_course_payloads(self, course_id: int, payloads: dict[str, dict]) -> bool:
+        """在线命令拉取到课程内容后顺带写入镜像，镜像尚未收录该课程时忽略。"""
+        if self.conn.execute("SELECT 1 FROM courses WHERE id = ?", (course_id,)).fetchone() == None:
+            return False
+        return self.save_course_payloads(course_id, payloads)
+
+    def _rebuild_modules(self, course_id: int, raw: dict):
+        self.conn.execute("DELETE FROM modules WHERE course_id = ?", (course_id,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO modules (id, course_id, sort, name) VALUES (?, ?, ?, ?)",
+            [(module.get("id"), course_id, index, module.get("name")) for index, module in enumerate(raw.get("modules") or [])]
+        )
+
+    def _rebuild_activities(self, course_id: int, raw: dict):
+        activities = raw.get("activities") or []
+        self.conn.execute("DELETE FROM activities WHERE course_id = ?", (course_id,))
+        self.conn.execute("DELETE FROM uploads WHERE course_id = ?", (course_id,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO activities (id, course_id, module_id, title, type, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (activity.get("id"), course_id, activity.get("module_id"), activity.get("title"), activity.get("type"), activity.get("start_time"), activity.get("end_time"))
+                for activity in activities
+            ]
+        )
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO uploads (id, activity_id, course_id, name, size) VALUES (?, ?, ?, ?, ?)",
+            [
+                (upload.get("id"), activity.get("id"), course_id, upload.get("name"), upload.get("size"))
+                for activity in activities
+                for upload in activity.get("uploads") or []
+            ]
+        )
+
+    def _rebuild_exams(self, course_id: int, raw: dict):
+        self.conn.execute("DELETE FROM exams WHERE course_id = ?", (course_id,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO exams (id, course_id, module_id, title, type, start_time, end_time) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (exam.get("id"), course_id, exam.get("module_id"), exam.get("title"), exam.get("type"), exam.get("start_time"), exam.get("end_time"))
+                for exam in raw.get("exams") or []
+            ]
+        )
+
+    def _rebuild_classrooms(self, course_id: int, raw: dict):
+        self.conn.execute("DELETE FROM classrooms WHERE course_id = ?", (course_id,))
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO classrooms (id, course_id, module_id, title, type, status, start_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (classroom.get("id"), course_id, classroom.get("module_id"), classroom.get("title"), classroom.get("type"), classroom.get("status"), classroom.get("start_at"))
+                for classroom in raw.get("classrooms") or []
+            ]
+        )
+
+    def save_todos(self, raw_todo_list: dict):
+        """整体替换待办清单，响应异常时保留旧数据。"""
+        todos = raw_todo_list.get("todo_list")
+        if type(todos) != list:
+            logger.warning("待办清单响应异常，镜像保留旧数据")
+            return
+
+        with self.transaction():
+            self.conn.execute("DELETE FROM todos")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO todos (id, type, course_id, course_name, title, end_time, raw) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (todo.get("id"), todo.get("type", "null"), todo.get("course_id"), todo.get("course_name"), todo.get("title"), todo.get("end_time"), json_codec.dumps(todo))
+                    for todo in todos
+                ]
+            )
+            self.set_meta("todos_refreshed_at", str(time.time()))
+
+    def save_prefetched(self, session: str, responses: dict[str, bytes], max_age: float, since: float):
+        """写入会话 session 后台预取到的 GET 响应（URL -> 原始响应体），同时清理超过 max_age 秒的旧响应。
+
+        预取开始（since）之后有命令发出过修改请求时，记录到的响应可能是修改前的数据，整批丢弃。
+        """
+        now = time.time()
+        with self.transaction():
+            self.conn.execute("DELETE FROM prefetched_responses WHERE fetched_at < ?", (now - max_age,))
+            if float(self.get_meta("prefetch_invalidated_at") or 0) >= since:
+                logger.info("预取期间发出过修改请求，丢弃本次预取的响应")
+                return
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO prefetched_responses (session, url, raw, fetched_at) VALUES (?, ?, ?, ?)",
+                [(session, url, raw, now) for url, raw in responses.items()]
+            )
+
+    def clear_prefetched(self):
+        with self.transaction():
+            self.conn.execute("DELETE FROM prefetched_responses")
+            self.set_meta("prefetch_invalidated_at", str(time.time()))
+
+    # --- 读取，返回与对应接口响应相同的结构 ---
+
+    def courses_page(self, keyword: str | None, page: int = 1, page_size: int | None = None) -> dict:
+        """按 coursesListAPIFits 的响应结构返回课程列表，page_size 为 None 时返回全部。"""
+        where, params = "", []
+        if keyword:
+            where, params = "WHERE name LIKE ?", [f"%{keyword}%"]
+
+        total = self.conn.execute(f"SELECT COUNT(*) FROM courses {where}", params).fetchone()[0]
+        query = f"SELECT raw FROM courses {where} ORDER BY id DESC"
+        if page_size != None:
+            query += " LIMIT ? OFFSET ?"
+            params = [*params, page_size, page_size * (page - 1)]
+
+        courses = [json_codec.loads(row["raw"]) for row in self.conn.execute(query, params)]
+        pages = 1 if page_size == None else -(-total // page_size)
+        return {"total": total, "pages": pages, "page": page, "courses": courses}
+
+    def course_payloads(self, course_id: int, apis: tuple[str, ...]) -> list[dict] | None:
+        """按 apis 的顺序返回课程的原始响应，缺失的接口为空 dict；课程内容从未拉取过时返回 None。"""
+        rows = {
+            row["api"]: row["raw"]
+            for row in self.conn.execute("SELECT api, raw FROM course_payloads WHERE course_id = ?", (course_id,))
+        }
+        if not rows:
+            return None
+        return [json_codec.loads(rows[api]) if api in rows else {} for api in apis]
+
+    def todo_list(self) -> dict | None:
+        """按 assignmentTodoListAPIFits 的响应结构返回待办清单，从未刷新过时返回 None。"""
+        if self.get_meta("todos_refreshed_at") == None:
+            return None
+        return {"todo_list": [json_codec.loads(row["raw"]) for row in self.conn.execute("SELECT raw FROM todos")]}
+
+    def prefetched(self, session: str, max_age: float) -> dict[str, bytes]:
+        """返回会话 session 在 max_age 秒内预取到的 GET 响应，URL -> 原始响应体。"""
+        return {
+            row["url"]: row["raw"]
+            for row in self.conn.execute(
+                "SELECT url, raw FROM prefetched_responses WHERE session = ? AND fetched_at >= ?",
+                (session, time.time() - max_age)
+            )
+        }
+
+    def search(self, query: str, kinds: list[str] | None = None, course_id: int | None = None, limit: int = 20) -> list[SearchHit]:
+        return search(self.conn, query, kinds, course_id, limit)
+
+    def status(self) -> dict:
+        counts = {
+            table: self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("courses", "modules", "activities", "exams", "classrooms", "uploads", "todos", "search_items")
+        }
+        refreshed = self.conn.execute("SELECT COUNT(*) FROM courses WHERE content_refreshed_at IS NOT NULL").fetchone()[0]
+        return {
+            "path": str(self.path),
+            "schema_version": self.schema_version,
+            "size": sum(path.stat().st_size for path in self.path.parent.glob(f"{self.path.name}*")),
+            "courses_listed_at": self.get_meta("courses_listed_at"),
+            "todos_refreshed_at": self.get_meta("todos_refreshed_at"),
+            "courses_with_content": refreshed,
+            "search_backend": self.get_meta("search_backend"),
+            "counts": counts,
+        }
+
+
+def ingest(callback: Callable[["MirrorStore"], object]):
+    """在线命令顺带写入镜像的入口，写入失败只记录日志，不影响命令本身。"""
+    try:
+        with MirrorStore() as store:
+            callback(store)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"镜像写入失败: {e}")
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT，异常时回滚。"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type == None:
+            self.conn.execute("COMMIT")
+        else:
+            self.conn.execute("ROLLBACK")
+        return False
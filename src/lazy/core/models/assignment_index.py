@@ -0,0 +1,64 @@
+"""任务 id -> 任务类型 的持久化索引。
+
+学在浙大的作业、测试与课堂任务分属不同接口，只凭 id 无法得知类型。索引的来源有两个：
+浏览课程目录时拿到的活动/测试/课堂任务列表，以及 `assignment view` 的类型探测结果。
+不同类型的 id 空间彼此独立，同一 id 可能同时对应多种任务，遇到冲突时标记为歧义，
+之后对该 id 始终重新探测。
+"""
+import logging
+
+from ..load_config import load_config
+
+logger = logging.getLogger(__name__)
+
+KIND_ACTIVITY = "activity"
+KIND_FORUM = "forum"
+KIND_EXAM = "exam"
+KIND_CLASSROOM = "classroom"
+KIND_AMBIGUOUS = ""
+
+KINDS = (KIND_ACTIVITY, KIND_FORUM, KIND_EXAM, KIND_CLASSROOM)
+
+
+class AssignmentTypeIndex:
+    def __init__(self):
+        self.config = load_config.assignmentTypeIndexConfig()
+        self.index: dict[str, str] = self.config.load_config()
+
+    def lookup(self, assignment_id: int) -> str | None:
+        """返回已知的任务类型，未收录或存在歧义时返回 None。"""
+        kind = self.index.get(str(assignment_id))
+        if kind in KINDS:
+            return kind
+        return None
+
+    def merge(self, kinds: dict[int, str]) -> bool:
+        """合并新的 id -> 类型 记录，返回索引是否发生变化。"""
+        changed = False
+        for assignment_id, kind in kinds.items():
+            key = str(assignment_id)
+            old_kind = self.index.get(key)
+            if old_kind == kind:
+                continue
+            new_kind = kind if old_kind == None else KIND_AMBIGUOUS
+            if old_kind == new_kind:
+                continue
+            self.index[key] = new_kind
+            changed = True
+        return changed
+
+    def remember(self, kinds: dict[int, str]):
+        if not kinds or not self.merge(kinds):
+            return
+        try:
+            self.config.update_config(self.index)
+        except OSError as e:
+            logger.warning(f"任务类型索引写入失败: {e}")
+
+    def forget(self, assignment_id: int):
+        if self.index.pop(str(assignment_id), None) == None:
+            return
+        try:
+            self.config.update_config(self.index)
+        except OSError as e:
+            logger.warning(f"任务类型索引写入失败: {e}")
@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+
+from .assignment_index import (
+    KIND_ACTIVITY,
+    KIND_AMBIGUOUS,
+    KIND_CLASSROOM,
+    KIND_EXAM,
+    KIND_FORUM,
+)
+from .models import Activity, Classroom, Exam, Module, parse_list
+
+
+@dataclass(slots=True)
+class ModuleNode:
+    module: Module
+    activities: list[Activity] = field(default_factory=list)
+    exams: list[Exam] = field(default_factory=list)
+    classrooms: list[Classroom] = field(default_factory=list)
+
+
+class CourseTree:
+    """课程目录索引。
+
+    每次拉取课程内容后构建一次：章节按 id 建立索引，活动、测试与课堂任务各自只遍历一遍
+    挂到所属章节下，完成情况保存为 id 集合，渲染时均为 O(1) 查询。
+    """
+
+    def __init__(
+        self,
+        course_id: int,
+        modules: list[Module],
+        activities: list[Activity],
+        exams: list[Exam],
+        classrooms: list[Classroom],
+        completed_activity_ids: set[int],
+        completed_exam_ids: set[int],
+        completed_classroom_ids: set[int],
+    ):
+        self.course_id = course_id
+        self.modules = modules
+        self.activities = activities
+        self.exams = exams
+        self.classrooms = classrooms
+        self.completed_activity_ids = completed_activity_ids
+        self.completed_exam_ids = completed_exam_ids
+        self.completed_classroom_ids = completed_classroom_ids
+        self.nodes: dict[int, ModuleNode] = {module.id: ModuleNode(module) for module in modules}
+        # 任务 id -> 类型，供 `assignment view` 免去类型探测
+        self.assignment_kinds: dict[int, str] = {}
+
+        for activity in activities:
+            node = self.nodes.get(activity.module_id)
+            if node is not None:
+                node.activities.append(activity)
+            self._add_kind(activity.id, KIND_FORUM if activity.type == "forum" else KIND_ACTIVITY)
+
+        for exam in exams:
+            node = self.nodes.get(exam.module_id)
+            if node is not None:
+                node.exams.append(exam)
+            self._add_kind(exam.id, KIND_EXAM)
+
+        for classroom in classrooms:
+            node = self.nodes.get(classroom.module_id)
+            if node is not None:
+                node.classrooms.append(classroom)
+            self._add_kind(classroom.id, KIND_CLASSROOM)
+
+    def _add_kind(self, assignment_id: int | None, kind: str):
+        if assignment_id == None:
+            return
+        old_kind = self.assignment_kinds.get(assignment_id)
+        self.assignment_kinds[assignment_id] = kind if old_kind in (None, kind) else KIND_AMBIGUOUS
+
+    @classmethod
+    def from_responses(
+        cls,
+        course_id: int,
+        raw_course_modules: dict,
+        raw_course_activities: dict,
+        raw_course_exams: dict,
+        raw_course_classrooms: dict,
+        raw_course_activities_reads: dict,
+        raw_homework_completeness: dict,
+        raw_exam_completeness: dict,
+    ) -> "CourseTree":
+        """由 coursePreviewAPIFits 的章节响应与 courseViewAPIFits 的六个响应构建索引。"""
+        completed_activity_ids = {
+            homework.get("id")
+            for homework in (raw_homework_completeness or {}).get("homework_activities") or []
+            if homework.get("status") == "已交"
+        }
+        completed_exam_ids = set((raw_exam_completeness or {}).get("exam_ids") or [])
+        completed_classroom_ids = {
+            activity_read.get("activity_id")
+            for activity_read in (raw_course_activities_reads or {}).get("activity_reads") or []
+            if activity_read.get("activity_type") == "classroom_activity"
+        }
+
+        return cls(
+            course_id=course_id,
+            modules=parse_list(raw_course_modules, "modules", Module),
+            activities=parse_list(raw_course_activities, "activities", Activity),
+            exams=parse_list(raw_course_exams, "exams", Exam),
+            classrooms=parse_list(raw_course_classrooms, "classrooms", Classroom),
+            completed_activity_ids=completed_activity_ids,
+            completed_exam_ids=completed_exam_ids,
+            completed_classroom_ids=completed_classroom_ids,
+        )
+
+    def node(self, module_id: int) -> ModuleNode | None:
+        return self.nodes.get(module_id)
+
+    def is_activity_completed(self, activity_id: int) -> bool:
+        return activity_id in self.completed_activity_ids
+
+    def is_exam_completed(self, exam_id: int) -> bool:
+        return exam_id in self.completed_exam_ids
+
+    def is_classroom_completed(self, classroom_id: int) -> bool:
+        return classroom_id in self.completed_classroom_ids
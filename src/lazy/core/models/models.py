@@ -0,0 +1,208 @@
+"""学在浙大高频实体的紧凑模型。
+
+原始响应里每个条目都是带有大量无用字段的嵌套 dict，这里只保留 CLI 渲染
+实际用到的字段，并使用 slots 数据类存储，既减少内存占用，
+也避免渲染循环里层层 `.get()`。所有模型都可以直接序列化（orjson/msgspec 原生
+支持数据类，标准库后端由 json_codec 兜底）。
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+def _name_of(obj: dict | None, default: str = "N/A") -> str:
+    if not obj:
+        return default
+    return obj.get("name") or default
+
+
+@dataclass(slots=True, frozen=True)
+class Course:
+    id: int
+    name: str
+    teaching_class_name: str
+    instructors: tuple[str, ...]
+    department_name: str
+    academic_year_name: str
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Course":
+        course_attributes = raw.get("course_attributes") or {}
+        return cls(
+            id=raw.get("id"),
+            name=raw.get("name", "N/A"),
+            teaching_class_name=course_attributes.get("teaching_class_name") or "N/A",
+            instructors=tuple(t.get("name", "") for t in raw.get("instructors") or []),
+            department_name=_name_of(raw.get("department")),
+            academic_year_name=_name_of(raw.get("academic_year")),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Module:
+    id: int
+    name: str
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Module":
+        return cls(id=raw.get("id"), name=raw.get("name", "null"))
+
+
+@dataclass(slots=True, frozen=True)
+class Upload:
+    id: int
+    name: str
+    size: int
+    updated_at: str | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Upload":
+        return cls(
+            id=raw.get("id"),
+            name=raw.get("name", "null"),
+            size=raw.get("size") or 0,
+            updated_at=raw.get("updated_at"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Activity:
+    id: int
+    title: str
+    type: str
+    module_id: int | None
+    completion_criterion_key: str
+    start_time: str | None
+    end_time: str | None
+    is_started: bool
+    is_closed: bool
+    uploads: tuple[Upload, ...]
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Activity":
+        return cls(
+            id=raw.get("id"),
+            title=raw.get("title", "null"),
+            type=raw.get("type", "null"),
+            module_id=raw.get("module_id"),
+            completion_criterion_key=raw.get("completion_criterion_key") or "none",
+            start_time=raw.get("start_time"),
+            end_time=raw.get("end_time"),
+            is_started=raw.get("is_started", False),
+            is_closed=raw.get("is_closed", False),
+            uploads=tuple(Upload.from_dict(upload) for upload in raw.get("uploads") or []),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Exam:
+    id: int
+    title: str
+    type: str
+    module_id: int | None
+    completion_criterion_key: str
+    start_time: str | None
+    end_time: str | None
+    is_started: bool
+    is_closed: bool
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Exam":
+        return cls(
+            id=raw.get("id"),
+            title=raw.get("title", "null"),
+            type=raw.get("type", "null"),
+            module_id=raw.get("module_id"),
+            completion_criterion_key=raw.get("completion_criterion_key") or "none",
+            start_time=raw.get("start_time"),
+            end_time=raw.get("end_time"),
+            is_started=raw.get("is_started", False),
+            is_closed=raw.get("is_closed", False),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Classroom:
+    id: int
+    title: str
+    type: str
+    module_id: int | None
+    status: str | None
+    start_at: str | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Classroom":
+        return cls(
+            id=raw.get("id"),
+            title=raw.get("title", "null"),
+            type=raw.get("type", "null"),
+            module_id=raw.get("module_id"),
+            status=raw.get("status"),
+            start_at=raw.get("start_at"),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class Todo:
+    id: int
+    title: str
+    type: str
+    course_id: int
+    course_name: str
+    end_time: str | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Todo":
+        return cls(
+            id=raw.get("id"),
+            title=raw.get("title", "null"),
+            type=raw.get("type", "null"),
+            course_id=raw.get("course_id"),
+            course_name=raw.get("course_name", "null"),
+            end_time=raw.get("end_time"),
+        )
+
+    @property
+    def deadline(self) -> datetime | None:
+        if not self.end_time:
+            return None
+        return datetime.fromisoformat(self.end_time.replace('Z', '+00:00'))
+
+
+@dataclass(slots=True, frozen=True)
+class Rollcall:
+    rollcall_id: int
+    course_id: int | None
+    course_title: str
+    created_by_name: str
+    source: str | None
+    is_radar: bool
+    is_number: bool
+    status: str | None
+    rollcall_status: str | None
+    rollcall_time: str | None
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "Rollcall":
+        return cls(
+            rollcall_id=raw.get("rollcall_id"),
+            course_id=raw.get("course_id"),
+            course_title=raw.get("course_title", "null"),
+            created_by_name=raw.get("created_by_name", "null"),
+            source=raw.get("source"),
+            is_radar=raw.get("is_radar", False),
+            is_number=raw.get("is_number", False),
+            status=raw.get("status"),
+            rollcall_status=raw.get("rollcall_status"),
+            rollcall_time=raw.get("rollcall_time"),
+        )
+
+
+def parse_list(raw: dict | None, key: str, model: type[T]) -> list[T]:
+    """从已解码的响应中取出 `key` 对应的列表并转换为模型。"""
+    if not raw:
+        return []
+    items = raw.get(key) or []
+    return [model.from_dict(item) for item in items if isinstance(item, dict)]
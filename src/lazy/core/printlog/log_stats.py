@@ -0,0 +1,105 @@
+"""离线统计 JSON 日志中的接口请求耗时。
+
+读取 `lazy log export` 导出的日志压缩包（也可以直接给出 `lazy_cli.jsonl` 文件），
+按 api_name 汇总请求事件的次数、失败数与耗时分位数。
+"""
+import logging
+import zipfile
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..codec import json_codec
+from .structured import REQUEST_EVENT
+
+logger = logging.getLogger(__name__)
+
+JSON_LOG_PREFIX = "lazy_cli.jsonl"
+PERCENTILES = (50, 90, 99)
+
+@dataclass(slots=True)
+class EndpointStats:
+    api_name: str
+    count: int
+    errors: int
+    p50: float
+    p90: float
+    p99: float
+    max: float
+    avg_bytes: float
+
+def _iter_lines(path: Path)->Iterator[bytes]:
+    if not zipfile.is_zipfile(path):
+        with open(path, "rb") as f:
+            yield from f
+        return
+
+    with zipfile.ZipFile(path) as zf:
+        # 导出时保留了原始路径，按文件名匹配当前与轮转后的 JSON 日志
+        for name in zf.namelist():
+            if Path(name).name.startswith(JSON_LOG_PREFIX):
+                with zf.open(name) as f:
+                    yield from f
+
+def request_events(path: Path)->Iterator[dict]:
+    """逐条读取请求事件，无法解析的行被跳过"""
+    skipped = 0
+    for line in _iter_lines(path):
+        if not line.strip():
+            continue
+        try:
+            entry = json_codec.loads(line)
+        except json_codec.JSONDecodeError:
+            skipped += 1
+            continue
+        if isinstance(entry, dict) and entry.get("event") == REQUEST_EVENT:
+            yield entry
+
+    if skipped:
+        logger.warning(f"{path} 中有 {skipped} 行无法解析")
+
+def percentile(sorted_values: list[float], q: float)->float:
+    """最近秩法分位数，sorted_values 须已升序排列且非空"""
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+def is_error(status)->bool:
+    return not isinstance(status, int) or status >= 400
+
+def latency_stats(events: Iterable[dict], keyword: str|None = None)->list[EndpointStats]:
+    """按接口汇总，keyword 不为空时只统计 api_name 包含它的接口；按请求次数降序返回"""
+    durations: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    sizes: dict[str, int] = defaultdict(int)
+
+    for event in events:
+        api_name = event.get("api_name") or "unknown"
+        if keyword and keyword not in api_name:
+            continue
+        duration = event.get("duration_ms")
+        if not isinstance(duration, (int, float)):
+            continue
+
+        durations[api_name].append(float(duration))
+        sizes[api_name] += event.get("bytes") or 0
+        if is_error(event.get("status")):
+            errors[api_name] += 1
+
+    stats = []
+    for api_name, values in durations.items():
+        values.sort()
+        p50, p90, p99 = (percentile(values, q) for q in PERCENTILES)
+        stats.append(EndpointStats(
+            api_name=api_name,
+            count=len(values),
+            errors=errors[api_name],
+            p50=p50,
+            p90=p90,
+            p99=p99,
+            max=values[-1],
+            avg_bytes=sizes[api_name] / len(values)
+        ))
+
+    stats.sort(key=lambda item: item.count, reverse=True)
+    return stats
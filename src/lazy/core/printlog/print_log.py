@@ -1,36 +1,225 @@
+"""全局日志配置。
+
+各模块的日志先由 QueueHandler 放入内存队列，调用方（包括事件循环）只做一次入队；
+格式化与写文件由 QueueListener 的后台线程完成，文件处理器按批写入并刷新，
+每批最多 `LOG_BATCH_SIZE` 条，空闲 `LOG_FLUSH_INTERVAL` 秒或遇到 ERROR 及以上的日志时立即写入。
+
+环境变量 `LAZY_LOG_LEVELS` 控制日志级别，以逗号分隔，不带模块名的一项为全局级别，例如::
+
+    LAZY_LOG_LEVELS="INFO,lazy.server.monitor=WARNING,httpx=WARNING"
+
+高频日志可带上 `extra={"sample_key": ...}`，同一个键每 `LAZY_LOG_SAMPLE` 条（默认 10）只记录一条。
+
+同样的日志另以 JSON 行写入 `lazy_cli.jsonl`，并附带请求关联 ID 与接口请求事件，见 `structured.py`。
+"""
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 
+from .structured import ContextFilter, JsonFormatter, hash_studentid, is_plain_record
+
+LOG_DIR = Path.home() / ".lazy_cli_logs"
+LOG_FILE = LOG_DIR / "lazy_cli.log"
+JSON_LOG_FILE = LOG_DIR / "lazy_cli.jsonl"
+# 最近一次登录的学号摘要，CLI 启动时据此绑定日志上下文，无需访问 keyring
+STUDENTID_HASH_FILE = LOG_DIR / "studentid_hash"
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_LEVELS_ENV = "LAZY_LOG_LEVELS"
+LOG_SAMPLE_ENV = "LAZY_LOG_SAMPLE"
+LOG_DEFAULT_SAMPLE_RATE = 10
+# 每批最多写入的日志条数，以及队列空闲多久后写入未满的一批（秒）
+LOG_BATCH_SIZE = 64
+LOG_FLUSH_INTERVAL = 1.0
+
+logger = logging.getLogger(__name__)
+
+_listener: QueueListener|None = None
+
+def save_studentid_hash(studentid: str):
+    """登录成功后记录学号摘要，不保存学号本身"""
+    try:
+        LOG_DIR.mkdir(exist_ok=True)
+        STUDENTID_HASH_FILE.write_text(hash_studentid(studentid), encoding="utf-8")
+    except OSError as e:
+        logger.warning(f"学号摘要保存失败: {e}")
+
+def load_studentid_hash()->str|None:
+    try:
+        return STUDENTID_HASH_FILE.read_text(encoding="utf-8").strip() or None
+    except OSError:
+        return None
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """按批写入的轮转文件处理器，一批日志只写入并刷新一次"""
+    def __init__(self, *args, batch_size: int = LOG_BATCH_SIZE, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batch_size = batch_size
+        self.buffer: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord):
+        self.buffer.append(record)
+        if len(self.buffer) >= self.batch_size or record.levelno >= logging.ERROR:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            if self.buffer:
+                records, self.buffer = self.buffer, []
+                self._write_batch(records)
+            super().flush()
+
+    def _write_batch(self, records: list[logging.LogRecord]):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + self.terminator)
+            except Exception:
+                self.handleError(record)
+        chunk = "".join(lines)
+
+        try:
+            if self.stream == None:
+                self.stream = self._open()
+            # 按整批的大小判断是否轮转，不再逐条格式化两次
+            position = self.stream.tell()
+            if self.maxBytes > 0 and position > 0 and position + len(chunk.encode(self.encoding or "utf-8")) >= self.maxBytes:
+                self.doRollover()
+                # delay=True 时轮转后不会自动重新打开文件
+                if self.stream == None:
+                    self.stream = self._open()
+            self.stream.write(chunk)
+        except Exception:
+            self.handleError(records[-1])
+
+    def close(self):
+        self.flush()
+        super().close()
+
+class BatchingQueueListener(QueueListener):
+    """队列空闲超过 flush_interval 秒时写入处理器中缓存的日志"""
+    def __init__(self, log_queue, *handlers, flush_interval: float = LOG_FLUSH_INTERVAL):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush()
+
+class DeferredQueueHandler(QueueHandler):
+    """记录原样入队，消息拼接、异常格式化与时间格式化都留到监听线程完成"""
+    def prepare(self, record: logging.LogRecord)->logging.LogRecord:
+        # 同进程内的队列无需 pickle；项目中的日志消息均为已拼好的字符串，不会在入队后被修改
+        return record
+
+class SamplingFilter(logging.Filter):
+    """带有 sample_key 的日志，同一个键每 rate 条只保留一条，ERROR 及以上的日志全部保留"""
+    def __init__(self, rate: int):
+        super().__init__()
+        self.rate = rate
+        self.counts: dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord)->bool:
+        key = getattr(record, "sample_key", None)
+        if key == None or self.rate <= 1 or record.levelno >= logging.ERROR:
+            return True
+
+        count = self.counts.get(key, 0)
+        self.counts[key] = count + 1
+        if count % self.rate:
+            return False
+
+        if count:
+            record.msg = f"{record.msg} (已略去 {self.rate - 1} 条同类日志)"
+        return True
+
+def parse_log_levels(spec: str|None)->dict[str, int]:
+    """解析 LAZY_LOG_LEVELS，返回 模块名 -> 级别，全局级别的模块名为空字符串；无效的项被忽略"""
+    levels = {}
+    for item in (spec or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+
+        name, _, level_name = item.rpartition("=")
+        level = logging.getLevelName(level_name.strip().upper())
+        if not isinstance(level, int):
+            logger.warning(f"忽略无效的日志级别设置: {item}")
+            continue
+        levels[name.strip()] = level
+    return levels
+
+def sample_rate()->int:
+    try:
+        return int(os.environ.get(LOG_SAMPLE_ENV, LOG_DEFAULT_SAMPLE_RATE))
+    except ValueError:
+        return LOG_DEFAULT_SAMPLE_RATE
 
 def setup_global_logging():
     """
     设置全局日志系统
     """
+    global _listener
 
-    # 全局日志文件配置
-    log_dir = Path.home() / ".lazy_cli_logs"
-    log_dir.mkdir(exist_ok=True)
-    log_file = log_dir / "lazy_cli.log"
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return
 
-    # 日志文件格式
-    log_format = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
+    LOG_DIR.mkdir(exist_ok=True)
 
-    # 初始化日志记录器
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    log_file_handler = BatchingRotatingFileHandler(
+        LOG_FILE,
+        maxBytes = LOG_MAX_BYTES,
+        backupCount = LOG_BACKUP_COUNT,
+        encoding = 'utf-8',
+        delay = True
+    )
+    log_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_file_handler.setLevel(logging.DEBUG)
+    log_file_handler.addFilter(is_plain_record)
 
-    # 初始化日志处理器
-    log_file_hanlder = RotatingFileHandler(
-        log_file, 
-        maxBytes = 5 * 1024 * 1024, 
-        backupCount = 3,
-        encoding = 'utf-8'
+    json_file_handler = BatchingRotatingFileHandler(
+        JSON_LOG_FILE,
+        maxBytes = LOG_MAX_BYTES,
+        backupCount = LOG_BACKUP_COUNT,
+        encoding = 'utf-8',
+        delay = True
     )
-    log_file_hanlder.setFormatter(log_format)
-    log_file_hanlder.setLevel(logging.DEBUG)
+    json_file_handler.setFormatter(JsonFormatter())
+    json_file_handler.setLevel(logging.DEBUG)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = DeferredQueueHandler(log_queue)
+    # 上下文须在产生日志的任务中读取，在入队之前附加
+    queue_handler.addFilter(ContextFilter())
+    queue_handler.addFilter(SamplingFilter(sample_rate()))
+
+    root_logger.addHandler(queue_handler)
+    _listener = BatchingQueueListener(log_queue, log_file_handler, json_file_handler)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    # 在添加处理器之后解析，无效设置的警告写入日志文件
+    levels = parse_log_levels(os.environ.get(LOG_LEVELS_ENV))
+    root_logger.setLevel(levels.pop("", logging.INFO))
+    for name, level in levels.items():
+        logging.getLogger(name).setLevel(level)
+
+def stop_logging():
+    """停止后台写入线程，并写入尚未写入的日志"""
+    global _listener
+    if _listener == None:
+        return
 
-    if not logger.handlers:
-        logger.addHandler(log_file_hanlder)
\ No newline at end of file
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
@@ -0,0 +1,119 @@
+"""结构化日志与请求关联 ID。
+
+每条日志在写入队列前由 `ContextFilter` 附上当前上下文的 request_id 与学号摘要，
+这两个值保存在 contextvars 中，随 asyncio 任务自动传递：CLI 每次调用一个 ID，
+lazy-server 每个 HTTP 请求、每个监控周期各一个 ID。
+
+接口请求结束时由 `request_timer` 记录一条请求事件（logger 为 `lazy.request`），带有
+api_name、method、status、duration_ms 与 bytes。全部日志以每行一个 JSON 对象写入
+`lazy_cli.jsonl`，请求事件不写入文本日志；`lazy log stats` 据此统计各接口的耗时分位数。
+"""
+import hashlib
+import logging
+import time
+import uuid
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime
+
+from ..codec import json_codec
+
+REQUEST_LOGGER_NAME = "lazy.request"
+REQUEST_EVENT = "request"
+
+request_id_var: ContextVar[str|None] = ContextVar("lazy_request_id", default=None)
+studentid_hash_var: ContextVar[str|None] = ContextVar("lazy_studentid_hash", default=None)
+
+request_logger = logging.getLogger(REQUEST_LOGGER_NAME)
+
+def new_request_id()->str:
+    return uuid.uuid4().hex[:16]
+
+def hash_studentid(studentid: str)->str:
+    # 只用于在日志中区分用户，学号空间很小，摘要不能视为匿名
+    return hashlib.sha256(studentid.encode()).hexdigest()[:12]
+
+@contextmanager
+def log_context(request_id: str|None = None, studentid: str|None = None, studentid_hash: str|None = None)->Iterator[str]:
+    """在 with 块内绑定 request_id（未给出时生成）与学号摘要，返回 request_id
+
+    只知道摘要时（如 CLI 启动时不读取 keyring）以 studentid_hash 直接给出。
+    """
+    request_id = request_id or new_request_id()
+    request_token = request_id_var.set(request_id)
+    if studentid:
+        studentid_hash = hash_studentid(studentid)
+    studentid_token = studentid_hash_var.set(studentid_hash) if studentid_hash else None
+    try:
+        yield request_id
+    finally:
+        request_id_var.reset(request_token)
+        if studentid_token != None:
+            studentid_hash_var.reset(studentid_token)
+
+@dataclass(slots=True)
+class RequestEvent:
+    api_name: str
+    method: str
+    status: int|str = "error"
+    size: int = 0
+
+    def done(self, status: int, size: int):
+        self.status = status
+        self.size = size
+
+@contextmanager
+def request_timer(api_name: str, method: str)->Iterator[RequestEvent]:
+    """计时一次接口请求，块内调用 event.done 记录状态码与响应大小；未调用即退出（如抛出异常）时状态为 error"""
+    event = RequestEvent(api_name, method)
+    started = time.perf_counter()
+    try:
+        yield event
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+        request_logger.info(
+            f"{event.method} {event.api_name} {event.status} {duration_ms:.0f}ms {event.size}B",
+            extra={
+                "event": REQUEST_EVENT,
+                "api_name": event.api_name,
+                "method": event.method,
+                "status": event.status,
+                "duration_ms": round(duration_ms, 2),
+                "bytes": event.size
+            }
+        )
+
+class ContextFilter(logging.Filter):
+    """在产生日志的任务中读取 contextvars，写入的日志由后台线程格式化时已无法读取"""
+    def filter(self, record: logging.LogRecord)->bool:
+        record.request_id = request_id_var.get()
+        record.studentid_hash = studentid_hash_var.get()
+        return True
+
+def is_plain_record(record: logging.LogRecord)->bool:
+    """请求事件只写入 JSON 日志"""
+    return getattr(record, "event", None) != REQUEST_EVENT
+
+class JsonFormatter(logging.Formatter):
+    REQUEST_FIELDS = ("api_name", "method", "status", "duration_ms", "bytes")
+
+    def format(self, record: logging.LogRecord)->str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).astimezone().isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+            "studentid": getattr(record, "studentid_hash", None)
+        }
+
+        if getattr(record, "event", None) == REQUEST_EVENT:
+            entry["event"] = REQUEST_EVENT
+            entry.update((field, getattr(record, field, None)) for field in self.REQUEST_FIELDS)
+
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+
+        return json_codec.dumps(entry).decode()
@@ -0,0 +1,214 @@
+"""以依赖图批量请求多个接口。
+
+`APIFitsAsync.get_api_data` 只能并发同一对象的几个接口；需要多个对象、且后一步依赖前一步结果的场景
+（如先取测试的提交列表，再取某次提交的详情）可用 BatchExecutor 描述整张依赖图，一次执行：
+
+    batch = BatchExecutor(client.session)
+    batch.add("submissions", "assignment.exam_submission_list", {"exam_id": exam_id})
+    batch.add("detail", "assignment.exam_submission",
+              depends_on=["submissions"],
+              prepare=lambda results: {"exam_id": exam_id, "submission_id": ...})
+    results = await batch.run()
+    results.data("detail")
+
+没有依赖关系的调用全部并发，同时在途的请求不超过 `concurrency` 个；`prepare` 返回 None 的调用被跳过，
+依赖失败的调用默认也被跳过，`skip_on_failure=False` 时仍会调用 `prepare`，由其根据失败的结果决定。
+执行器只依赖 httpx.AsyncClient，CLI 与 lazy-server 均可使用。
+"""
+import asyncio
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+
+from ..codec import json_codec
+from ..printlog.structured import request_timer
+from . import endpoints
+from .endpoints import EndpointError
+
+logger = logging.getLogger(__name__)
+
+BATCH_DEFAULT_CONCURRENCY = 8
+
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+STATUS_SKIPPED = "skipped"
+
+class BatchGraphError(ValueError):
+    """依赖图引用了不存在的调用，或存在环"""
+
+@dataclass(slots=True)
+class BatchResult:
+    key: str
+    status: str
+    # 扇出调用（prepare 返回列表）的 data 为按顺序排列的结果列表，失败的子请求为 {}
+    data: Any = None
+    error: str|None = None
+
+    @property
+    def ok(self)->bool:
+        return self.status == STATUS_OK
+
+class BatchResults(dict[str, BatchResult]):
+    def data(self, key: str, default: Any = None)->Any:
+        """调用成功时返回其响应，否则返回 default（默认为 {}，与 get_api_data 失败时一致）"""
+        result = self.get(key)
+        if result == None or not result.ok:
+            return {} if default == None else default
+        return result.data
+
+@dataclass(slots=True)
+class BatchCall:
+    key: str
+    api_path: str
+    path_params: dict = field(default_factory=dict)
+    params: dict = field(default_factory=dict)
+    depends_on: tuple[str, ...] = ()
+    # 依赖完成后调用，返回本次的路径参数；返回列表时对每一项各发一次请求，返回 None 时跳过
+    prepare: Callable[[BatchResults], dict|list[dict]|None]|None = None
+    skip_on_failure: bool = True
+
+class BatchExecutor:
+    def __init__(self, session: httpx.AsyncClient, concurrency: int = BATCH_DEFAULT_CONCURRENCY):
+        self.session = session
+        self.calls: dict[str, BatchCall] = {}
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def add(
+        self,
+        key: str,
+        api_path: str,
+        path_params: dict|None = None,
+        params: dict|None = None,
+        depends_on: Iterable[str] = (),
+        prepare: Callable[[BatchResults], dict|list[dict]|None]|None = None,
+        skip_on_failure: bool = True
+    )->str:
+        """登记一次调用，`api_path` 形如 `assignment.exam`，返回 key 便于作为其他调用的依赖"""
+        if key in self.calls:
+            raise BatchGraphError(f"调用 {key} 重复登记")
+
+        self.calls[key] = BatchCall(key, api_path, path_params or {}, params or {}, tuple(depends_on), prepare, skip_on_failure)
+        return key
+
+    def _ordered_calls(self)->list[BatchCall]:
+        """按依赖关系排序，依赖不存在或存在环时抛出 BatchGraphError"""
+        ordered: list[BatchCall] = []
+        state: dict[str, int] = {}
+
+        def visit(call: BatchCall, path: tuple[str, ...]):
+            if state.get(call.key) == 2:
+                return
+            if state.get(call.key) == 1:
+                raise BatchGraphError(f"依赖存在环: {' -> '.join(path + (call.key,))}")
+
+            state[call.key] = 1
+            for dependency in call.depends_on:
+                if dependency not in self.calls:
+                    raise BatchGraphError(f"{call.key} 依赖的调用 {dependency} 不存在")
+                visit(self.calls[dependency], path + (call.key,))
+            state[call.key] = 2
+            ordered.append(call)
+
+        for call in self.calls.values():
+            visit(call, ())
+        return ordered
+
+    async def run(self)->BatchResults:
+        results = BatchResults()
+        tasks: dict[str, asyncio.Task] = {}
+
+        # 按拓扑序创建任务，每个任务等待其依赖的任务完成后再发出请求
+        for call in self._ordered_calls():
+            dependencies = [tasks[dependency] for dependency in call.depends_on]
+            tasks[call.key] = asyncio.create_task(self._run_call(call, dependencies, results))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        finally:
+            for task in tasks.values():
+                task.cancel()
+
+        logger.info(
+            f"批量请求完成: {sum(1 for result in results.values() if result.ok)}/{len(results)} 成功, "
+            f"{sum(1 for result in results.values() if result.status == STATUS_SKIPPED)} 跳过"
+        )
+        return results
+
+    async def _run_call(self, call: BatchCall, dependencies: list[asyncio.Task], results: BatchResults):
+        if dependencies:
+            await asyncio.gather(*dependencies)
+
+        failed_dependencies = [dependency for dependency in call.depends_on if not results[dependency].ok]
+        if failed_dependencies and call.skip_on_failure:
+            results[call.key] = BatchResult(call.key, STATUS_SKIPPED, error=f"依赖 {', '.join(failed_dependencies)} 未成功")
+            return
+
+        path_params = call.path_params
+        if call.prepare != None:
+            try:
+                prepared = call.prepare(results)
+            except Exception as e:
+                logger.error(f"{call.key} 准备参数失败: {e}")
+                results[call.key] = BatchResult(call.key, STATUS_FAILED, error=str(e))
+                return
+
+            if prepared == None:
+                results[call.key] = BatchResult(call.key, STATUS_SKIPPED)
+                return
+
+            if isinstance(prepared, list):
+                results[call.key] = await self._fan_out(call, prepared)
+                return
+            path_params = {**call.path_params, **prepared}
+
+        try:
+            data = await self._request(call, path_params)
+        except (httpx.HTTPError, EndpointError, json_codec.JSONDecodeError) as e:
+            logger.error(f"请求 {call.key} ({call.api_path}) 失败: {e}")
+            results[call.key] = BatchResult(call.key, STATUS_FAILED, error=str(e))
+            return
+        results[call.key] = BatchResult(call.key, STATUS_OK, data)
+
+    async def _fan_out(self, call: BatchCall, prepared: list[dict])->BatchResult:
+        responses = await asyncio.gather(
+            *(self._request(call, {**call.path_params, **item}) for item in prepared),
+            return_exceptions=True
+        )
+
+        data = []
+        errors = []
+        for response in responses:
+            if isinstance(response, Exception):
+                logger.error(f"请求 {call.key} ({call.api_path}) 失败: {response}")
+                errors.append(str(response))
+                data.append({})
+            else:
+                data.append(response)
+
+        if errors:
+            return BatchResult(call.key, STATUS_FAILED, data, f"{len(errors)}/{len(prepared)} 个请求失败")
+        return BatchResult(call.key, STATUS_OK, data)
+
+    async def _request(self, call: BatchCall, path_params: dict)->Any:
+        endpoint = endpoints.get_endpoint(call.api_path)
+        if endpoint == None:
+            raise EndpointError(f"{call.api_path}不存在！")
+
+        request_kwargs = {"params": endpoint.params(**call.params)}
+        if endpoint.method != "GET":
+            request_kwargs["json"] = endpoint.data()
+
+        async with self._semaphore:
+            with request_timer(call.api_path, endpoint.method) as event:
+                response = await self.session.request(
+                    endpoint.method,
+                    endpoint.url(**path_params),
+                    follow_redirects=True,
+                    **request_kwargs
+                )
+                event.done(response.status_code, len(response.content))
+        response.raise_for_status()
+        return await json_codec.loads_async(response.content)
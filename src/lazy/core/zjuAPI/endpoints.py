@@ -0,0 +1,143 @@
+"""预编译的接口模板。
+
+`api_list.json` 中的 URL 以 `{name}` 标记路径参数，例如
+`https://courses.zju.edu.cn/api/course/{course_id}/student/{student_id}/rollcalls`。
+配置文件只在修改后重新加载并编译，每次请求只需按名称填入参数；
+params 与 data 模板只读，每次调用都返回新的 dict，并发请求之间互不影响。
+"""
+import copy
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any
+
+from ..load_config import load_config
+
+logger = logging.getLogger(__name__)
+
+_FIELD_PATTERN = re.compile(r"\{(\w+)\}")
+_LEGACY_PLACEHOLDER = re.compile(r"<placeholder\d*>")
+
+class EndpointError(ValueError):
+    """接口模板无效，或生成 URL 时缺少路径参数"""
+
+def _encode_param(value: Any)->Any:
+    # 学在浙大的 conditions 等对象参数需以紧凑 JSON 字符串传递；列表由 httpx 展开为重复的键
+    if isinstance(value, dict):
+        return json.dumps(value, separators=(',', ':'), ensure_ascii=False)
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    name: str
+    method: str
+    template: str
+    fields: tuple[str, ...]
+    # 模板按路径参数切分后的片段，奇数位为参数名
+    _segments: tuple[str, ...] = field(repr=False)
+    _params: MappingProxyType = field(repr=False)
+    _encoded_params: MappingProxyType = field(repr=False)
+    _data: MappingProxyType = field(repr=False)
+
+    @classmethod
+    def compile(cls, name: str, config: dict)->"Endpoint":
+        template = config.get("url")
+        if not template:
+            raise EndpointError(f"{name}参数url缺失！")
+        if _LEGACY_PLACEHOLDER.search(template):
+            raise EndpointError(f"{name}仍在使用旧版 <placeholder> 占位符，请改为 {{参数名}}")
+
+        segments = tuple(_FIELD_PATTERN.split(template))
+        params = config.get("params") or {}
+        return cls(
+            name=name,
+            method=config.get("method", "GET").upper(),
+            template=template,
+            fields=segments[1::2],
+            _segments=segments,
+            _params=MappingProxyType(copy.deepcopy(params)),
+            _encoded_params=MappingProxyType({key: _encode_param(value) for key, value in params.items()}),
+            _data=MappingProxyType(copy.deepcopy(config.get("data") or {}))
+        )
+
+    def url(self, **path_params)->str:
+        """填入路径参数生成 URL，缺少参数时抛出 EndpointError"""
+        if not self.fields:
+            return self.template
+
+        segments = list(self._segments)
+        try:
+            segments[1::2] = [str(path_params[name]) for name in self.fields]
+        except KeyError as e:
+            raise EndpointError(f"{self.name}缺少路径参数 {e.args[0]}") from None
+        return "".join(segments)
+
+    def params(self, **overrides)->dict:
+        """以模板为底合并本次请求的参数，对象类型的参数与模板中的同名对象逐键合并"""
+        params = dict(self._encoded_params)
+        for key, value in overrides.items():
+            template_value = self._params.get(key)
+            if isinstance(value, dict) and isinstance(template_value, dict):
+                value = {**template_value, **value}
+            params[key] = _encode_param(value)
+        return params
+
+    def data(self, **overrides)->dict:
+        """返回请求体模板的副本，并以 overrides 覆盖同名字段"""
+        data = copy.deepcopy(dict(self._data))
+        data.update(overrides)
+        return data
+
+@dataclass(frozen=True, slots=True)
+class EndpointGroup:
+    apis_name: tuple[str, ...]
+    endpoints: MappingProxyType
+
+    def get(self, api_name: str)->Endpoint|None:
+        return self.endpoints.get(api_name)
+
+_catalog: dict[str, EndpointGroup] = {}
+_catalog_signature: tuple[int, int]|None = None
+
+def _compile_catalog(config: dict)->dict[str, EndpointGroup]:
+    catalog = {}
+    for category, group_config in config.items():
+        endpoints = {}
+        for api_name, api_config in (group_config.get("apis_config") or {}).items():
+            try:
+                endpoints[api_name] = Endpoint.compile(api_name, api_config)
+            except EndpointError as e:
+                logger.error(f"{category}.{e}")
+        catalog[category] = EndpointGroup(tuple(group_config.get("apis_name") or ()), MappingProxyType(endpoints))
+    return catalog
+
+def load_catalog()->dict[str, EndpointGroup]:
+    """返回编译后的全部接口，api_list.json 的修改时间与大小不变时直接沿用上次的编译结果"""
+    global _catalog, _catalog_signature
+
+    config_file = load_config.apiListConfig()
+    try:
+        stat = config_file.config_path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+
+    if signature == None or signature != _catalog_signature:
+        _catalog = _compile_catalog(config_file.load_config())
+        _catalog_signature = signature
+        logger.info(f"接口模板已编译: {sum(len(group.endpoints) for group in _catalog.values())} 个接口")
+
+    return _catalog
+
+def get_group(category: str)->EndpointGroup|None:
+    return load_catalog().get(category)
+
+def get_endpoint(api_path: str)->Endpoint|None:
+    """按 `分类.接口名`（如 `assignment.todo`）查找接口"""
+    category, _, api_name = api_path.partition(".")
+    group = get_group(category)
+    return group.get(api_name) if group != None else None
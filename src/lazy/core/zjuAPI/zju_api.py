@@ -1,20 +1,23 @@
 import asyncio
-import json
 import logging
 import mimetypes
 import os
 import re
-from collections.abc import Callable
+from collections import deque
+from collections.abc import AsyncIterator, Callable
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import parse_qs, unquote
 
 import aiofiles
 import httpx
-import requests
 from httpx import ConnectTimeout, HTTPError, HTTPStatusError
 
+from ..codec import json_codec
 from ..load_config import load_config
+from ..printlog.structured import request_timer
+from . import endpoints
+from .endpoints import Endpoint, EndpointError
 
 DOWNLOAD_DIR = Path.home() / "Downloads"
 
@@ -52,175 +55,28 @@ class fileUploadProgressWrapper:
     def __len__(self):
         return self._total_size
 
-class APIFits:
-    def __init__(self, login_session: requests.Session, name, apis_name: list[str]|None = None, apis_config: dict|None = None, parent_dir = None, data = None):
-        self.login_session = login_session
-        self.name = name
-        self.config = load_config.apiListConfig().load_config().get(self.name, None)
-        self.apis_name = apis_name
-        self.apis_config = apis_config
-        self.parent_dir = parent_dir if parent_dir else name
-        self.data = data
-    
-    def _load_api_config(self):
-        if self.config == None:
-            logger.error(f"{self.name}配置项不存在！")
-        else:
-            if self.apis_name == None:
-                self.apis_name = self.config.get("apis_name", None)
-            
-            if self.apis_config == None:
-                self.apis_config = self.config.get("apis_config", None)
-
-        if self.apis_name == None:
-            logger.error(f"{self.name}配置项\"apis_name\"不存在！")
-        
-        if self.apis_config == None:
-            logger.error(f"{self.name}配置项\"apis_config\"不存在！")
-
-    def get_api_data(self, auto_load: bool = False)->list[dict]:
-        results_json = []
-        
-        if self.apis_name == None or self.apis_config == None:
-            self._load_api_config()
-
-        for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
-            if api_config == None:
-                logger.error(f"{api_name}不存在！")
-                continue
-            
-            api_url = self._make_api_url(api_config, api_name)
-            if api_url == None:
-                logger.error(f"{api_name}的{api_url}不存在！")
-                continue
-
-            api_params = self._make_api_params(api_config = api_config, api_name=api_name)
-            logger.info(f"请求 {api_url} 中...")
-            logger.info(f"参数为 {api_config.items()}")
-            
-            try:
-                api_respone = self.login_session.get(url = api_url, params = api_params)
-                api_respone.raise_for_status()
-            except HTTPError as e:
-                logger.error(f"请求{api_respone.url}时发生错误。{e}")
-                results_json.append({})
-                continue
-            
-            api_respone_json = api_respone.json()
-
-            if auto_load:
-                api_json_file = load_config.apiConfig(self.parent_dir, api_name)
-                api_json_file.update_config(config_data = api_respone_json)
-
-            results_json.append(api_respone_json)
-
-        return results_json
-
-    def post_api_data(self)->list[dict]:
-        all_api_response = []
-        if self.apis_name == None or self.apis_config == None:
-            self._load_api_config()
-        
-        for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
-            if api_config == None:
-                logger.error(f"{api_name}不存在！")
-                continue
-                
-            if not self.check_api_method(api_config, "POST"):
-                logger.error("该方法只适用POST请求！")
-                raise RuntimeError
-
-            api_url = self._make_api_url(api_config, api_name)
-            if api_url == None:
-                logger.error(f"{api_name}的{api_url}不存在！")
-                continue
-
-            logger.info(f"请求 {api_url} 中...")
-            if self.data:
-                logger.info(f"载荷为 {self.data.items()}")
-            
-            try:
-                api_respone = self.login_session.post(url = api_url, json = self.data)
-                api_respone.raise_for_status()
-            except HTTPError as e:
-                logger.error(f"请求{api_respone.url}时发生错误。{e}")
-                all_api_response.append({})
-                continue
-
-            all_api_response.append(api_respone.json())
-
-        return all_api_response
-    
-    def put_api_data(self)->list[dict|bool]:
-        all_api_response = []
-        if self.apis_name == None or self.apis_config == None:
-            self._load_api_config()
-
-        for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
-            
-            if not api_config:
-                logger.error(f"{api_name}不存在！")
-                continue
-
-            if not self.check_api_method(api_config, "PUT"):
-                logger.error("该方法只适用PUT请求！")
-                raise RuntimeError
-            
-            api_url = self._make_api_url(api_config, api_name)
-            if api_url == None:
-                logger.error(f"{api_name}的{api_url}不存在！")
-                continue
-            
-            logger.info(f"请求 {api_url} 中...")
-            api_response = self.login_session.put(url = api_url, json = self.data)
-            try:
-                api_response.raise_for_status()
-            except HTTPError as e:
-                logger.error(f"Put请求失败！{api_response.url}: {e}")
-                all_api_response.append(False)
-            else:
-                all_api_response.append(api_response.json())
-
-        return all_api_response
-
-    def _make_api_url(self, api_config: dict, api_name):
-        return api_config.get("url")
-    
-    def _make_api_params(self, api_config: dict, api_name: str):
-        return api_config.get("params")
-    
-    def check_api_method(self, apis_config: dict, method: str)->bool:
-        for value in apis_config.values():
-            if value == method:
-                return True
-            
-            if isinstance(value, dict) and self.check_api_method(value, method):
-                    return True
-            
-        return False
-
 class APIFitsAsync:
-    def __init__(self, login_session: httpx.AsyncClient, name, apis_name: list[str]|None = None, apis_config: dict|None = None, parent_dir = None, data = None):
+    def __init__(self, login_session: httpx.AsyncClient, name, apis_name: list[str]|None = None, apis_config: dict[str, Endpoint]|None = None, parent_dir = None, data = None, path_params: dict|None = None):
         self.login_session = login_session
         self.name = name
-        self.config = load_config.apiListConfig().load_config().get(self.name, None)
+        self.config = endpoints.get_group(self.name)
         self.apis_name = apis_name
         self.apis_config = apis_config
         self.parent_dir = parent_dir if parent_dir else name
         self.data = data
+        # 填入 URL 模板的路径参数，如 {"course_id": 1}；查询参数以 params 模板为底合并 self.params
+        self.path_params = path_params or {}
+        self.params = {}
     
     def _load_api_config(self):
         if self.config == None:
             logger.error(f"{self.name}配置项不存在！")
         else:
             if self.apis_name == None:
-                self.apis_name = self.config.get("apis_name", None)
+                self.apis_name = list(self.config.apis_name)
             
             if self.apis_config == None:
-                self.apis_config = self.config.get("apis_config", None)
+                self.apis_config = self.config.endpoints
 
         if self.apis_name == None:
             logger.error(f"{self.name}配置项\"apis_name\"不存在！")
@@ -236,19 +92,19 @@ class APIFitsAsync:
         api_urls = []
         requested_api_names = []
         for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
-            if api_config == None:
+            endpoint = self.apis_config.get(api_name, None)
+            if endpoint == None:
                 logger.error(f"{api_name}不存在！")
                 continue
             
-            api_url    = self._make_api_url(api_config, api_name)
-            api_params = self._make_api_params(api_config = api_config, api_name=api_name)
+            api_url    = self._make_api_url(endpoint, api_name)
+            api_params = self._make_api_params(endpoint, api_name)
 
             if api_url == None:
                 logger.error(f"{api_name}的{api_url}不存在！")
                 continue
 
-            tasks.append(self.login_session.get(url=api_url, params=api_params, follow_redirects=True))
+            tasks.append(self._request(api_name, "GET", api_url, params=api_params))
             api_urls.append(api_url)
             requested_api_names.append(api_name)
 
@@ -265,7 +121,7 @@ class APIFitsAsync:
 
             try:    
                 api_response.raise_for_status()
-                api_respone_json = api_response.json()
+                api_respone_json = await json_codec.loads_async(api_response.content)
             except HTTPStatusError as e:
                 logger.error(f"请求{api_response.url}时发生错误。{e}")
                 results_json.append({})
@@ -274,6 +130,10 @@ class APIFitsAsync:
                 logger.error(f"请求{api_response.url}超时！{e}")
                 results_json.append({})
                 continue
+            except json_codec.JSONDecodeError as e:
+                logger.error(f"解析{api_response.url}的响应失败！{e}")
+                results_json.append({})
+                continue
 
             if auto_load:
                 api_json_file = load_config.apiConfig(self.parent_dir, api_name)
@@ -290,24 +150,24 @@ class APIFitsAsync:
         tasks = []
         api_urls = []
         for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
-            if api_config == None:
+            endpoint = self.apis_config.get(api_name, None)
+            if endpoint == None:
                 logger.error(f"{api_name}不存在！")
                 continue
                 
-            if not self.check_api_method(api_config, "POST"):
+            if not self.check_api_method(endpoint, "POST"):
                 logger.error("该方法只适用POST请求！")
                 continue
 
-            api_url = self._make_api_url(api_config, api_name)
+            api_url = self._make_api_url(endpoint, api_name)
             if api_url == None:
                 logger.error(f"{api_name}的{api_url}不存在！")
                 continue
             
             if not self.data:
-                self.data = self._make_api_data(api_config, api_name)
+                self.data = self._make_api_data(endpoint, api_name)
             
-            tasks.append(self.login_session.post(url=api_url, json=self.data, follow_redirects=True))
+            tasks.append(self._request(api_name, "POST", api_url, json=self.data))
             api_urls.append(api_url)
 
         logger.info(f"请求 {', '.join(api_urls)}")
@@ -326,7 +186,7 @@ class APIFitsAsync:
 
             try:
                 api_response.raise_for_status()
-                all_api_response.append(api_response.json())
+                all_api_response.append(await json_codec.loads_async(api_response.content))
             except HTTPError as e:
                 logger.error(f"请求{api_response.url}时发生错误。{e}")
                 all_api_response.append({})
@@ -345,23 +205,23 @@ class APIFitsAsync:
             self._load_api_config()
 
         for api_name in self.apis_name:
-            api_config: dict = self.apis_config.get(api_name, None)
+            endpoint = self.apis_config.get(api_name, None)
             
-            if not api_config:
+            if not endpoint:
                 logger.error(f"{api_name}不存在！")
                 continue
 
-            if not self.check_api_method(api_config, "PUT"):
+            if not self.check_api_method(endpoint, "PUT"):
                 logger.error("该方法只适用PUT请求！")
                 raise RuntimeError
             
-            api_url = self._make_api_url(api_config, api_name)
+            api_url = self._make_api_url(endpoint, api_name)
             if api_url == None:
                 logger.error(f"{api_name}的{api_url}不存在！")
                 continue
             
             logger.info(f"请求 {api_url} 中...")
-            api_response = await self.login_session.put(url = api_url, json = self.data, follow_redirects=True)
+            api_response = await self._request(api_name, "PUT", api_url, json=self.data)
             try:
                 api_response.raise_for_status()
             except HTTPError as e:
@@ -373,33 +233,89 @@ class APIFitsAsync:
             except Exception as e:
                 logger.error(f"未知错误！{e}")
             else:
-                all_api_response.append(api_response.json())
+                all_api_response.append(await json_codec.loads_async(api_response.content))
 
         return all_api_response
 
-    def _make_api_url(self, api_config: dict, api_name):
-        return api_config.get("url")
+    async def _request(self, api_name: str, method: str, url: str, **kwargs)->httpx.Response:
+        """发出请求并记录一条请求事件，api_name 记为 `分类.接口名`"""
+        with request_timer(f"{self.name}.{api_name}", method) as event:
+            response = await self.login_session.request(method, url, follow_redirects=True, **kwargs)
+            event.done(response.status_code, len(response.content))
+        return response
+
+    def _make_api_url(self, endpoint: Endpoint, api_name: str)->str|None:
+        try:
+            return endpoint.url(**self.path_params)
+        except EndpointError as e:
+            logger.error(f"{e}")
+            return None
     
-    def _make_api_params(self, api_config: dict, api_name: str):
-        return api_config.get("params")
+    def _make_api_params(self, endpoint: Endpoint, api_name: str)->dict:
+        return endpoint.params(**self.params)
     
-    def _make_api_data(self, api_config: dict, api_name: str):
-        return api_config.get("data", {})
+    def _make_api_data(self, endpoint: Endpoint, api_name: str)->dict:
+        return endpoint.data()
     
-    def check_api_method(self, apis_config: dict, method: str)->bool:
-        for value in apis_config.values():
-            if value == method:
-                return True
-            
-            if isinstance(value, dict) and self.check_api_method(value, method):
-                    return True
-            
-        return False
+    def check_api_method(self, endpoint: Endpoint, method: str)->bool:
+        return endpoint.method == method
 
 # --- Course API ---
+class ApiPages:
+    """逐页遍历分页接口，按页码顺序产出每一页的响应。
+
+    `make_fits(page, page_size)` 返回请求对应页面的 APIFitsAsync，只取其第一个接口的结果。
+    先请求第一页以得到总页数 `pages`，其余页面以滑动窗口方式并发请求，
+    同时在途的请求不超过 `concurrency` 个，已产出的页面不会被继续持有。
+    请求失败的页面产出空 dict，页码记入 `failed_pages`，遍历结束后由调用方决定如何报告。
+    """
+    def __init__(self, make_fits: Callable[[int, int], APIFitsAsync], page_size: int = 50, concurrency: int = 4):
+        self.make_fits = make_fits
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.failed_pages: list[int] = []
+
+    def __aiter__(self)->AsyncIterator[dict]:
+        return self._iter_pages()
+
+    async def _fetch_page(self, page: int)->dict:
+        result = (await self.make_fits(page, self.page_size).get_api_data())[0]
+        if not result:
+            logger.warning(f"第 {page} 页请求失败，结果将缺失该页内容")
+            self.failed_pages.append(page)
+        return result
+
+    async def _iter_pages(self)->AsyncIterator[dict]:
+        first_page = await self._fetch_page(1)
+        yield first_page
+
+        total_pages = first_page.get("pages") or 0
+        if total_pages <= 1:
+            return
+
+        pending: deque[asyncio.Task] = deque()
+        next_page = 2
+        try:
+            while next_page <= total_pages or pending:
+                while next_page <= total_pages and len(pending) < self.concurrency:
+                    pending.append(asyncio.create_task(self._fetch_page(next_page)))
+                    next_page += 1
+
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+def iter_api_pages(
+        make_fits: Callable[[int, int], APIFitsAsync],
+        page_size: int = 50,
+        concurrency: int = 4
+    )->ApiPages:
+    return ApiPages(make_fits, page_size, concurrency)
+
 class coursesAPIFits(APIFitsAsync):
     def __init__(self, 
-                 login_session: requests.Session, 
+                 login_session: httpx.AsyncClient, 
                  apis_name = None,
                  apis_config = None,
                  parent_dir: str = "course",
@@ -423,20 +339,8 @@ class coursesListAPIFits(coursesAPIFits):
         self.keyword = keyword
         self.page = page
         self.show_amount = show_amount
-
-    def _make_api_params(self, api_config, api_name: str):
-        api_params: dict = api_config.get("params")
-
-        # 修改conditions中的keyword参数为搜索关键词
-        conditions: dict = api_params.get("conditions")
-        conditions["keyword"] = self.keyword
-        # 我的course查询 api 的 conditions 需要为字符串
-        api_params["conditions"] = json.dumps(conditions, separators=(',', ':'), ensure_ascii=True)
-
-        api_params["page"] = self.page
-        api_params["page_size"] = self.show_amount
-
-        return api_params
+        # 搜索关键词合并进 conditions 模板
+        self.params = {"conditions": {"keyword": keyword}, "page": page, "page_size": show_amount}
 
 class coursePreviewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -448,18 +352,11 @@ class coursePreviewAPIFits(coursesAPIFits):
             apis_name = ["view", "modules"]
         super().__init__(login_session, apis_name)
         self.course_id = course_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.course_id))
+        self.path_params = {"course_id": course_id}
 
 class courseViewAPIFits(coursesAPIFits):
     def __init__(self, 
-                 login_session: requests.Session, 
+                 login_session: httpx.AsyncClient, 
                  course_id: int,
                  apis_name=None
                 ):
@@ -467,14 +364,7 @@ class courseViewAPIFits(coursesAPIFits):
             apis_name = ["activities", "exams", "classrooms", "activities_reads", "homework-completeness", "exam-completeness"]
         super().__init__(login_session, apis_name)
         self.course_id = course_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.course_id))
+        self.path_params = {"course_id": course_id}
 
 class coursewaresViewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -488,37 +378,10 @@ class coursewaresViewAPIFits(coursesAPIFits):
             apis_name = ["coursewares"]
         super().__init__(login_session, apis_name)
         self.course_id = course_id
+        self.path_params = {"course_id": course_id}
         self.page = page
         self.page_size = page_size
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None 
-
-        if api_name == "coursewares":
-            return base_api_url.replace("<placeholder>", str(self.course_id))
-
-        return super()._make_api_url(api_config, api_name)
-    
-    def _make_api_params(self, api_config, api_name):
-        api_params: dict = api_config.get("params")
-
-        if not api_params:
-            logger.error(f"{api_name}参数params缺失！")
-            return None 
-        
-        if api_name == "coursewares":
-            conditions: dict         = api_params.get("conditions", {})
-            conditions["category"]   = "null"
-            api_params["conditions"] = json.dumps(conditions)
-            api_params["page"]       = self.page
-            api_params["page_size"]  = self.page_size
-            return api_params
-
-        return super()._make_api_params(api_config, api_name)
+        self.params = {"conditions": {"category": "null"}, "page": page, "page_size": page_size}
 
 class courseMembersViewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -530,18 +393,7 @@ class courseMembersViewAPIFits(coursesAPIFits):
             apis_name = ["enrollments"]
         super().__init__(login_session, apis_name)
         self.course_id = course_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        if api_name == "enrollments":
-            return base_api_url.replace("<placeholder>", str(self.course_id))
-        
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"course_id": course_id}
 
 class courseRollcallsViewAPIFits(coursesAPIFits):
     def __init__(self, 
@@ -555,14 +407,7 @@ class courseRollcallsViewAPIFits(coursesAPIFits):
         super().__init__(login_session, apis_name)
         self.course_id = course_id
         self.student_id = student_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-
-        return base_api_url.replace("<placeholder1>", str(self.course_id)).replace("<placeholder2>", str(self.student_id))
+        self.path_params = {"course_id": course_id, "student_id": student_id}
 
 # --- Assignment API ---
 class assignmentAPIFits(APIFitsAsync):
@@ -587,15 +432,7 @@ class assignmentPreviewAPIFits(assignmentAPIFits):
             apis_name = ["activity_read"]
         super().__init__(login_session, apis_name)
         self.activity_id = activity_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数")
-            return None
-        
-        return base_api_url.replace("<placeholder>", str(self.activity_id))
-
+        self.path_params = {"activity_id": activity_id}
 
 class assignmentViewAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -607,17 +444,7 @@ class assignmentViewAPIFits(assignmentAPIFits):
             apis_name = ["activity"]
         super().__init__(login_session, apis_name)
         self.activity_id = activity_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
-        if api_name == "activity":
-            return base_api_url.replace("<placeholder>", str(self.activity_id))
-
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"activity_id": activity_id}
 
 class assignmentSubmissionListAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -631,17 +458,7 @@ class assignmentSubmissionListAPIFits(assignmentAPIFits):
         super().__init__(login_session, apis_name)
         self.activity_id = activity_id
         self.student_id = student_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
-        if api_name == "submission_list":
-            # return base_api_url.replace("<placeholder1>", str(self.activity_id)).replace("<placeholder2>", str(self.student_id))
-            return base_api_url.replace("<placeholder1>", str(self.activity_id)).replace("<placeholder2>", str(self.student_id))
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"activity_id": activity_id, "student_id": student_id}
 
 class assignmentTodoListAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -662,18 +479,7 @@ class assignmentExamViewAPIFits(assignmentAPIFits):
             apis_name = ["exam", "exam_submission_list", "exam_distribute"]
         super().__init__(login_session, apis_name)
         self.exam_id = exam_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-            return None
-        
-        if api_name in ["exam", "exam_submission_list", "exam_distribute"]:
-            return base_api_url.replace("<placeholder>", f"{self.exam_id}")
-
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"exam_id": exam_id}
 
 class assignmentExanSubmissionViewAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -686,18 +492,7 @@ class assignmentExanSubmissionViewAPIFits(assignmentAPIFits):
         super().__init__(login_session, apis_name)
         self.exam_id       = exam_id
         self.submission_id = submission_id
-
-    def _make_api_url(self, api_config, api_name)->str|None:
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数")
-            return None
-        
-        if api_name == "exam_submission":
-            return base_api_url.replace("<placeholder1>", str(self.exam_id)).replace("<placeholder2>", str(self.submission_id))
-        
-        return super()._make_api_url(api_config, api_name)
+        self.path_params   = {"exam_id": exam_id, "submission_id": submission_id}
 
 class assignmentClassroomViewAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -709,17 +504,7 @@ class assignmentClassroomViewAPIFits(assignmentAPIFits):
             apis_name = ["classroom", "classroom_submissions", "classroom_subject_result", "classroom_subject"]
         super().__init__(login_session, apis_name)
         self.classroom_id = classroom_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺乏'url'参数！")
-
-        if api_name in ["classroom", "classroom_submissions", "classroom_subject", "classroom_subject_result"]:
-            return base_api_url.replace("<placeholder>", str(self.classroom_id))
-        
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"classroom_id": classroom_id}
 
 class assignmentSubmitAPIFits(assignmentAPIFits):
     def __init__(self, 
@@ -737,28 +522,16 @@ class assignmentSubmitAPIFits(assignmentAPIFits):
         self.assignment_id = assignment_id
         self.comment = comment
         self.uploads = uploads
+        self.path_params = {"activity_id": assignment_id}
 
-    def _make_api_url(self, api_config, api_name)->str|None:
-        base_api_url: str = api_config.get("url")
+    def _make_api_data(self, endpoint, api_name)->dict|None:
+        api_data = endpoint.data()
 
-        if not base_api_url:
-            logger.error(f"{api_name} 缺少url！")
-            return None
-        
-        if api_name == "submissions":
-            return base_api_url.replace("<placeholder>", str(self.assignment_id))
-
-        return super()._make_api_url(api_config, api_name)
-    
-    def _make_api_data(self, api_config, api_name)->dict|None:
-        default_api_data = api_config.get("data")
-
-        if not default_api_data:
+        if not api_data:
             logger.error(f"{api_name} 缺少data！")
             return None
         
         if api_name == "submissions":
-            api_data = default_api_data
             if self.comment:
                 api_data["comment"] = api_data.get("comment", "").replace("{{{comment}}}", self.comment)
             else:
@@ -767,33 +540,33 @@ class assignmentSubmitAPIFits(assignmentAPIFits):
             api_data["uploads"].extend(self.uploads)
             return api_data
         
-        return super()._make_api_data(api_config, api_name)
+        return super()._make_api_data(endpoint, api_name)
     
     async def submit(self)->bool:
         if not self.apis_name or not self.apis_config:
             self._load_api_config()
 
         api_name = "submissions"
-        api_config: dict = self.apis_config.get(api_name, None)
-        if api_config == None:
+        endpoint = self.apis_config.get(api_name, None)
+        if endpoint == None:
             logger.error(f"{api_name}不存在！")
             return False
             
-        if not self.check_api_method(api_config, "POST"):
+        if not self.check_api_method(endpoint, "POST"):
             logger.error("该方法只适用POST请求！")
             return False
         
-        api_config: dict = self.apis_config.get(api_name)
-        if not api_config:
+        endpoint = self.apis_config.get(api_name)
+        if not endpoint:
             logger.error(f"{api_name}不存在！")
             return False
 
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if not api_url:
             logger.error(f"{api_name}的url不存在！")
             return False
         
-        api_data = self._make_api_data(api_config, api_name)
+        api_data = self._make_api_data(endpoint, api_name)
         if not api_data:
             logger.error(f"{api_name}的data不存在！")
             return False
@@ -833,44 +606,42 @@ class assignmentOpenForumTopicAPIFits(assignmentAPIFits):
         self.content = content
         self.uploads = uploads
     
-    def _make_api_data(self, api_config, api_name):
+    def _make_api_data(self, endpoint, api_name):
         if api_name == "topics":
-            api_data = api_config.get("data", {})
-
-            api_data["category_id"] = self.category_id
-            api_data["title"] = self.title
-            api_data["content"] = api_config.get("content", "{{{content}}}").replace("{{{content}}}", self.content)
-            api_data["uploads"] = self.uploads
-
-            return api_data
+            return endpoint.data(
+                category_id=self.category_id,
+                title=self.title,
+                content=self.content,
+                uploads=self.uploads
+            )
         
-        return super()._make_api_data(api_config, api_name)
+        return super()._make_api_data(endpoint, api_name)
 
     async def submit(self)->bool:
         if not self.apis_name or not self.apis_config:
             self._load_api_config()
 
         api_name = "topics"
-        api_config: dict = self.apis_config.get(api_name, None)
-        if api_config == None:
+        endpoint = self.apis_config.get(api_name, None)
+        if endpoint == None:
             logger.error(f"{api_name}不存在！")
             return False
             
-        if not self.check_api_method(api_config, "POST"):
+        if not self.check_api_method(endpoint, "POST"):
             logger.error("该方法只适用POST请求！")
             return False
         
-        api_config: dict = self.apis_config.get(api_name)
-        if not api_config:
+        endpoint = self.apis_config.get(api_name)
+        if not endpoint:
             logger.error(f"{api_name}不存在！")
             return False
 
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if not api_url:
             logger.error(f"{api_name}的url不存在！")
             return False
         
-        api_data = self._make_api_data(api_config, api_name)
+        api_data = self._make_api_data(endpoint, api_name)
         if not api_data:
             logger.error(f"{api_name}的data不存在！")
             return False
@@ -903,18 +674,7 @@ class assignmentViewForumAPIFits(assignmentAPIFits):
 
         super().__init__(login_session, apis_name)
         self.category_id = category_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-
-        if not base_api_url:
-            logger.error(f"{api_name} 缺少url！")
-            return None
-        
-        if api_name == "forum":
-            return base_api_url.replace("<placeholder>", str(self.category_id))
-
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"category_id": category_id}
 
 # --- Resource API ---
 class resourcesAPIFits(APIFitsAsync):
@@ -945,22 +705,12 @@ class resourcesListAPIFits(resourcesAPIFits):
         self.page = page
         self.show_amount = show_amount
         self.file_type = file_type
+        self.params = {
+            "conditions": {"keyword": keyword, "fileType": file_type},
+            "page": page,
+            "page_size": show_amount
+        }
 
-    def _make_api_params(self, api_config: str, api_name: str):
-        api_params: dict = api_config.get("params")
-
-        if api_params == None:
-            logger.error(f"{api_name}缺乏params参数配置！")
-        
-        # conditions这里需要是字符串，所以要解码-赋值-编码来处理
-        api_params_conditions: dict = api_params.get("conditions")
-        api_params_conditions["keyword"] = self.keyword
-        api_params_conditions["fileType"] = self.file_type
-        api_params["conditions"] = json.dumps(api_params_conditions, separators=(',', ':'), ensure_ascii=False)
-        api_params["page"] = self.page
-        api_params["page_size"] = self.show_amount
-        return api_params
-    
 class resourcesDownloadAPIFits(resourcesAPIFits):
     def __init__(self, 
                  login_session, 
@@ -981,29 +731,13 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
         self.resource_id = resource_id
         self.resources_id = resources_id
         self.basename = basename
+        self.path_params = {"resource_id": resource_id}
 
-    def _make_api_url(self, api_config, api_name):    
-        base_api_url: str = api_config.get("url", None)
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-
-        if api_name == "download": 
-            return base_api_url.replace("<placeholder>", str(self.resource_id))
-        
-        return super()._make_api_url(api_config, api_name)
-    
-    def _make_api_params(self, api_config, api_name):
-        api_params: dict = api_config.get("params", None)
-        if not api_params:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
+    def _make_api_params(self, endpoint, api_name):
         if api_name == "batch_download":
-            api_params["upload_ids"]= ",".join(map(str, self.resources_id))
-            return api_params
+            return endpoint.params(upload_ids=",".join(map(str, self.resources_id)))
         
-        return super()._make_api_params(api_config, api_name)
+        return super()._make_api_params(endpoint, api_name)
     
     async def download(self, 
                  progress_callback: Callable[[int, int, str], None] | None = None
@@ -1020,11 +754,11 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
             return False
 
         api_name = "download"
-        api_config: dict = self.apis_config.get(api_name)
-        if not api_config:
+        endpoint = self.apis_config.get(api_name)
+        if not endpoint:
             logger.error(f"{api_name}不存在！")
 
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if not api_url:
             logger.error(f"{api_name}的{api_url}不存在！")
             return False
@@ -1113,18 +847,18 @@ class resourcesDownloadAPIFits(resourcesAPIFits):
             return False
             
         api_name = "batch_download"
-        api_config: dict = self.apis_config.get(api_name)
+        endpoint = self.apis_config.get(api_name)
 
-        if not api_config:
+        if not endpoint:
             logger.error(f"{api_name}不存在！")
             return False
 
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if api_url == None:
             logger.error(f"{api_name}缺少 url 参数！")
             return False
 
-        api_params = self._make_api_params(api_config=api_config, api_name=api_name)
+        api_params = self._make_api_params(endpoint, api_name)
         if not api_params:
             logger.error(f"{api_name}缺少 params 参数！")
 
@@ -1199,45 +933,30 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
         super().__init__(login_session, apis_name)
         self.resource_id = resource_id
         self.resources_id = resources_id
+        self.path_params = {"resource_id": resource_id}
 
-    def _make_api_params(self, api_config, api_name):
-        api_params = api_config.get("params")
-
-        if api_params == None:
-            logger.error(f"{api_name}缺乏params参数配置！")
-        
+    def _make_api_params(self, endpoint, api_name):
         if api_name == "batch_remove":
-            api_params["upload_ids"] = self.resources_id
-            return api_params
-
-        return super()._make_api_params(api_config, "")
+            return endpoint.params(upload_ids=self.resources_id)
 
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url = api_config.get("url")
-        if base_api_url == None:
-            logger.error(f"{api_name}参数url缺失！")
-            return None 
-        if api_name == "remove":
-            return base_api_url.replace("<placeholder>", str(self.resource_id))
-        return super()._make_api_url(api_config, api_name)
+        return super()._make_api_params(endpoint, api_name)
 
     async def delete(self)->bool:
         if self.apis_config == None:
             self._load_api_config()
 
         api_name = "remove"
-        api_config: dict = self.apis_config.get(api_name, None)
+        endpoint = self.apis_config.get(api_name, None)
 
-        if not self.check_api_method(api_config, "DELETE"):
+        if not self.check_api_method(endpoint, "DELETE"):
             logger.error("该方法只适用DELET请求！")
             raise RuntimeError
 
-        if api_config == None:
+        if endpoint == None:
             logger.error(f"{api_name}不存在！")
             return False
         
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if api_url == None:
             logger.error(f"{api_name}的{api_url}不存在！")
             return False
@@ -1263,22 +982,22 @@ class resourcesRemoveAPIFits(resourcesAPIFits):
             self._load_api_config()
 
         api_name = "batch_remove"
-        api_config: dict = self.apis_config.get(api_name, None)
+        endpoint = self.apis_config.get(api_name, None)
 
-        if not self.check_api_method(api_config, "DELETE"):
+        if not self.check_api_method(endpoint, "DELETE"):
             logger.error("该方法只适用DELET请求！")
             raise RuntimeError
         
-        if api_config == None:
+        if endpoint == None:
             logger.error(f"{api_name}不存在！")
             return False
         
-        api_url = self._make_api_url(api_config, api_name)
+        api_url = self._make_api_url(endpoint, api_name)
         if api_url == None:
             logger.error(f"{api_name}的{api_url}不存在！")
             return False
 
-        api_params = self._make_api_params(api_config, api_name)
+        api_params = self._make_api_params(endpoint, api_name)
         
         try:
             api_respone = await self.login_session.delete(url=api_url, json=api_params, follow_redirects=True)
@@ -1325,16 +1044,16 @@ class resourceUploadAPIFits(resourcesAPIFits):
             self._load_api_config()
 
         api_name   = "upload"
-        api_config = self.apis_config.get(api_name)
-        api_url    = self._make_api_url(api_config, api_name)
+        endpoint = self.apis_config.get(api_name)
+        api_url    = self._make_api_url(endpoint, api_name)
 
-        if not api_config:
+        if not endpoint:
             logger.error(f"{api_name}不存在！")
             return False
 
         self.file_name = self.file_path.name
         self.file_size = self.file_path.stat().st_size
-        upload_data    = self._make_api_data(api_config, api_name)
+        upload_data    = self._make_api_data(endpoint, api_name)
 
         logger.info(f"请求上传文件 {self.file_name} 中...")
         if progress_callback:
@@ -1358,7 +1077,7 @@ class resourceUploadAPIFits(resourcesAPIFits):
         logger.info(f"文件 {self.file_name} 开始上传...")
 
         # --- 上传阶段 ---
-        upload_url    = upload_response.json().get("upload_url")
+        upload_url    = json_codec.loads(upload_response.content).get("upload_url")
         file_mimetype = mimetypes.guess_type(self.file_path)[0] or 'application/octet-stream'
         if not upload_url:
             logger.error(f"向服务器申请上传文件 {self.file_name} 失败：缺失 upload_url")
@@ -1383,7 +1102,9 @@ class resourceUploadAPIFits(resourcesAPIFits):
                     follow_redirects=True
                 )
 
-            logger.info(f"{response.text}")
+            # 响应体只在 DEBUG 级别下才需要解码
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"上传响应: {response.text}")
             response.raise_for_status()
         except Exception as e:
             logger.error(f"向服务器上传文件 {self.file_name} 时候发生错误！{e}")
@@ -1394,15 +1115,11 @@ class resourceUploadAPIFits(resourcesAPIFits):
         logger.info(f"文件 {self.file_name} 上传成功！")
         return True
 
-    def _make_api_data(self, api_config, api_name):
-        api_data = api_config.get("params", {})
-
+    def _make_api_data(self, endpoint, api_name):
         if api_name == "upload":
-            api_data["name"] = self.file_name
-            api_data["size"] = self.file_size
-            return api_data
+            return {"name": self.file_name, "size": self.file_size}
         
-        return super()._make_api_params(api_config, api_name)
+        return super()._make_api_data(endpoint, api_name)
 
 
     def _check_file_paths(self, file_path: Path)->Path|None:
@@ -1485,17 +1202,7 @@ class rollcallAnswerRadarAPIFits(rollcallAPIFits):
             apis_name = ["answer_radar"]
         super().__init__(login_session, apis_name, data=rollcall_data)
         self.rollcall_id = rollcall_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        if api_name == "answer_radar":
-            return base_api_url.replace("<placeholder>", str(self.rollcall_id))
-        
-        return super()._make_api_url(api_config, api_name)
+        self.path_params = {"rollcall_id": rollcall_id}
 
 class rollcallAnswerNumberAPIFits(rollcallAPIFits):
     def __init__(self, 
@@ -1508,14 +1215,4 @@ class rollcallAnswerNumberAPIFits(rollcallAPIFits):
             apis_name = ["answer_number"]
         super().__init__(login_session, apis_name, data=rollcall_data)
         self.rollcall_id = rollcall_id
-
-    def _make_api_url(self, api_config, api_name):
-        base_api_url: str = api_config.get("url")
-        if not base_api_url:
-            logger.error(f"{api_name}参数url缺失！")
-            return None
-        
-        if api_name == "answer_number":
-            return base_api_url.replace("<placeholder>", str(self.rollcall_id))
-
-        return None
+        self.path_params = {"rollcall_id": rollcall_id}
@@ -1,13 +1,20 @@
+import asyncio
 import logging
+import re
 import time
 from contextlib import asynccontextmanager
 
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 
 from ..core.printlog.print_log import setup_global_logging
+from ..core.printlog.structured import log_context
+from .auth import load_admin_token
+from .metrics import sample_loop_lag
 from .monitor import start_monitor_for_user, stop_monitor_for_user
-from .routers import auth, data, health, tasks
+from .profiler import LoopProfiler
+from .responses import CodecJSONResponse
+from .routers import admin, auth, data, health, metrics, tasks
 from .session_manager import create_user_client
 from .state import ServerState, UserSession
 from .task_loader import load_system_tasks
@@ -15,6 +22,7 @@ from .task_loader import load_system_tasks
 logger = logging.getLogger(__name__)
 
 SERVER_STATE = ServerState()
+REQUEST_ID_HEADER = "X-Request-ID"
 
 
 def get_server_state() -> ServerState:
@@ -25,6 +33,8 @@ def get_server_state() -> ServerState:
 async def lifespan(app: FastAPI):
     state: ServerState = app.state.server_state
     state._start_time = time.time()
+    if state.profiler is not None:
+        state.profiler.install()
     state.system_tasks = load_system_tasks()
 
     logger.info(f"加载了 {len(state.system_tasks)} 个系统任务模板")
@@ -38,13 +48,14 @@ async def lifespan(app: FastAPI):
             cookies = creds.get("cookies")
             client = await create_user_client(cookies=cookies, trust_env=state.trust_env)
             is_valid = False
-            if cookies:
+            # 已按记录的过期时间失效的 Cookies 无需联网验证
+            if cookies and not state.credential_store.cookies_expired(studentid):
                 is_valid = await client.is_valid_session()
             if not is_valid:
                 password = creds.get("password", "")
                 if password and await client.login(studentid, password):
                     is_valid = True
-                    state.credential_store.update_cookies(studentid, dict(client.session.cookies))
+                    state.credential_store.update_cookies(studentid, client.session.cookies)
 
             if is_valid:
                 from .auth import generate_token
@@ -62,8 +73,15 @@ async def lifespan(app: FastAPI):
             logger.error(f"恢复用户 {studentid} 失败: {e}")
 
     logger.info(f"LAZY SERVER 启动完成，当前在线用户: {len(state.sessions)}")
+    if state.profiler is not None:
+        lag_sampler = asyncio.create_task(state.profiler.watch_lag())
+    else:
+        lag_sampler = asyncio.create_task(sample_loop_lag())
     yield
     logger.info("LAZY SERVER 关闭中...")
+    lag_sampler.cancel()
+    if state.profiler is not None:
+        state.profiler.uninstall()
     for _token, user in list(state.sessions.items()):
         await stop_monitor_for_user(user)
         await user.close()
@@ -75,14 +93,39 @@ app = FastAPI(
     description="学在浙大第三方服务端代理",
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=CodecJSONResponse,
 )
 
 app.state.server_state = SERVER_STATE
 
+
+# 客户端给出的 X-Request-ID 会写入每条日志并回显在响应头中，只接受短的安全字符串
+_REQUEST_ID_PATTERN = re.compile(r"[A-Za-z0-9-]{1,64}")
+
+
+@app.middleware("http")
+async def bind_request_id(request: Request, call_next):
+    """每个请求一个 request_id（客户端给出合法的 X-Request-ID 时沿用，否则生成），并在响应头中返回
+
+    流式响应的响应体在 call_next 返回后才生成，需要 request_id 的生成器从 `request.state.request_id`
+    取得后自行绑定，见 admin.bulk_login。
+    """
+    client_request_id = request.headers.get(REQUEST_ID_HEADER)
+    if client_request_id is not None and not _REQUEST_ID_PATTERN.fullmatch(client_request_id):
+        client_request_id = None
+    with log_context(request_id=client_request_id) as request_id:
+        request.state.request_id = request_id
+        response = await call_next(request)
+    response.headers[REQUEST_ID_HEADER] = request_id
+    return response
+
+
 app.include_router(auth.router)
 app.include_router(tasks.router)
 app.include_router(data.router)
 app.include_router(health.router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
 
 
 def main():
@@ -91,17 +134,24 @@ def main():
     parser.add_argument("--proxy", action="store_true", help="启用系统代理（环境变量 HTTP_PROXY/HTTPS_PROXY）")
     parser.add_argument("--host", default="127.0.0.1", help="监听地址 (默认: 127.0.0.1)")
     parser.add_argument("--port", type=int, default=8765, help="监听端口 (默认: 8765)")
+    parser.add_argument("--profile", action="store_true", help="启用事件循环性能剖析（慢回调日志与栈采样）")
+    parser.add_argument("--slow-callback-ms", type=float, default=100, help="慢回调阈值，单位毫秒 (默认: 100)")
     args = parser.parse_args()
 
     SERVER_STATE.trust_env = args.proxy
+    SERVER_STATE.admin_token = load_admin_token()
 
     setup_global_logging()
     if args.proxy:
         logger.info("系统代理已启用")
+    if args.profile:
+        SERVER_STATE.profiler = LoopProfiler(slow_callback=args.slow_callback_ms / 1000)
     uvicorn.run(
         "lazy.server.app:app",
         host=args.host,
         port=args.port,
         reload=False,
         log_level="info",
+        # 剖析依赖替换 asyncio 的 Handle._run，uvloop 的回调不经过它，启用时须使用标准事件循环
+        loop="asyncio" if args.profile else "auto",
     )
@@ -1,5 +1,25 @@
+import os
+import secrets
 import uuid
 
+from .credentials import SERVER_DIR
+
+ADMIN_TOKEN_PATH = SERVER_DIR / "admin.token"
+
 
 def generate_token() -> str:
     return uuid.uuid4().hex
+
+
+def load_admin_token() -> str:
+    """管理员 token：优先读取环境变量 LAZY_ADMIN_TOKEN，否则使用（必要时生成）~/.lazy_server/admin.token。"""
+    token = os.environ.get("LAZY_ADMIN_TOKEN")
+    if token:
+        return token
+    if ADMIN_TOKEN_PATH.exists():
+        return ADMIN_TOKEN_PATH.read_text(encoding="utf-8").strip()
+    SERVER_DIR.mkdir(exist_ok=True)
+    token = secrets.token_hex(16)
+    ADMIN_TOKEN_PATH.write_text(token, encoding="utf-8")
+    ADMIN_TOKEN_PATH.chmod(0o600)
+    return token
@@ -1,12 +1,19 @@
-import json
 import logging
+import time
 from pathlib import Path
 
-from cryptography.fernet import Fernet
+import httpx
+from cryptography.fernet import Fernet, InvalidToken
+
+from ..core.codec import json_codec
+from ..core.login.cookie_jar import CookieJarFile, CookieJarFormatError, cookies_to_dict
+from .metrics import observe_credential_io
 
 SERVER_DIR = Path.home() / ".lazy_server"
 MASTER_KEY_PATH = SERVER_DIR / "master.key"
 CREDENTIALS_PATH = SERVER_DIR / "credentials.enc"
+# 各用户的 Cookies 按学号保存在与 CLI 相同格式的 Cookies 文件中
+COOKIE_JAR_PATH = SERVER_DIR / "cookies.jar"
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +35,7 @@ class EncryptedCredentialStore:
     def __init__(self):
         _ensure_server_dir()
         self._fernet = Fernet(_load_or_create_master_key())
+        self._jar = CookieJarFile(COOKIE_JAR_PATH, self._fernet)
 
     def _encrypt(self, value: str) -> str:
         return self._fernet.encrypt(value.encode()).decode()
@@ -35,14 +43,14 @@ class EncryptedCredentialStore:
     def _decrypt(self, token: str) -> str:
         return self._fernet.decrypt(token.encode()).decode()
 
-    def save(self, studentid: str, password: str, cookies: dict | None = None):
+    def save(self, studentid: str, password: str, cookies: httpx.Cookies | dict | None = None):
         entries = self._load_all()
         entries[studentid] = {
             "password": self._encrypt(password),
         }
+        self._write_all(entries)
         if cookies is not None:
-            entries[studentid]["cookies"] = self._encrypt(json.dumps(cookies))
-        CREDENTIALS_PATH.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+            self._save_cookies(studentid, cookies)
 
     def get(self, studentid: str) -> dict | None:
         entries = self._load_all()
@@ -52,16 +60,61 @@ class EncryptedCredentialStore:
         result = {"studentid": studentid}
         if "password" in raw:
             result["password"] = self._decrypt(raw["password"])
-        if "cookies" in raw:
-            result["cookies"] = json.loads(self._decrypt(raw["cookies"]))
+        cookies = self._load_cookies(studentid)
+        if cookies is not None:
+            result["cookies"] = cookies
+        elif "cookies" in raw:
+            # 旧版凭据文件内联保存的 Cookies
+            result["cookies"] = json_codec.loads(self._decrypt(raw["cookies"]))
         return result
 
-    def update_cookies(self, studentid: str, cookies: dict):
+    def save_many(self, credentials: dict[str, tuple[str, httpx.Cookies | dict | None]]):
+        """批量保存 学号 -> (密码, Cookies)，凭据文件与 Cookies 文件各只写一次"""
+        entries = self._load_all()
+        cookies_map = {}
+        for studentid, (password, cookies) in credentials.items():
+            entries[studentid] = {
+                "password": self._encrypt(password),
+            }
+            if cookies is not None:
+                cookies_map[studentid] = cookies
+        self._write_all(entries)
+        if cookies_map:
+            started = time.perf_counter()
+            self._jar.save_many(cookies_map)
+            observe_credential_io("write", started)
+
+    def update_cookies(self, studentid: str, cookies: httpx.Cookies | dict):
         entries = self._load_all()
         if studentid not in entries:
             return
-        entries[studentid]["cookies"] = self._encrypt(json.dumps(cookies))
-        CREDENTIALS_PATH.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        self._save_cookies(studentid, cookies)
+        if entries[studentid].pop("cookies", None) is not None:
+            self._write_all(entries)
+
+    def cookies_expired(self, studentid: str) -> bool:
+        """根据保存时记录的过期时间判断 Cookies 是否已过期，只读取索引，不解密"""
+        try:
+            entry = self._jar.entry(studentid)
+        except (CookieJarFormatError, OSError):
+            return False
+        return entry is not None and entry.is_expired()
+
+    def _save_cookies(self, studentid: str, cookies: httpx.Cookies | dict):
+        started = time.perf_counter()
+        self._jar.save(studentid, cookies)
+        observe_credential_io("write", started)
+
+    def _load_cookies(self, studentid: str) -> dict | None:
+        started = time.perf_counter()
+        try:
+            records = self._jar.load(studentid)
+        except (CookieJarFormatError, InvalidToken, json_codec.JSONDecodeError, OSError) as e:
+            logger.warning(f"用户 {studentid} 的 Cookies 读取失败: {e}")
+            return None
+        finally:
+            observe_credential_io("read", started)
+        return None if records is None else cookies_to_dict(records)
 
     def list_users(self) -> list[str]:
         return list(self._load_all().keys())
@@ -69,15 +122,27 @@ class EncryptedCredentialStore:
     def remove(self, studentid: str):
         entries = self._load_all()
         entries.pop(studentid, None)
-        CREDENTIALS_PATH.write_text(json.dumps(entries, ensure_ascii=False), encoding="utf-8")
+        self._write_all(entries)
+        try:
+            self._jar.remove(studentid)
+        except (CookieJarFormatError, OSError) as e:
+            logger.warning(f"用户 {studentid} 的 Cookies 删除失败: {e}")
+
+    def _write_all(self, entries: dict):
+        started = time.perf_counter()
+        CREDENTIALS_PATH.write_bytes(json_codec.dumps(entries))
+        observe_credential_io("write", started)
 
     def _load_all(self) -> dict:
+        started = time.perf_counter()
         if not CREDENTIALS_PATH.exists():
-            CREDENTIALS_PATH.write_text("{}", encoding="utf-8")
+            self._write_all({})
             return {}
         try:
-            return json.loads(CREDENTIALS_PATH.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
+            return json_codec.loads(CREDENTIALS_PATH.read_bytes())
+        except (json_codec.JSONDecodeError, OSError):
             logger.warning("凭据文件损坏，重置为空")
-            CREDENTIALS_PATH.write_text("{}", encoding="utf-8")
+            self._write_all({})
             return {}
+        finally:
+            observe_credential_io("read", started)
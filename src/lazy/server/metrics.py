@@ -0,0 +1,255 @@
+"""Prometheus 指标收集器。
+
+服务端所有指标更新都发生在事件循环线程内，单线程下对字典与数值的修改天然原子，
+因此这里不使用任何锁，每次更新只是一次字典查找与加法。
+"""
+import asyncio
+import logging
+import math
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .state import ServerState
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _format_labels(labelnames: tuple[str, ...], labelvalues: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, labelvalues, strict=True)]
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+
+    def render(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def clear(self):
+        self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, value in self._values.items():
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 每组标签对应 [各桶计数..., +Inf 计数, 总和]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        series = self._values.get(key)
+        if series is None:
+            series = [0] * (len(self.buckets) + 1) + [0.0]
+            self._values[key] = series
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        else:
+            series[len(self.buckets)] += 1
+        series[-1] += value
+
+    def render(self) -> list[str]:
+        lines = self._header()
+        for key, series in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets, series, strict=False):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            cumulative += series[len(self.buckets)]
+            labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+MONITOR_TICK_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "lazy_monitor_tick_seconds", "监控任务单次轮询耗时（秒）", ("task_id",)
+))
+UPSTREAM_RESPONSES: Counter = REGISTRY.register(Counter(
+    "lazy_upstream_responses_total", "监控任务上游响应计数，status 为 HTTP 状态码或 error", ("task_id", "status")
+))
+ACTIVE_SESSIONS: Gauge = REGISTRY.register(Gauge(
+    "lazy_active_sessions", "当前在线用户会话数"
+))
+MONITOR_TASKS: Gauge = REGISTRY.register(Gauge(
+    "lazy_monitor_tasks", "正在运行的监控协程数"
+))
+CACHE_ENTRIES: Gauge = REGISTRY.register(Gauge(
+    "lazy_cache_entries", "各任务已缓存的用户数", ("task_id",)
+))
+CACHE_ITEMS: Gauge = REGISTRY.register(Gauge(
+    "lazy_cache_items", "各任务缓存中的条目总数", ("task_id",)
+))
+CACHE_BYTES: Gauge = REGISTRY.register(Gauge(
+    "lazy_cache_bytes", "各任务缓存对应的原始响应字节数", ("task_id",)
+))
+CREDENTIAL_STORE_OPS: Counter = REGISTRY.register(Counter(
+    "lazy_credential_store_ops_total", "凭据文件读写次数", ("op",)
+))
+CREDENTIAL_STORE_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "lazy_credential_store_io_seconds", "凭据文件读写耗时（秒）", ("op",), LAG_BUCKETS
+))
+BULK_LOGINS: Counter = REGISTRY.register(Counter(
+    "lazy_bulk_logins_total", "批量登录中各用户的登录结果计数", ("result",)
+))
+BULK_LOGIN_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "lazy_bulk_login_seconds", "批量登录中单个用户的登录耗时（秒）"
+))
+LOOP_LAG_SECONDS: Histogram = REGISTRY.register(Histogram(
+    "lazy_event_loop_lag_seconds", "事件循环调度延迟（秒）", (), LAG_BUCKETS
+))
+LOOP_LAG_LAST: Gauge = REGISTRY.register(Gauge(
+    "lazy_event_loop_lag_last_seconds", "最近一次采样的事件循环调度延迟（秒）"
+))
+UPTIME_SECONDS: Gauge = REGISTRY.register(Gauge(
+    "lazy_uptime_seconds", "服务端运行时长（秒）"
+))
+
+
+def collect_state(state: "ServerState"):
+    """在抓取时根据服务端状态刷新会话、缓存等瞬时指标。"""
+    ACTIVE_SESSIONS.set(len(state.sessions))
+    UPTIME_SECONDS.set(round(state.uptime, 3))
+
+    running = 0
+    entries: dict[str, int] = {}
+    items: dict[str, int] = {}
+    size: dict[str, int] = {}
+    for user in state.sessions.values():
+        running += sum(1 for coro in user.task_coros.values() if not coro.done())
+        for task_id, data in user.caches.items():
+            entries[task_id] = entries.get(task_id, 0) + 1
+            items[task_id] = items.get(task_id, 0) + user.cache_items.get(task_id, 0)
+            size[task_id] = size.get(task_id, 0) + len(data)
+    MONITOR_TASKS.set(running)
+
+    CACHE_ENTRIES.clear()
+    CACHE_ITEMS.clear()
+    CACHE_BYTES.clear()
+    for task_id, count in entries.items():
+        CACHE_ENTRIES.set(count, task_id=task_id)
+        CACHE_ITEMS.set(items[task_id], task_id=task_id)
+        CACHE_BYTES.set(size[task_id], task_id=task_id)
+
+
+def render_metrics(state: "ServerState") -> str:
+    collect_state(state)
+    return REGISTRY.render()
+
+
+def observe_credential_io(op: str, started: float):
+    elapsed = time.perf_counter() - started
+    CREDENTIAL_STORE_OPS.inc(op=op)
+    CREDENTIAL_STORE_SECONDS.observe(elapsed, op=op)
+
+
+async def sample_loop_lag(interval: float = 1.0):
+    """周期性休眠并测量实际唤醒时间与预期之差，即事件循环延迟。"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - expected)
+        LOOP_LAG_SECONDS.observe(lag)
+        LOOP_LAG_LAST.set(lag)
@@ -1,53 +1,84 @@
 import asyncio
 import logging
+import time
 
-from ..core.load_config import load_config
+from ..core.codec import json_codec
+from ..core.printlog.structured import log_context, request_timer
+from ..core.zjuAPI import endpoints
+from .metrics import MONITOR_TICK_SECONDS, UPSTREAM_RESPONSES
 from .state import MonitorTask, ServerState, UserSession
 
 logger = logging.getLogger(__name__)
 
 
-def resolve_api_config(api_config_path: str) -> dict:
-    category, api_name = api_config_path.split(".", 1)
-    config = load_config.apiListConfig().load_config().get(category, {})
-    return config.get("apis_config", {}).get(api_name, {})
-
-
 async def run_user_task(user: UserSession, task: MonitorTask):
-    logger.info(f"启动监控任务 {task.task_id} | 用户 {user.studentid} | 间隔 {task.interval}s")
+    with log_context(studentid=user.studentid):
+        logger.info(f"启动监控任务 {task.task_id} | 间隔 {task.interval}s")
     while task.enabled:
-        try:
-            api_config = resolve_api_config(task.api_config_path)
-            url = api_config.get("url")
-            params = api_config.get("params", {})
-
-            if not url:
-                logger.error(f"{task.task_id}: url 未配置")
-                await asyncio.sleep(task.interval)
-                continue
-
-            response = await user.zju_client.get(url, params=params, follow_redirects=True)
-            response.raise_for_status()
-            raw_data = response.json()
-
-            user.caches[task.task_id] = raw_data
-
-            items = _extract_items(raw_data, task.id_field)
-            if items:
-                ids = {item[task.id_field] for item in items if task.id_field in item}
-                old_ids = user.seen_ids.get(task.task_id, set())
-                new_ids = ids - old_ids
-                user.seen_ids[task.task_id] = ids
-                if new_ids:
-                    logger.info(f"用户 {user.studentid} | {task.task_id}: 发现 {len(new_ids)} 个新项目")
-
-        except Exception as e:
-            logger.warning(f"监控任务 {task.task_id} 失败 (用户 {user.studentid}): {e}")
-
+        # 每个监控周期一个 request_id，周期内的日志与请求事件都带上它与用户的学号摘要
+        with log_context(studentid=user.studentid):
+            await _run_tick(user, task)
         await asyncio.sleep(task.interval)
 
 
-def _extract_items(data, id_field: str) -> list[dict]:
+async def _run_tick(user: UserSession, task: MonitorTask):
+    started = time.perf_counter()
+    responded = False
+    try:
+        endpoint = endpoints.get_endpoint(task.api_config_path)
+        if endpoint is None:
+            logger.error(f"{task.task_id}: 接口 {task.api_config_path} 未配置")
+            return
+
+        with request_timer(task.api_config_path, endpoint.method) as event:
+            response = await user.zju_client.get(endpoint.url(), params=endpoint.params(), follow_redirects=True)
+            event.done(response.status_code, len(response.content))
+        UPSTREAM_RESPONSES.inc(task_id=task.task_id, status=response.status_code)
+        responded = True
+        response.raise_for_status()
+        raw_data = await json_codec.loads_async(response.content)
+
+        items = _extract_items(raw_data, task.id_field)
+        # 缓存原始响应字节：比解码后的 dict 树小得多，/api/data 也可原样返回
+        user.caches[task.task_id] = response.content
+        user.cache_items[task.task_id] = _count_items(raw_data)
+
+        if items:
+            ids = {item[task.id_field] for item in items if item.get(task.id_field) is not None}
+            if not ids:
+                logger.warning(
+                    f"{task.task_id}: 条目中没有字段 {task.id_field}，无法检测新项目，请检查 tasks.json 中的 id_field",
+                    extra={"sample_key": f"monitor-id-field:{task.task_id}"}
+                )
+            old_ids = user.seen_ids.get(task.task_id, set())
+            new_ids = ids - old_ids
+            user.seen_ids[task.task_id] = ids
+            if new_ids:
+                logger.info(f"{task.task_id}: 发现 {len(new_ids)} 个新项目")
+
+    except Exception as e:
+        if not responded:
+            UPSTREAM_RESPONSES.inc(task_id=task.task_id, status="error")
+        # 上游持续故障时每个周期都会失败，按任务抽样记录
+        logger.warning(f"监控任务 {task.task_id} 失败: {e}", extra={"sample_key": f"monitor-error:{task.task_id}"})
+    finally:
+        elapsed = time.perf_counter() - started
+        MONITOR_TICK_SECONDS.observe(elapsed, task_id=task.task_id)
+        logger.info(
+            f"监控任务 {task.task_id} | 耗时 {elapsed * 1000:.0f}ms",
+            extra={"sample_key": f"monitor-tick:{task.task_id}"}
+        )
+
+
+def _count_items(data) -> int:
+    if isinstance(data, list):
+        return len(data)
+    if isinstance(data, dict):
+        return sum(len(v) for v in data.values() if isinstance(v, list)) or 1
+    return 1
+
+
+def _extract_items(data, id_field: str) -> list:
     if isinstance(data, list):
         return data
     if isinstance(data, dict):
@@ -0,0 +1,106 @@
+"""事件循环性能剖析（`lazy-server --profile`）。
+
+- 记录执行时间超过阈值的回调，并给出对应的 Task 名称与协程名；
+- 高频采样事件循环延迟，超过阈值时写日志；
+- 按需对事件循环线程做栈采样，输出 flamegraph.pl / speedscope 可直接读取的 collapsed 格式。
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from .metrics import LOOP_LAG_LAST, LOOP_LAG_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def describe_callback(handle: asyncio.Handle) -> str:
+    callback = getattr(handle, "_callback", None)
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        coro_name = getattr(coro, "__qualname__", repr(coro))
+        return f"Task {owner.get_name()} ({coro_name})"
+    return getattr(callback, "__qualname__", repr(callback))
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class LoopProfiler:
+    def __init__(self, slow_callback: float = 0.1, lag_interval: float = 0.05):
+        self.slow_callback = slow_callback
+        self.lag_interval = lag_interval
+        self.loop_thread_id: int | None = None
+        self._original_run = None
+        self._sampling = threading.Lock()
+
+    def install(self):
+        """在事件循环线程内调用，替换 Handle._run 以统计每个回调的耗时。"""
+        if self._original_run is not None:
+            return
+        loop = asyncio.get_running_loop()
+        if not isinstance(loop, asyncio.BaseEventLoop):
+            raise RuntimeError(f"性能剖析只支持标准 asyncio 事件循环，当前为 {type(loop).__module__}.{type(loop).__name__}")
+        self.loop_thread_id = threading.get_ident()
+        original_run = asyncio.events.Handle._run
+        threshold = self.slow_callback
+
+        def _timed_run(handle):
+            started = time.perf_counter()
+            try:
+                return original_run(handle)
+            finally:
+                elapsed = time.perf_counter() - started
+                if elapsed >= threshold:
+                    logger.warning(f"慢回调 {elapsed * 1000:.1f}ms: {describe_callback(handle)}")
+
+        self._original_run = original_run
+        asyncio.events.Handle._run = _timed_run
+        logger.info(f"性能剖析已启用，慢回调阈值 {threshold * 1000:.0f}ms")
+
+    def uninstall(self):
+        if self._original_run is None:
+            return
+        asyncio.events.Handle._run = self._original_run
+        self._original_run = None
+
+    async def watch_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            lag = max(0.0, loop.time() - expected)
+            LOOP_LAG_SECONDS.observe(lag)
+            LOOP_LAG_LAST.set(lag)
+            if lag >= self.slow_callback:
+                logger.warning(f"事件循环延迟 {lag * 1000:.1f}ms")
+
+    def sample_stacks(self, seconds: float, interval: float = 0.005) -> str:
+        """在当前（非事件循环）线程中对事件循环线程做栈采样，返回 collapsed 格式文本。"""
+        if self.loop_thread_id is None:
+            raise RuntimeError("性能剖析未启用")
+        if not self._sampling.acquire(blocking=False):
+            raise RuntimeError("已有采样正在进行")
+
+        try:
+            stacks: Counter[str] = Counter()
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                labels = []
+                while frame is not None:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                if labels:
+                    stacks[";".join(reversed(labels))] += 1
+                time.sleep(interval)
+        finally:
+            self._sampling.release()
+
+        return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
@@ -0,0 +1,12 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from ..core.codec import json_codec
+
+
+class CodecJSONResponse(JSONResponse):
+    """使用 json_codec 后端序列化的 JSONResponse。"""
+
+    def render(self, content: Any) -> bytes:
+        return json_codec.dumps(content)
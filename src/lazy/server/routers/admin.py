@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import secrets
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field
+
+from ...core.codec import json_codec
+from ...core.login.login import ZjuAsyncClient
+from ...core.printlog.structured import log_context
+from ..metrics import BULK_LOGIN_SECONDS, BULK_LOGINS
+from ..session_manager import (
+    activate_user_session,
+    create_user_client,
+    login_and_save_cookies,
+)
+from ..state import ServerState
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/admin", tags=["admin"])
+
+BULK_LOGIN_MAX_USERS = 500
+BULK_LOGIN_MAX_CONCURRENCY = 16
+
+
+def _get_admin(request: Request, token: str = Query(...)) -> ServerState:
+    state: ServerState = request.app.state.server_state
+    if not state.admin_token or not secrets.compare_digest(token, state.admin_token):
+        raise HTTPException(status_code=401, detail="管理员 Token 无效")
+    return state
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(10, gt=0, le=120),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    state: ServerState = Depends(_get_admin),  # noqa: B008
+):
+    if state.profiler is None:
+        raise HTTPException(status_code=409, detail="未启用性能剖析，请使用 --profile 启动")
+    try:
+        collapsed = await asyncio.to_thread(state.profiler.sample_stacks, seconds, interval_ms / 1000)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e)) from e
+    return PlainTextResponse(collapsed)
+
+
+class BulkLoginUser(BaseModel):
+    studentid: str
+    password: str
+
+
+class BulkLoginRequest(BaseModel):
+    users: list[BulkLoginUser] = Field(min_length=1, max_length=BULK_LOGIN_MAX_USERS)
+    concurrency: int = Field(4, ge=1, le=BULK_LOGIN_MAX_CONCURRENCY)
+    # 相邻两次开始登录的最小间隔，避免短时间内对统一身份认证发起大量请求
+    interval_ms: float = Field(200, ge=0, le=10000)
+
+
+class _RateLimiter:
+    """保证相邻两次放行之间至少间隔 interval 秒。"""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._lock = asyncio.Lock()
+        self._next = 0.0
+
+    async def wait(self):
+        async with self._lock:
+            now = time.monotonic()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+            self._next = max(now, self._next) + self.interval
+
+
+async def _bulk_login_one(
+    state: ServerState,
+    studentid: str,
+    password: str,
+    semaphore: asyncio.Semaphore,
+    limiter: _RateLimiter,
+) -> tuple[dict, ZjuAsyncClient | None]:
+    async with semaphore:
+        await limiter.wait()
+        started = time.perf_counter()
+        client = None
+        try:
+            client = await create_user_client(cookies=None, trust_env=state.trust_env)
+            logged_in = await login_and_save_cookies(client, studentid, password)
+        except Exception as e:
+            logger.error(f"批量登录: 用户 {studentid} 登录出错: {e!r}")
+            if client is not None:
+                await client.session.aclose()
+            return {"studentid": studentid, "status": "error", "detail": str(e)}, None
+        except asyncio.CancelledError:
+            if client is not None:
+                await client.session.aclose()
+            raise
+        finally:
+            BULK_LOGIN_SECONDS.observe(time.perf_counter() - started)
+
+    if not logged_in:
+        await client.session.aclose()
+        return {"studentid": studentid, "status": "failed", "detail": "学号或密码错误"}, None
+    return {"studentid": studentid, "status": "ok"}, client
+
+
+@router.post("/bulk-login")
+async def bulk_login(
+    request: Request,
+    body: BulkLoginRequest,
+    state: ServerState = Depends(_get_admin),  # noqa: B008
+):
+    """批量登录并注册用户，按完成顺序以 NDJSON 逐行返回每个用户的结果，最后一行为汇总。
+
+    登录以 concurrency 为并发上限、interval_ms 为最小间隔进行；登录成功的用户立即建立会话并返回 token，
+    凭据在全部登录结束（或客户端断开）后一次性写入凭据文件。
+    """
+    # 同一学号只登录一次，以最后出现的密码为准
+    users = {user.studentid.strip(): user.password for user in body.users}
+    semaphore = asyncio.Semaphore(body.concurrency)
+    limiter = _RateLimiter(body.interval_ms / 1000)
+
+    async def stream():
+        # 响应体在中间件退出 log_context 之后才生成，在此重新绑定本次请求的 request_id
+        with log_context(request_id=getattr(request.state, "request_id", None)):
+            started = time.perf_counter()
+            counts = {"ok": 0, "failed": 0, "error": 0}
+            credentials = {}
+            consumed: set[str] = set()
+            tasks = [
+                asyncio.create_task(_bulk_login_one(state, studentid, password, semaphore, limiter))
+                for studentid, password in users.items()
+            ]
+            try:
+                for future in asyncio.as_completed(tasks):
+                    result, client = await future
+                    consumed.add(result["studentid"])
+                    counts[result["status"]] += 1
+                    BULK_LOGINS.inc(result=result["status"])
+
+                    if client is not None:
+                        studentid = result["studentid"]
+                        credentials[studentid] = (users[studentid], client.session.cookies)
+                        result["token"] = await activate_user_session(state, studentid, client)
+                    yield json_codec.dumps(result) + b"\n"
+
+                yield json_codec.dumps({
+                    "summary": {
+                        "total": len(users),
+                        **counts,
+                        "elapsed": round(time.perf_counter() - started, 3),
+                    }
+                }) + b"\n"
+            finally:
+                # 客户端中途断开时取消尚未完成的登录，已建立的会话照常保存；
+                # 已登录成功但尚未返回给客户端的会话没有注册，关闭其连接池
+                unclaimed: list[ZjuAsyncClient] = []
+                for task in tasks:
+                    if not task.done():
+                        task.cancel()
+                    elif not task.cancelled():
+                        result, client = task.result()
+                        if client is not None and result["studentid"] not in consumed:
+                            unclaimed.append(client)
+                if credentials:
+                    state.credential_store.save_many(credentials)
+                    logger.info(f"批量登录: 已保存 {len(credentials)} 个用户的凭据")
+                if unclaimed:
+                    logger.info(f"批量登录: 客户端已断开，关闭 {len(unclaimed)} 个未返回的会话")
+                    # 生成器可能正被取消，shield 保证连接池关闭完成
+                    await asyncio.shield(asyncio.gather(*(client.session.aclose() for client in unclaimed)))
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
@@ -3,10 +3,12 @@ import logging
 from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel
 
-from ..auth import generate_token
-from ..monitor import merge_tasks, start_monitor_for_user, stop_monitor_for_user
-from ..session_manager import create_user_client, login_and_save_cookies
-from ..state import ServerState, UserSession
+from ..session_manager import (
+    activate_user_session,
+    create_user_client,
+    login_and_save_cookies,
+)
+from ..state import ServerState
 
 logger = logging.getLogger(__name__)
 
@@ -33,31 +35,17 @@ async def _authenticate(body: AuthRequest, state: ServerState, is_new: bool) ->
     if not is_new and not stored:
         raise HTTPException(status_code=404, detail="该学号未注册")
 
-    existing_token = state.studentid_map.get(studentid)
-    if existing_token and existing_token in state.sessions:
-        old_session = state.sessions[existing_token]
-        await stop_monitor_for_user(old_session)
-        await old_session.close()
-        del state.sessions[existing_token]
-        del state.studentid_map[studentid]
-
     client = await create_user_client(cookies=None, trust_env=state.trust_env)
     if not await login_and_save_cookies(client, studentid, password):
         await client.session.aclose()
         raise HTTPException(status_code=401, detail="学号或密码错误")
 
     if is_new:
-        state.credential_store.save(studentid, password, dict(client.session.cookies))
+        state.credential_store.save(studentid, password, client.session.cookies)
     else:
-        state.credential_store.update_cookies(studentid, dict(client.session.cookies))
-
-    token = generate_token()
-    user = UserSession(token=token, studentid=studentid, zju_client=client.session)
-    user.tasks = merge_tasks(state.system_tasks, user.overrides)
-    state.sessions[token] = user
-    state.studentid_map[studentid] = token
+        state.credential_store.update_cookies(studentid, client.session.cookies)
 
-    await start_monitor_for_user(state, user)
+    token = await activate_user_session(state, studentid, client)
 
     return AuthResponse(token=token, studentid=studentid)
 
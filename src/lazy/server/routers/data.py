@@ -1,7 +1,8 @@
 import time
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from ...core.codec import json_codec
 from ..state import ServerState, UserSession
 
 router = APIRouter(prefix="/api/data", tags=["data"])
@@ -23,4 +24,6 @@ async def get_data(task_id: str, user: UserSession = Depends(_get_user)):  # noq
     data = user.caches.get(task_id)
     if data is None:
         return {"status": "pending", "task_id": task_id, "data": None}
-    return {"status": "ok", "task_id": task_id, "data": data}
+    # 缓存的是上游原始响应，直接拼入外层对象，无需重新解码与编码
+    body = b'{"status":"ok","task_id":' + json_codec.dumps(task_id) + b',"data":' + data + b'}'
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,13 @@
+from fastapi import APIRouter, Request
+from fastapi.responses import PlainTextResponse
+
+from ..metrics import CONTENT_TYPE, render_metrics
+from ..state import ServerState
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics(request: Request):
+    state: ServerState = request.app.state.server_state
+    return PlainTextResponse(render_metrics(state), media_type=CONTENT_TYPE)
@@ -1,6 +1,9 @@
 import logging
 
 from ..core.login.login import ZjuAsyncClient
+from .auth import generate_token
+from .monitor import merge_tasks, start_monitor_for_user, stop_monitor_for_user
+from .state import ServerState, UserSession
 
 logger = logging.getLogger(__name__)
 
@@ -14,3 +17,23 @@ async def create_user_client(cookies: dict | None = None, trust_env: bool = Fals
 
 async def login_and_save_cookies(client: ZjuAsyncClient, studentid: str, password: str) -> bool:
     return await client.login(studentid, password)
+
+
+async def activate_user_session(state: ServerState, studentid: str, client: ZjuAsyncClient) -> str:
+    """以已登录的 client 为用户建立会话并启动监控，替换该学号已有的会话，返回新 token。"""
+    existing_token = state.studentid_map.get(studentid)
+    if existing_token and existing_token in state.sessions:
+        old_session = state.sessions[existing_token]
+        await stop_monitor_for_user(old_session)
+        await old_session.close()
+        del state.sessions[existing_token]
+        del state.studentid_map[studentid]
+
+    token = generate_token()
+    user = UserSession(token=token, studentid=studentid, zju_client=client.session)
+    user.tasks = merge_tasks(state.system_tasks, user.overrides)
+    state.sessions[token] = user
+    state.studentid_map[studentid] = token
+
+    await start_monitor_for_user(state, user)
+    return token
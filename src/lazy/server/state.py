@@ -28,7 +28,9 @@ class UserSession:
         self.zju_client = zju_client
         self.tasks: dict[str, MonitorTask] = {}
         self.overrides: dict[str, dict] = {}
-        self.caches: dict[str, dict | list] = {}
+        # 任务 -> 最近一次的原始响应字节，以及其中的条目数
+        self.caches: dict[str, bytes] = {}
+        self.cache_items: dict[str, int] = {}
         self.seen_ids: dict[str, set[int]] = {}
         self.task_coros: dict[str, asyncio.Task] = {}
         self.last_access: float = 0
@@ -46,6 +48,8 @@ class ServerState:
         self.credential_store: EncryptedCredentialStore = EncryptedCredentialStore()
         self.system_tasks: list[MonitorTask] = field(default_factory=list)
         self.trust_env: bool = False
+        self.admin_token: str = ""
+        self.profiler = None
         self.lock = asyncio.Lock()
         self._start_time: float = 0
 
@@ -72,3 +72,4 @@ def load_system_tasks() -> list[MonitorTask]:
         logger.error(f"读取任务模板失败: {e}")
         data = _DEFAULT_TASKS
     return [MonitorTask(**_normalize_task(t)) for t in data.get("system_tasks", [])]
+